@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Backtest engine throughput (bars/s) and wall time of one GA generation.
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from perceptrader.backtest import run_backtest
+from perceptrader.optimization import Optimizer
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Vectorized backtest benchmark")
+    parser.add_argument("--bars", type=int, default=1_000_000)
+    parser.add_argument("--columns", type=int, default=32)
+    parser.add_argument("--population", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    close = 100 + np.cumsum(rng.normal(0, 0.01, args.bars))
+    signals = rng.choice([-1, 0, 0, 0, 0, 1], size=args.bars)
+
+    t0 = time.perf_counter()
+    run_backtest(close, signals, spread=0.0002, commission=1e-5)
+    elapsed = time.perf_counter() - t0
+    print(f"1-D      {args.bars / elapsed / 1e6:8.1f} M bars/s")
+
+    matrix = rng.choice([-1, 0, 0, 0, 0, 1], size=(args.bars // 10, args.columns))
+    t0 = time.perf_counter()
+    run_backtest(close[:len(matrix)], matrix, spread=0.0002, commission=1e-5)
+    elapsed = time.perf_counter() - t0
+    print(f"2-D x{args.columns:<3} {matrix.size / elapsed / 1e6:8.1f} M bars/s")
+
+    df = pd.DataFrame({
+        "close": close,
+        "rsi": rng.uniform(0, 100, args.bars),
+        "macd": rng.normal(0, 1, args.bars),
+        "macd_signal": rng.normal(0, 1, args.bars),
+    })
+    opt = Optimizer({"rsi_lower": 30, "rsi_upper": 70})
+    population = [opt._mutate_params(opt.base) for _ in range(args.population)]
+    t0 = time.perf_counter()
+    for params in population:
+        opt._score(df, params)
+    elapsed = time.perf_counter() - t0
+    print(f"GA generation of {args.population} on {args.bars:,} bars: {elapsed:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Tick-to-bar aggregation throughput (ticks per second).
+"""
+import argparse
+import time
+
+import numpy as np
+
+from perceptrader.data.stream import TICK_DTYPE
+from perceptrader.live.aggregator import BarAggregator
+
+
+def synthetic_ticks(n: int, ticks_per_sec: float = 20.0, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    ticks = np.zeros(n, dtype=TICK_DTYPE)
+    gaps = rng.exponential(1e9 / ticks_per_sec, n).astype(np.int64)
+    ticks["time"] = 1_600_000_000 * 10**9 + np.cumsum(gaps)
+    ticks["bid"] = 1.1 + np.cumsum(rng.normal(0, 1e-5, n))
+    ticks["ask"] = ticks["bid"] + 1e-4
+    return ticks
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bar aggregator benchmark")
+    parser.add_argument("--ticks", type=int, default=10_000_000)
+    parser.add_argument("--batch", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--timeframes", nargs="+", default=["M1", "M5", "M15", "H1", "H4", "D1"])
+    args = parser.parse_args()
+
+    ticks = synthetic_ticks(args.ticks)
+    print(f"{args.ticks:,} ticks, timeframes {' '.join(args.timeframes)}")
+    for batch in args.batch:
+        agg = BarAggregator(args.timeframes)
+        bars = 0
+        t0 = time.perf_counter()
+        for lo in range(0, len(ticks), batch):
+            bars += sum(len(b) for b in agg.update(ticks[lo:lo + batch]).values())
+        elapsed = time.perf_counter() - t0
+        print(f"batch {batch:>8,}: {args.ticks / elapsed / 1e6:8.2f} M ticks/s ({bars:,} bars)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Compare bar store backends: disk size and load time for synthetic M1 bars.
+"""
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from perceptrader.data.store import create_bar_store
+
+
+def synthetic_bars(years: float, seed: int = 0) -> pd.DataFrame:
+    """Random-walk M1 OHLCV bars."""
+    n = int(years * 365 * 24 * 60)
+    rng = np.random.default_rng(seed)
+    close = 1.1 + np.cumsum(rng.normal(0, 1e-4, n))
+    spread = np.abs(rng.normal(0, 5e-5, n))
+    return pd.DataFrame(
+        {
+            "open": np.roll(close, 1),
+            "high": close + spread,
+            "low": close - spread,
+            "close": close,
+            "volume": rng.integers(1, 500, n),
+        },
+        index=pd.date_range("2020-01-01", periods=n, freq="min", name="time"),
+    )
+
+
+def timed(fn, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bar store benchmark")
+    parser.add_argument("--years", type=float, default=2.0)
+    parser.add_argument("--backends", nargs="+", default=["csv", "parquet"])
+    args = parser.parse_args()
+
+    df = synthetic_bars(args.years)
+    month_start = df.index[len(df) // 2].normalize()
+    month_end = month_start + pd.DateOffset(months=1)
+    print(f"{len(df):,} bars")
+    print(f"{'backend':<10}{'size MB':>10}{'write s':>10}{'load s':>10}{'close s':>10}{'month s':>10}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for backend in args.backends:
+            store = create_bar_store(backend, Path(tmp) / backend)
+            write_s = timed(lambda: store.write("SYM", "M1", df), repeat=1)
+            size_mb = store.size_bytes("SYM", "M1") / 1e6
+            load_s = timed(lambda: store.load("SYM", "M1"))
+            close_s = timed(lambda: store.load("SYM", "M1", columns=["close"]))
+            month_s = timed(lambda: store.load("SYM", "M1", month_start, month_end))
+            print(f"{backend:<10}{size_mb:>10.1f}{write_s:>10.2f}{load_s:>10.3f}"
+                  f"{close_s:>10.3f}{month_s:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
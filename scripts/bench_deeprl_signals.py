@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+DeepRLStrategy signal generation: one policy call per bar against the
+batched strided-window pass (bars per second).
+"""
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from perceptrader.config.settings import settings
+from perceptrader.environment import TradingEnv
+from perceptrader.models.rl import RLAgent
+from perceptrader.strategy.deeprl import DeepRLStrategy
+from perceptrader.vec_env import VecTradingEnv
+
+
+def main():
+    parser = argparse.ArgumentParser(description="DeepRL signal benchmark")
+    parser.add_argument("--bars", type=int, default=500_000)
+    parser.add_argument("--loop-bars", type=int, default=5_000)
+    parser.add_argument("--window", type=int, default=50)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        "close": 100 + np.cumsum(rng.normal(0, 0.1, args.bars)),
+        "volume": rng.integers(1, 1000, args.bars).astype(float),
+    })
+    with tempfile.TemporaryDirectory() as tmp:
+        settings.MODEL_DIR = Path(tmp)
+        agent = RLAgent(n_steps=64, batch_size=64, n_epochs=1, seed=0)
+        agent.train(VecTradingEnv(df.iloc[:10_000], num_envs=2, window=args.window), total_timesteps=128)
+        strat = DeepRLStrategy({"model_path": str(agent.save("BENCH_M1"))})
+
+        env = TradingEnv(df.iloc[:args.loop_bars], window=args.window)
+        t0 = time.perf_counter()
+        for t in range(args.window - 1, args.loop_bars):
+            env.idx = t + 1
+            agent.predict(env._get_obs()[None])
+        loop = (args.loop_bars - args.window + 1) / (time.perf_counter() - t0)
+
+        t0 = time.perf_counter()
+        strat.generate_signals(df)
+        batched = args.bars / (time.perf_counter() - t0)
+    print(f"per-bar policy calls {loop:>12,.0f} bars/s")
+    print(f"batched windows      {batched:>12,.0f} bars/s  ({batched / loop:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
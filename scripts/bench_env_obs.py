@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+TradingEnv microbenchmark: steps per second per observation mode.
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from perceptrader.environment import TradingEnv
+
+
+def main():
+    parser = argparse.ArgumentParser(description="TradingEnv step benchmark")
+    parser.add_argument("--bars", type=int, default=200_000)
+    parser.add_argument("--steps", type=int, default=100_000)
+    parser.add_argument("--window", type=int, default=50)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        "close": 100 + np.cumsum(rng.normal(0, 0.1, args.bars)),
+        "volume": rng.integers(1, 1000, args.bars).astype(float),
+    })
+    actions = rng.integers(0, 3, args.steps)
+
+    for mode in ("legacy", "precomputed"):
+        t0 = time.perf_counter()
+        env = TradingEnv(df, window=args.window, obs_mode=mode)
+        setup = time.perf_counter() - t0
+        env.reset()
+        t0 = time.perf_counter()
+        for action in actions:
+            _, _, done, _ = env.step(action)
+            if done:
+                env.reset()
+        elapsed = time.perf_counter() - t0
+        print(f"{mode:<12} {args.steps / elapsed:>10,.0f} steps/s  (setup {setup * 1e3:.1f} ms)")
+
+
+if __name__ == "__main__":
+    main()
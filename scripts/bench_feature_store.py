@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Feature access: recomputing indicators per consumer (as each stage used
+to) against one FeatureStore build followed by cached hits and zero-copy
+reads of the materialized arrays.
+"""
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from perceptrader.data.features import FEATURE_COLUMNS, FeatureStore
+from perceptrader.utils.fetch import add_indicators
+
+
+def timed(fn, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Feature store benchmark")
+    parser.add_argument("--bars", type=int, default=1_000_000)
+    parser.add_argument("--consumers", type=int, default=3, help="stages reading the features")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    close = 100 + np.cumsum(rng.normal(0, 0.1, args.bars))
+    bars = pd.DataFrame({
+        "open": close, "high": close + 0.05, "low": close - 0.05, "close": close,
+        "volume": rng.uniform(1, 10, args.bars),
+    }, index=pd.date_range("2015-01-01", periods=args.bars, freq="min", name="time"))
+
+    recompute = timed(lambda: add_indicators(bars)[list(FEATURE_COLUMNS)].to_numpy())
+    with tempfile.TemporaryDirectory() as tmp:
+        store = FeatureStore(Path(tmp))
+        t0 = time.perf_counter()
+        store.get("BENCH", "M1", bars)
+        build = time.perf_counter() - t0
+        hit = timed(lambda: store.get("BENCH", "M1", bars))
+        read = timed(lambda: store.frame("BENCH", "M1", columns=list(FEATURE_COLUMNS)))
+        month = timed(lambda: store.frame("BENCH", "M1", "2016-03-01", "2016-04-01"))
+
+    print(f"{args.bars:,} bars, {args.consumers} consumers")
+    print(f"recompute per consumer   {recompute:8.3f} s  (x{args.consumers} = {recompute * args.consumers:.3f} s)")
+    print(f"store build (once)       {build:8.3f} s")
+    print(f"store hit (fingerprint)  {hit:8.3f} s")
+    print(f"zero-copy feature frame  {1e3 * read:8.2f} ms")
+    print(f"one-month time slice     {1e3 * month:8.2f} ms")
+    total = build + (args.consumers - 1) * hit + args.consumers * read
+    print(f"store total              {total:8.3f} s  vs {recompute * args.consumers:.3f} s recomputing")
+
+
+if __name__ == "__main__":
+    main()
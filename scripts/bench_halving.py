@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Time to a good configuration: the plain GA against the GA with
+successive-halving generations. Both runs use the same seed; the target
+is the best full-data score the plain GA reaches. Halving generations are
+cheaper, so that run gets an `eta` times larger population.
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from perceptrader.config.settings import settings
+from perceptrader.optimization import Optimizer
+from perceptrader.utils.fetch import add_indicators
+
+
+def run(df, fraction, eta, population, generations):
+    settings.OPTIMIZATION_PARAMS["population_size"] = population
+    settings.OPTIMIZATION_PARAMS["generations"] = generations
+    opt = Optimizer({"rsi_lower": 30, "rsi_upper": 70}, seed=0,
+                    halving_min_fraction=fraction, halving_eta=eta)
+    t0 = time.perf_counter()
+    opt.optimize(df)
+    per_generation = (time.perf_counter() - t0) / generations
+    return opt.history, per_generation
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Successive-halving GA benchmark")
+    parser.add_argument("--bars", type=int, default=500_000)
+    parser.add_argument("--population", type=int, default=81)
+    parser.add_argument("--generations", type=int, default=20)
+    parser.add_argument("--min-fraction", type=float, default=1 / 27)
+    parser.add_argument("--eta", type=float, default=3)
+    args = parser.parse_args()
+
+    settings.FITNESS_CACHE_SIZE = 0  # time the backtests, not cache hits
+    rng = np.random.default_rng(0)
+    # mean-reverting prices, so RSI thresholds have an edge that holds across slices
+    noise = rng.normal(0, 0.01, args.bars)
+    close = np.empty(args.bars)
+    close[0] = 100.0
+    for t in range(1, args.bars):
+        close[t] = close[t - 1] + 0.02 * (100.0 - close[t - 1]) + noise[t]
+    df = add_indicators(pd.DataFrame(
+        {"close": close}, index=pd.date_range("2020-01-01", periods=args.bars, freq="min")
+    ))
+
+    full, full_time = run(df, 0.0, args.eta, args.population, args.generations)
+    target = full[-1]
+    halving, halving_time = run(
+        df, args.min_fraction, args.eta, int(args.eta * args.population), args.generations
+    )
+
+    def time_to_target(history, per_generation):
+        for gen, score in enumerate(history, 1):
+            if score >= target:
+                return gen, gen * per_generation
+        return None, float("inf")
+
+    seconds = {}
+    for name, history, per_gen in (("full", full, full_time), ("halving", halving, halving_time)):
+        gen, seconds[name] = time_to_target(history, per_gen)
+        print(f"{name:>8}: {per_gen:6.3f} s/generation  best {history[-1]:.6f}"
+              f"  target {target:.6f} reached at generation {gen} after {seconds[name]:.2f} s")
+    print(f"time-to-target speedup {seconds['full'] / seconds['halving']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+MLModel.predict latency: sklearn against the compiled forest, for one live
+bar (p50/p99 over many calls) and for small batches.
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from perceptrader.config.settings import settings
+from perceptrader.models.ml import MLModel
+from perceptrader.utils.indicators import IndicatorEngine
+
+
+def latencies(fn, calls: int) -> np.ndarray:
+    times = np.empty(calls)
+    for i in range(calls):
+        t0 = time.perf_counter()
+        fn()
+        times[i] = time.perf_counter() - t0
+    return times * 1e6  # microseconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ML inference latency benchmark")
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--trees", type=int, default=100)
+    parser.add_argument("--calls", type=int, default=2000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    columns = list(IndicatorEngine.COLUMNS)
+    X = pd.DataFrame(rng.normal(size=(args.rows, len(columns))), columns=columns)
+    y = np.sign(X["rsi"] + X["macd"] * X["macd_hist"] + rng.normal(0, 0.5, args.rows)).astype(int)
+    model = MLModel({"n_estimators": args.trees, "random_state": 0})
+    model.train(X, y)
+    print(f"{args.trees} trees, max depth {model.compiled.depth}, {len(columns)} features")
+
+    test = X.sample(1000, random_state=1)
+    assert np.array_equal(model.compiled.predict_proba(test.to_numpy()), model.model.predict_proba(test))
+    bar = test.iloc[0]
+    for name, fn in (
+            ("sklearn", lambda: model.model.predict(bar.to_frame().T)),
+            ("compiled", lambda: model.predict(bar)),
+    ):
+        lat = latencies(fn, args.calls)
+        print(f"one bar  {name:>8}: p50 {np.percentile(lat, 50):8.1f} us"
+              f"  p99 {np.percentile(lat, 99):8.1f} us")
+
+    for rows in (16, 64, 256, 1024):
+        batch = test.iloc[:rows]
+        sk = np.median(latencies(lambda: model.model.predict(batch), 50))
+        settings.ML_COMPILED_MAX_ROWS = rows
+        compiled = np.median(latencies(lambda: model.predict(batch), 50))
+        print(f"{rows:>5} rows: sklearn {sk:9.1f} us  compiled {compiled:9.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Daily ML retraining: a full refit on the whole history against a warm-start
+update that adds trees for the newly arrived bars only.
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from perceptrader.models.ml import MLModel
+from perceptrader.utils.indicators import IndicatorEngine
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ML retraining benchmark")
+    parser.add_argument("--history", type=int, default=200_000)
+    parser.add_argument("--new", type=int, default=1440, help="bars arriving per day")
+    parser.add_argument("--trees", type=int, default=100)
+    parser.add_argument("--update-trees", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    columns = list(IndicatorEngine.COLUMNS)
+    rows = args.history + args.new
+    index = pd.date_range("2020-01-01", periods=rows, freq="min")
+    X = pd.DataFrame(rng.normal(size=(rows, len(columns))), index=index, columns=columns)
+    y = pd.Series(np.sign(X["rsi"] + X["macd"] + rng.normal(0, 0.5, rows)).astype(int), index=index)
+    params = {"n_estimators": args.trees, "random_state": 0}
+
+    model = MLModel(params)
+    model.train(X.iloc[:args.history], y.iloc[:args.history])
+
+    t0 = time.perf_counter()
+    MLModel(params).train(X, y)
+    full = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    new = model.new_rows(X)
+    model.update(new, y.loc[new.index], n_trees=args.update_trees)
+    incremental = time.perf_counter() - t0
+
+    print(f"{args.history} bars of history, {len(new)} new")
+    print(f"full refit  {full:8.2f} s")
+    print(f"update      {incremental:8.2f} s  ({full / incremental:.0f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
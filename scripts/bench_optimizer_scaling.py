@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+GA wall time vs. worker count. Every run uses the same seed, so the best
+parameters must be identical across worker counts.
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from perceptrader.config.settings import settings
+from perceptrader.optimization import Optimizer
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Optimizer scaling benchmark")
+    parser.add_argument("--bars", type=int, default=1_000_000)
+    parser.add_argument("--population", type=int, default=32)
+    parser.add_argument("--generations", type=int, default=3)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    settings.OPTIMIZATION_PARAMS["population_size"] = args.population
+    settings.OPTIMIZATION_PARAMS["generations"] = args.generations
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        "close": 100 + np.cumsum(rng.normal(0, 0.01, args.bars)),
+        "rsi": rng.uniform(0, 100, args.bars),
+        "macd": rng.normal(0, 1, args.bars),
+        "macd_signal": rng.normal(0, 1, args.bars),
+    })
+
+    workers, baseline, reference = 1, None, None
+    while workers <= args.max_workers:
+        opt = Optimizer({"rsi_lower": 30, "rsi_upper": 70}, workers=workers, seed=0)
+        t0 = time.perf_counter()
+        best = opt.optimize(df)
+        elapsed = time.perf_counter() - t0
+        baseline = baseline or elapsed
+        reference = reference or best
+        print(f"{workers:>3} workers {elapsed:8.2f} s  speedup {baseline / elapsed:5.2f}x"
+              f"  {'same' if best == reference else 'DIFFERENT'} result")
+        workers *= 2
+
+
+if __name__ == "__main__":
+    main()
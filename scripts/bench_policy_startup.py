@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Live startup cost of an RL strategy: loading the PPO agent (SB3 + torch)
+against its NumPy policy export, each in a fresh interpreter (import time,
+load time and peak RSS), plus single-observation inference latency.
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from perceptrader.config.settings import settings
+from perceptrader.models.numpy_policy import NumpyPolicy
+from perceptrader.models.rl import RLAgent
+from perceptrader.vec_env import VecTradingEnv
+
+LOAD = """
+import re, time
+t0 = time.perf_counter()
+from perceptrader.models.{module} import {cls}
+t1 = time.perf_counter()
+model = {cls}.load({path!r})
+model.predict([0.0] * {size})
+t2 = time.perf_counter()
+status = open("/proc/self/status").read()
+print(t1 - t0, t2 - t1, int(re.search(r"VmHWM:\\s+(\\d+)", status).group(1)) / 1024)
+"""
+
+
+def fresh_load(module: str, cls: str, path: Path, size: int):
+    code = LOAD.format(module=module, cls=cls, path=str(path), size=size)
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)}
+    out = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True)
+    imports, load, rss = out.stdout.split()
+    return float(imports), float(load), float(rss)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="RL policy startup benchmark")
+    parser.add_argument("--window", type=int, default=50)
+    parser.add_argument("--calls", type=int, default=2000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        "close": 100 + np.cumsum(rng.normal(0, 0.1, 5000)),
+        "volume": rng.integers(1, 1000, 5000).astype(float),
+    })
+    with tempfile.TemporaryDirectory() as tmp:
+        settings.MODEL_DIR = Path(tmp)
+        agent = RLAgent(n_steps=64, batch_size=64, n_epochs=1, seed=0)
+        agent.train(VecTradingEnv(df, num_envs=2, window=args.window), total_timesteps=128)
+        ppo_path = agent.save("BENCH_M1").with_suffix(".zip")
+        policy = NumpyPolicy.from_agent(agent)
+        npz_path = policy.save("BENCH_M1")
+        print(f"artifact size: PPO {ppo_path.stat().st_size / 1024:.0f} KiB, "
+              f"npz {npz_path.stat().st_size / 1024:.0f} KiB")
+
+        size = 2 * args.window
+        for label, module, cls, path in [
+            ("RLAgent.load", "rl", "RLAgent", ppo_path),
+            ("NumpyPolicy.load", "numpy_policy", "NumpyPolicy", npz_path),
+        ]:
+            imports, load, rss = fresh_load(module, cls, path, size)
+            print(f"{label:<18} imports {imports:6.2f} s  load + first call {1e3 * load:8.1f} ms  "
+                  f"peak RSS {rss:6.0f} MiB")
+
+        obs = rng.normal(size=(1, size)).astype(np.float32)
+        for label, model in [("RLAgent", agent), ("NumpyPolicy", policy)]:
+            t0 = time.perf_counter()
+            for _ in range(args.calls):
+                model.predict(obs)
+            print(f"{label:<18} {1e6 * (time.perf_counter() - t0) / args.calls:8.1f} us per observation")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+PPO training throughput (timesteps per second) with rollouts collected in
+process against `SubprocTradingEnv` with 1..N worker processes.
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+import torch
+from stable_baselines3 import PPO
+
+from perceptrader.vec_env import make_training_env
+
+
+def main():
+    parser = argparse.ArgumentParser(description="RL rollout worker benchmark")
+    parser.add_argument("--bars", type=int, default=200_000)
+    parser.add_argument("--timesteps", type=int, default=16_384)
+    parser.add_argument("--envs", type=int, default=8, help="accounts per worker")
+    parser.add_argument("--n-steps", type=int, default=256)
+    parser.add_argument("--workers", type=int, nargs="+", default=[0, 1, 2, 4])
+    args = parser.parse_args()
+
+    torch.set_num_threads(1)  # one core for learning; workers use the rest
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        "close": 100 + np.cumsum(rng.normal(0, 0.1, args.bars)),
+        "volume": rng.integers(1, 1000, args.bars).astype(float),
+    }, index=pd.date_range("2020-01-01", periods=args.bars, freq="min", name="time"))
+    print(f"{os.cpu_count()} cores, {args.envs} accounts per worker, n_steps {args.n_steps}")
+
+    for workers in args.workers:
+        env = make_training_env(df, workers=workers, num_envs=args.envs, episode_length=1000, seed=0)
+        model = PPO("MlpPolicy", env, n_steps=args.n_steps, batch_size=256, n_epochs=1, seed=0)
+        model.learn(total_timesteps=env.num_envs * args.n_steps)  # warm-up rollout
+        t0 = time.perf_counter()
+        model.learn(total_timesteps=args.timesteps, reset_num_timesteps=False)
+        rate = args.timesteps / (time.perf_counter() - t0)
+        env.close()
+        label = "in process" if workers == 0 else f"{workers} worker(s)"
+        print(f"{label:<14} {env.num_envs:>4} envs  {rate:>10,.0f} timesteps/s")
+
+
+if __name__ == "__main__":
+    main()
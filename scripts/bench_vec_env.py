@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Environment throughput: a loop of single TradingEnv steps vs. one
+VecTradingEnv batch step over N accounts (env steps per second).
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from perceptrader.environment import TradingEnv
+from perceptrader.vec_env import VecTradingEnv
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Vectorized env benchmark")
+    parser.add_argument("--bars", type=int, default=200_000)
+    parser.add_argument("--steps", type=int, default=100_000)
+    parser.add_argument("--window", type=int, default=50)
+    parser.add_argument("--envs", type=int, nargs="+", default=[8, 64, 256])
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        "close": 100 + np.cumsum(rng.normal(0, 0.1, args.bars)),
+        "volume": rng.integers(1, 1000, args.bars).astype(float),
+    })
+
+    env = TradingEnv(df, window=args.window)
+    env.reset()
+    actions = rng.integers(0, 3, args.steps)
+    t0 = time.perf_counter()
+    for action in actions:
+        _, _, done, _ = env.step(action)
+        if done:
+            env.reset()
+    single = args.steps / (time.perf_counter() - t0)
+    print(f"{'TradingEnv':<16} {single:>12,.0f} steps/s")
+
+    for n in args.envs:
+        vec = VecTradingEnv(df, num_envs=n, window=args.window, seed=0)
+        vec.reset()
+        batches = max(1, args.steps // n)
+        actions = rng.integers(0, 3, (batches, n))
+        t0 = time.perf_counter()
+        for batch in actions:
+            vec.step(batch)
+        rate = batches * n / (time.perf_counter() - t0)
+        print(f"{f'VecTradingEnv x{n}':<16} {rate:>12,.0f} steps/s  ({rate / single:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -25,17 +25,15 @@ def main():
     parser.add_argument("--end", required=True, help="End date (YYYY-MM-DD)")
 
     args = parser.parse_args()
-    fetcher = HistoricalFetcher()
-    pipeline = DataPipeline()
+    pipeline = DataPipeline(args.symbols, args.timeframes)
 
     for symbol in args.symbols:
         for timeframe in args.timeframes:
             print(f"Ingesting {symbol} {timeframe} data...")
-            df = fetcher.get_ohlcv(symbol, timeframe,
-                                   pd.to_datetime(args.start),
-                                   pd.to_datetime(args.end))
+            # only ranges missing from the cache are downloaded
+            fetcher = HistoricalFetcher(symbol, timeframe, pipeline.cache_dir)
+            df = fetcher.fetch(args.start, args.end)
             if validate_data(df, timeframe):
-                pipeline.cache_dataframe(symbol, timeframe, df)
                 print(f"Successfully cached {symbol} {timeframe}")
             else:
                 print(f"Validation failed for {symbol} {timeframe}")
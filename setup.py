@@ -8,6 +8,8 @@ setup(
     install_requires=[
         "numpy>=1.24.0",
         "pandas>=2.0.0",
+        "pyarrow>=14.0.0",
+        "websockets>=13.0",
         "MetaTrader5>=5.0.36",
         "gym>=0.26.0",
         "stable-baselines3>=2.0.0",
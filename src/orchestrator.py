@@ -5,16 +5,25 @@ optimize → retrain → forward-test → live execution.
 
 import sys
 import pandas as pd
+from functools import partial
 from pathlib import Path
 from perceptrader.gui.tk_dashboard import start_dashboard_in_thread
 from perceptrader.config.settings import settings
+from perceptrader.data.features import FEATURE_COLUMNS, FeatureStore
 from perceptrader.data.pipeline import DataPipeline
-from perceptrader.environment import TradingEnv
 from perceptrader.optimization import Optimizer
-from perceptrader.models.factory import create_ml_model, create_rl_agent
+from perceptrader.vec_env import VecTradingEnv, make_training_env
+from perceptrader.walkforward import WalkForward
+from perceptrader.models.factory import create_ml_model, create_rl_agent, registry
+from perceptrader.models.ml import MLModel, train_concurrently
+from perceptrader.models.numpy_policy import NumpyPolicy
+from perceptrader.models.registry import ML
+from perceptrader.models.rl import sample_ppo_configs, search_rl_agents
 from perceptrader.strategy.factory import create_strategy
 from perceptrader.live.paper import PaperExecution
 from perceptrader.live.execution import LiveExecution
+from perceptrader.utils.checkpoint import Checkpoint, RunManifest
+from perceptrader.utils.fitness_cache import data_fingerprint
 from perceptrader.utils.logger import setup_logger
 
 
@@ -24,44 +33,144 @@ def main() -> None:
 
     # 1. Data acquisition
     pipeline = DataPipeline(settings.SYMBOLS, settings.TIMEFRAMES)
-    pipeline.run()
+    failures = pipeline.run()
     logger.info("Data fetched and processed")
 
+    # finished stages of an interrupted run are skipped
+    manifest = RunManifest(settings.CHECKPOINT_DIR / "manifest.json")
+    # indicator features, computed once per series and shared by every stage
+    features = FeatureStore()
+    window = 50
+
     # 2. Backtest & Optimization
+    series = []
     for symbol in settings.SYMBOLS:
         for tf in settings.TIMEFRAMES:
-            df = (
-                    Path("data/processed") / f"{symbol}_{tf}.csv"
-            )
-            df = TradingEnv(pd.read_csv(df, index_col=0), window=50)
-            opt = Optimizer(settings.OPTIMIZATION_PARAMS)
-            best_params = opt.optimize(df.df)
-            logger.info(f"Best params for {symbol}-{tf}: {best_params}")
-
-            # 3. Retrain models
-            # Prepare features/labels…
-            X, y = df.df.dropna().iloc[:, :-1], df.df["signal"]
-            ml = create_ml_model(best_params)
+            if (symbol, tf) in failures:
+                logger.warning(f"Skipping {symbol}-{tf}: {failures[(symbol, tf)]}")
+                continue
+            df = features.get(symbol, tf, pipeline.load(symbol, tf)).to_frame(copy=False)
+            key = f"{symbol}-{tf}"
+            manifest.bind(key, data_fingerprint(df, symbol, tf))
+            series.append((symbol, tf))
+
+            if manifest.done(key, "walkforward"):
+                logger.info(f"Walk-forward for {key} already done, skipping")
+            else:
+                try:
+                    report = WalkForward(settings.STRATEGY_PARAMS, ml_params={}).run(df, symbol, tf)
+                    summary = report.summary()
+                    logger.info(f"Walk-forward OOS for {key}: {summary}")
+                except ValueError as exc:
+                    summary = None
+                    logger.warning(f"Walk-forward skipped for {key}: {exc}")
+                manifest.mark(key, "walkforward", summary)
+
+            if manifest.done(key, "optimize"):
+                logger.info(f"Resumed best params for {key}: {manifest.get(key, 'optimize')}")
+            else:
+                opt = Optimizer(
+                    settings.STRATEGY_PARAMS,
+                    checkpoint=Checkpoint(settings.CHECKPOINT_DIR / f"{symbol}_{tf}_ga.pkl"),
+                )
+                best_params = opt.optimize(df, symbol, tf)
+                manifest.mark(key, "optimize", best_params)
+                logger.info(f"Best params for {key}: {best_params}")
+                if opt.cache is not None:
+                    logger.info(f"Fitness cache: {opt.cache.stats()}")
+
+    # 3. Retrain ML models, all series concurrently
+    def retrain(symbol: str, tf: str, n_jobs: int) -> Path:
+        key = f"{symbol}-{tf}"
+        bars = features.frame(symbol, tf)
+        X = bars[list(FEATURE_COLUMNS)]
+        # the model learns to reproduce the optimized strategy's signals
+        strategy = create_strategy(settings.STRATEGY, manifest.get(key, "optimize"))
+        y = strategy.generate_signals(bars)
+
+        record = registry.latest(f"{symbol}_{tf}", ML)
+        ml = MLModel.load(Path(record["path"])) if record and settings.ML_UPDATE_TREES > 0 else None
+        if ml is not None and ml.is_fitted and ml.trained_until is not None:
+            new = ml.new_rows(X)
+            if new.empty:
+                # re-saving would bump the registry version and invalidate caches
+                logger.info(f"No new bars for {key}; keeping {record['path']}")
+                return Path(record["path"])
+            ml.model.set_params(n_jobs=n_jobs)
+            try:
+                ml.update(new, y.loc[new.index])
+            except ValueError as e:
+                # e.g. a label or feature set the saved forest never saw
+                logger.warning(f"Cannot update the ML model of {key} ({e}); retraining from scratch")
+                ml = None
+            else:
+                logger.info(f"Added trees for {len(new)} new bars of {key}")
+        else:
+            ml = None
+        if ml is None:
+            ml = create_ml_model({"n_jobs": n_jobs})
             ml.train(X, y)
-            ml_path = ml.save(f"{symbol}_{tf}")
-            logger.info(f"Saved ML model to {ml_path}")
+        return ml.save(f"{symbol}_{tf}")
+
+    pending = [(symbol, tf) for symbol, tf in series if not manifest.done(f"{symbol}-{tf}", "ml")]
+    results = train_concurrently(
+        {(symbol, tf): partial(retrain, symbol, tf) for symbol, tf in pending}
+    )
+    for (symbol, tf), result in results.items():
+        key = f"{symbol}-{tf}"
+        if isinstance(result, Exception):
+            logger.error(f"ML retraining failed for {key}: {result}")
+            continue
+        manifest.mark(key, "ml", str(result))
+        logger.info(f"Saved ML model to {result}")
+
+    for symbol, tf in series:
+        key = f"{symbol}-{tf}"
+        bars = features.open(symbol, tf)
 
-            rl = create_rl_agent(best_params)
-            rl.train(df, total_timesteps=10_000)
+        def make_env():
+            return make_training_env(bars, window=window)
+
+        if manifest.done(key, "rl"):
+            logger.info(f"RL agent for {key} already saved to {manifest.get(key, 'rl')}")
+        else:
+            if settings.RL_SEARCH_CONFIGS > 0:
+                rl, ranking = search_rl_agents(
+                    sample_ppo_configs(settings.RL_SEARCH_CONFIGS, settings.OPTIMIZATION_PARAMS["seed"]),
+                    make_env,
+                    VecTradingEnv(bars, num_envs=1, window=window, random_start=False),
+                    settings.RL_SEARCH_MIN_TIMESTEPS,
+                    settings.RL_TIMESTEPS,
+                    settings.RL_SEARCH_ETA,
+                )
+                logger.info(f"RL search for {key}: best {rl.kwargs}, score {ranking[0][1]:.2f}")
+            else:
+                rl = create_rl_agent({})
+                env = make_env()
+                try:
+                    rl.train(
+                        env, total_timesteps=settings.RL_TIMESTEPS,
+                        checkpoint=settings.CHECKPOINT_DIR / f"{symbol}_{tf}_ppo.zip",
+                    )
+                finally:
+                    env.close()
             rl_path = rl.save(f"{symbol}_{tf}")
-            logger.info(f"Saved RL agent to {rl_path}")
+            policy_path = NumpyPolicy.from_agent(rl).save(f"{symbol}_{tf}")  # for live processes
+            manifest.mark(key, "rl", str(rl_path))
+            logger.info(f"Saved RL agent to {rl_path} and its policy to {policy_path}")
 
-            # 4. Forward (paper) test
-            paper = PaperExecution(symbol, tf)
-            ok = paper.run(duration=settings.PAPER_DURATION)
-            if not ok:
-                logger.warning(f"Paper test failed for {symbol}-{tf}, skipping live")
-                continue
+        # 4. Forward (paper) test
+        paper = PaperExecution(symbol, tf)
+        ok = paper.run(duration=settings.PAPER_DURATION)
+        if not ok:
+            logger.warning(f"Paper test failed for {symbol}-{tf}, skipping live")
+            continue
 
-            # 5. Live execution
-            live = LiveExecution(symbol, tf)
-            live.run()
+        # 5. Live execution
+        live = LiveExecution(symbol, tf)
+        live.run()
 
+    manifest.clear()
     logger.info("Pipeline complete")
 
 
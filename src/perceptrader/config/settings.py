@@ -20,13 +20,28 @@ class Settings:
     # — Directories
     LOG_DIR: Path = Path(os.getenv("LOG_DIR", "logs"))
     MODEL_DIR: Path = Path(os.getenv("MODEL_DIR", "models"))
+    DATA_DIR: Path = Path(os.getenv("DATA_DIR", "data"))
+
+    # — Data Storage
+    BAR_STORE: str = os.getenv("BAR_STORE", "parquet")  # parquet | csv
+    HISTORY_START: str = os.getenv("HISTORY_START", "2020-01-01")
+    PIPELINE_WORKERS: int = int(os.getenv("PIPELINE_WORKERS", "1"))  # >1 runs in parallel
+    FEATURE_DIR: Path = Path(os.getenv("FEATURE_DIR", "data/features"))  # materialized feature matrices
 
     # — Symbols & Timeframes
     SYMBOLS: List[str] = parse_list(os.getenv("SYMBOLS", "EURUSD,USDJPY"))
     TIMEFRAMES: List[str] = parse_list(os.getenv("TIMEFRAMES", "M1,M5,M15"))
+    # only the base timeframe is downloaded; coarser ones are resampled locally
+    BASE_TIMEFRAME: str = os.getenv("BASE_TIMEFRAME", "M1")
+    DATA_TZ: str = os.getenv("DATA_TZ", "UTC")  # zone of stored (naive) bar times
+    SESSION_TZ: str = os.getenv("SESSION_TZ", "")  # zone whose wall clock D1 bins align to
+    SESSION_OFFSET: str = os.getenv("SESSION_OFFSET", "0h")  # e.g. "17h" for NY close
 
     # — Risk Management
     RISK_PER_TRADE: float = float(os.getenv("RISK_PER_TRADE", "0.01"))
+    MAX_DRAWDOWN: float = float(os.getenv("MAX_DRAWDOWN", "0.2"))  # fraction of peak equity
+    MAX_LEVERAGE: float = float(os.getenv("MAX_LEVERAGE", "10"))  # gross notional / equity
+    ACCOUNT_LEVERAGE: float = float(os.getenv("ACCOUNT_LEVERAGE", "30"))  # broker margin ratio
     MT5_DEVIATION: int = int(os.getenv("MT5_DEVIATION", "10"))
     MT5_MAGIC: int = int(os.getenv("MT5_MAGIC", "123456"))
 
@@ -34,7 +49,69 @@ class Settings:
     OPTIMIZATION_PARAMS: dict = {
         "population_size": int(os.getenv("POP_SIZE", "20")),
         "generations": int(os.getenv("GENERATIONS", "10")),
+        "workers": int(os.getenv("OPT_WORKERS", "1")),  # >1 scores on a process pool
+        "seed": int(os.environ["OPT_SEED"]) if os.getenv("OPT_SEED") else None,
+        # successive halving: first rung backtests this fraction of bars; 0 disables
+        "halving_min_fraction": float(os.getenv("OPT_HALVING_MIN_FRACTION", "0")),
+        "halving_eta": float(os.getenv("OPT_HALVING_ETA", "3")),  # survivors 1/eta per rung
+    }
+    STRATEGY: str = os.getenv("STRATEGY", "rsimacd")
+    STRATEGY_PARAMS: dict = {
+        "rsi_lower": int(os.getenv("RSI_LOWER", "30")),
+        "rsi_upper": int(os.getenv("RSI_UPPER", "70")),
     }
+    OPTIMIZATION_METRIC: str = os.getenv("OPTIMIZATION_METRIC", "sharpe")
+    FITNESS_CACHE_SIZE: int = int(os.getenv("FITNESS_CACHE_SIZE", "4096"))  # 0 disables
+    FITNESS_CACHE_PATH: str = os.getenv("FITNESS_CACHE_PATH", "")  # sqlite file; "" = memory only
+
+    # — Backtesting
+    BACKTEST_SPREAD: float = float(os.getenv("BACKTEST_SPREAD", "0.0"))  # price units
+    BACKTEST_COMMISSION: float = float(os.getenv("BACKTEST_COMMISSION", "0.0"))  # of notional
+
+    # — Portfolio
+    PORTFOLIO_CHUNK_BARS: int = int(os.getenv("PORTFOLIO_CHUNK_BARS", "10000"))  # rows per pass
+    PORTFOLIO_ATR_WINDOW: int = int(os.getenv("PORTFOLIO_ATR_WINDOW", "14"))
+    PORTFOLIO_STOP_ATR: float = float(os.getenv("PORTFOLIO_STOP_ATR", "2.0"))  # stop distance in ATRs
+
+    # — Walk-forward
+    WF_MODE: str = os.getenv("WF_MODE", "rolling")  # rolling | anchored
+    WF_TRAIN_BARS: int = int(os.getenv("WF_TRAIN_BARS", "20000"))
+    WF_TEST_BARS: int = int(os.getenv("WF_TEST_BARS", "5000"))
+    WF_STEP_BARS: int = int(os.getenv("WF_STEP_BARS", "0"))  # 0 = test window length
+    WF_WORKERS: int = int(os.getenv("WF_WORKERS", "1"))  # >1 runs folds in parallel
+
+    # — Checkpoints
+    CHECKPOINT_DIR: Path = Path(os.getenv("CHECKPOINT_DIR", "checkpoints"))
+    CHECKPOINT_EVERY: int = int(os.getenv("CHECKPOINT_EVERY", "1"))  # GA generations
+    RL_CHECKPOINT_TIMESTEPS: int = int(os.getenv("RL_CHECKPOINT_TIMESTEPS", "10000"))
+
+    # — Machine Learning
+    # batches up to this many rows use the compiled forest; 0 always uses sklearn
+    ML_COMPILED_MAX_ROWS: int = int(os.getenv("ML_COMPILED_MAX_ROWS", "64"))
+    MODEL_CACHE_SIZE: int = int(os.getenv("MODEL_CACHE_SIZE", "8"))  # models kept loaded
+    ML_WORKERS: int = int(os.getenv("ML_WORKERS", "1"))  # models trained concurrently
+    # retraining adds this many trees fitted on new bars only; 0 refits from scratch
+    ML_UPDATE_TREES: int = int(os.getenv("ML_UPDATE_TREES", "20"))
+    ML_MAX_TREES: int = int(os.getenv("ML_MAX_TREES", "300"))  # oldest retired first; 0 keeps all
+
+    # — Reinforcement Learning
+    RL_N_ENVS: int = int(os.getenv("RL_N_ENVS", "8"))  # accounts stepped per batch
+    RL_EPISODE_LENGTH: int = int(os.getenv("RL_EPISODE_LENGTH", "0"))  # 0 runs to the last bar
+    # rollout workers, each stepping RL_N_ENVS accounts in a subprocess; 0 steps in process
+    RL_WORKERS: int = int(os.getenv("RL_WORKERS", "0"))
+    # bars of history per worker, windows spread over the history; 0 splits it evenly
+    RL_WORKER_BARS: int = int(os.getenv("RL_WORKER_BARS", "0"))
+    RL_TIMESTEPS: int = int(os.getenv("RL_TIMESTEPS", "10000"))
+    RL_INFERENCE_BATCH: int = int(os.getenv("RL_INFERENCE_BATCH", "4096"))  # observations per policy call
+    # successive-halving search over sampled PPO configs; 0 trains one default agent
+    RL_SEARCH_CONFIGS: int = int(os.getenv("RL_SEARCH_CONFIGS", "0"))
+    RL_SEARCH_MIN_TIMESTEPS: int = int(os.getenv("RL_SEARCH_MIN_TIMESTEPS", "1000"))
+    RL_SEARCH_ETA: float = float(os.getenv("RL_SEARCH_ETA", "3"))
+
+    # — Real-time Ticks
+    TICK_STREAM_URL: str = os.getenv("TICK_STREAM_URL", "wss://api.intrinio.com/stream")
+    TICK_BUFFER_SIZE: int = int(os.getenv("TICK_BUFFER_SIZE", "65536"))  # ticks per symbol
+    TICK_OVERFLOW: str = os.getenv("TICK_OVERFLOW", "drop_oldest")  # | drop_newest | block
 
     # — Paper Trading
     PAPER_DURATION: int = int(os.getenv("PAPER_DURATION", "300"))  # seconds
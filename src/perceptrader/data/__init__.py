@@ -4,10 +4,36 @@
 Data subpackage for PerceptraderAI:
 - fetch.py      : Central OHLCV data fetching logic
 - pipeline.py   : Manages data fetching, preprocessing, and loading
-- handlers/     : Future data source handlers
+- store.py      : Pluggable bar storage backends (Parquet, legacy CSV)
+- coverage.py   : Index of cached time ranges per series
+- resample.py   : Vectorized OHLCV resampling to higher timeframes
+- stream.py     : Asyncio multi-symbol tick ingestion into ring buffers
+- replay.py     : Local WebSocket server replaying recorded ticks
+- arrays.py     : Memory-mapped per-column bar arrays
+- features.py   : Shared store of materialized feature matrices
+- timeframes.py : Timeframe codes and bar durations
+- handlers/     : Historical bar providers (MT5, …)
 """
 
+from .arrays import BarArrays, write_bar_arrays
+from .features import FeatureStore
 from .fetch import HistoricalFetcher, RealtimeFetcher
 from .pipeline import DataPipeline
+from .store import BarStore, CsvBarStore, ParquetBarStore, create_bar_store
+from .stream import TickRingBuffer, TickStream, TickSubscription
 
-__all__ = ["HistoricalFetcher", "RealtimeFetcher", "DataPipeline"]
+__all__ = [
+    "HistoricalFetcher",
+    "RealtimeFetcher",
+    "DataPipeline",
+    "BarStore",
+    "CsvBarStore",
+    "ParquetBarStore",
+    "create_bar_store",
+    "TickRingBuffer",
+    "TickStream",
+    "TickSubscription",
+    "BarArrays",
+    "write_bar_arrays",
+    "FeatureStore",
+]
@@ -0,0 +1,130 @@
+"""
+Memory-mapped NumPy bar arrays.
+
+A series is stored as a directory holding one contiguous ``{column}.npy``
+per column, ``index.npy`` (datetime64 bar times) and ``meta.json``.
+Opening maps the files read-only, so any number of environments and
+worker processes share the same pages through the OS cache instead of
+private copies.
+"""
+
+import json
+import shutil
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+
+def write_bar_arrays(
+        df: pd.DataFrame,
+        directory: Path,
+        columns: Optional[Sequence[str]] = None,
+        meta: Optional[Dict[str, Any]] = None,
+) -> Path:
+    """
+    Write `df` (numeric columns as float64) in the memory-mapped layout;
+    `meta` adds entries to ``meta.json``.
+    """
+    directory = Path(directory)
+    columns = list(columns or df.select_dtypes("number").columns)
+    tmp = directory.with_name(directory.name + ".tmp")
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir(parents=True)
+
+    index = df.index.to_numpy()
+    if index.dtype.kind != "M":
+        index = index.astype(np.int64)
+    np.save(tmp / "index.npy", index)
+    for col in columns:
+        np.save(tmp / f"{col}.npy", np.ascontiguousarray(df[col].to_numpy(np.float64)))
+    meta = {**(meta or {}), "columns": columns, "length": len(df)}
+    (tmp / "meta.json").write_text(json.dumps(meta))
+
+    shutil.rmtree(directory, ignore_errors=True)
+    tmp.replace(directory)
+    return directory
+
+
+def _datetime64(value: Any) -> np.datetime64:
+    ts = pd.Timestamp(value)
+    if ts.tzinfo is not None:
+        ts = ts.tz_convert(None)  # aware bounds compare as naive UTC
+    return ts.to_datetime64()
+
+
+class BarArrays:
+    """
+    Read-only, memory-mapped column arrays of one bar series, optionally
+    restricted to the rows [start, stop).
+
+    Slicing returns views, and pickling only carries the directory and
+    bounds, so handing a `BarArrays` to a subprocess re-maps the files
+    rather than copying the data.
+    """
+
+    def __init__(self, directory: Path, start: int = 0, stop: Optional[int] = None) -> None:
+        self.directory = Path(directory)
+        self.meta = json.loads((self.directory / "meta.json").read_text())
+        self.start = start
+        self.stop = self.meta["length"] if stop is None else stop
+        self._maps: Dict[str, np.ndarray] = {}
+
+    def _map(self, name: str) -> np.ndarray:
+        arr = self._maps.get(name)
+        if arr is None:
+            arr = np.load(self.directory / f"{name}.npy", mmap_mode="r")
+            self._maps[name] = arr
+        return arr
+
+    @property
+    def columns(self) -> List[str]:
+        return list(self.meta["columns"])
+
+    def __contains__(self, column: str) -> bool:
+        return column in self.meta["columns"]
+
+    def __len__(self) -> int:
+        return self.stop - self.start
+
+    def __getitem__(self, column: str) -> np.ndarray:
+        if column not in self:
+            raise KeyError(column)
+        return self._map(column)[self.start:self.stop]
+
+    @property
+    def index(self) -> np.ndarray:
+        return self._map("index")[self.start:self.stop]
+
+    def slice(self, start: int, stop: Optional[int] = None) -> "BarArrays":
+        """Row window relative to this one (zero-copy)."""
+        stop = len(self) if stop is None else min(stop, len(self))
+        return BarArrays(self.directory, self.start + start, self.start + stop)
+
+    def between(self, start=None, end=None) -> "BarArrays":
+        """Bars in [start, end) by time (zero-copy), like `BarStore.load`."""
+        index = self.index
+        lo, hi = 0, len(self)
+        if start is not None:
+            lo = int(np.searchsorted(index, _datetime64(start), side="left"))
+        if end is not None:
+            hi = int(np.searchsorted(index, _datetime64(end), side="left"))
+        return self.slice(lo, max(lo, hi))
+
+    def to_frame(self, columns: Optional[Sequence[str]] = None, copy: bool = True) -> pd.DataFrame:
+        """
+        DataFrame of the selected columns; with ``copy=False`` the columns
+        stay read-only views of the mapped files.
+        """
+        index = np.array(self.index)
+        if index.dtype.kind == "M":
+            index = pd.DatetimeIndex(index, name="time")
+        if copy:
+            data = {col: np.array(self[col]) for col in (columns or self.columns)}
+            return pd.DataFrame(data, index=index)
+        data = {col: self[col] for col in (columns or self.columns)}
+        return pd.DataFrame(data, index=index, copy=False)
+
+    def __reduce__(self):
+        return BarArrays, (self.directory, self.start, self.stop)
@@ -0,0 +1,64 @@
+"""
+Per-series index of the time ranges already present in the bar cache.
+"""
+
+import json
+from pathlib import Path
+from typing import List, Tuple
+
+import pandas as pd
+
+Interval = Tuple[pd.Timestamp, pd.Timestamp]
+
+
+class CoverageIndex:
+    """
+    Sorted, non-overlapping half-open [start, end) intervals persisted
+    as JSON next to the cached bars.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self.intervals: List[Interval] = []
+        if self.path.exists():
+            raw = json.loads(self.path.read_text())
+            self.intervals = [(pd.Timestamp(s), pd.Timestamp(e)) for s, e in raw]
+
+    def __bool__(self) -> bool:
+        return bool(self.intervals)
+
+    def add(self, start: pd.Timestamp, end: pd.Timestamp) -> None:
+        """Mark [start, end) as covered, merging touching intervals."""
+        if start >= end:
+            return
+        merged: List[Interval] = []
+        for s, e in self.intervals:
+            if e < start or s > end:
+                merged.append((s, e))
+            else:
+                start, end = min(s, start), max(e, end)
+        merged.append((start, end))
+        self.intervals = sorted(merged)
+
+    def missing(self, start: pd.Timestamp, end: pd.Timestamp) -> List[Interval]:
+        """Sub-ranges of [start, end) that are not covered (head, gaps, tail)."""
+        gaps: List[Interval] = []
+        cursor = start
+        for s, e in self.intervals:
+            if e <= cursor:
+                continue
+            if s >= end:
+                break
+            if s > cursor:
+                gaps.append((cursor, s))
+            cursor = max(cursor, e)
+        if cursor < end:
+            gaps.append((cursor, end))
+        return gaps
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        raw = [[s.isoformat(), e.isoformat()] for s, e in self.intervals]
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(raw))
+        tmp.replace(self.path)
@@ -0,0 +1,122 @@
+"""
+Shared feature store.
+
+Feature matrices (the bars plus their indicator columns) are computed once
+per (symbol, timeframe, feature set version) and materialized as
+memory-mapped `BarArrays` under ``{root}/{symbol}/{timeframe}/{version}``.
+Strategies, `MLModel` training and the trading environments read
+zero-copy column and time slices of the same files instead of each
+recomputing and re-slicing their own frames.
+
+The version combines `FEATURE_VERSION` with a hash of the indicator
+module's source, so editing the indicator code selects a new directory
+(older versions are removed). Each matrix also records the fingerprint of
+the bars it was built from and is rebuilt when they change.
+"""
+
+import hashlib
+import inspect
+import shutil
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from perceptrader.config.settings import settings
+from perceptrader.data.arrays import BarArrays, write_bar_arrays
+from perceptrader.utils import fetch as indicators
+from perceptrader.utils.fitness_cache import data_fingerprint
+from perceptrader.utils.indicators import IndicatorEngine
+
+# bump for changes the source hash cannot see (e.g. a dependency upgrade)
+FEATURE_VERSION = 1
+
+BAR_COLUMNS = ("open", "high", "low", "close", "volume")
+FEATURE_COLUMNS = IndicatorEngine.COLUMNS  # model inputs
+
+
+def code_version(compute: Callable[[pd.DataFrame], pd.DataFrame]) -> str:
+    """`FEATURE_VERSION` plus a hash of the module that defines `compute`."""
+    module = inspect.getmodule(compute)
+    source = inspect.getsource(module if module is not None else compute)
+    digest = hashlib.blake2b(source.encode(), digest_size=6).hexdigest()
+    return f"v{FEATURE_VERSION}-{digest}"
+
+
+class FeatureStore:
+    """
+    Materialized feature matrices keyed by (symbol, timeframe, version).
+
+    `get` returns the features of the given bars, building them on first
+    use and whenever the bars or the feature code changed. `open` and
+    `frame` serve what is already materialized, e.g. to other processes.
+    """
+
+    def __init__(
+            self,
+            root: Optional[Path] = None,
+            compute: Callable[[pd.DataFrame], pd.DataFrame] = indicators.add_indicators,
+    ) -> None:
+        self._root = root
+        self.compute = compute
+        self.version = code_version(compute)
+        self.hits = 0
+        self.builds = 0
+        self._lock = threading.Lock()
+        self._locks: Dict[Tuple[str, str], threading.Lock] = {}
+
+    @property
+    def root(self) -> Path:
+        return Path(self._root or settings.FEATURE_DIR)
+
+    def path(self, symbol: str, timeframe: str) -> Path:
+        return self.root / symbol / timeframe / self.version
+
+    def open(self, symbol: str, timeframe: str) -> Optional[BarArrays]:
+        """The materialized features of the current version, if any."""
+        path = self.path(symbol, timeframe)
+        return BarArrays(path) if (path / "meta.json").exists() else None
+
+    def get(self, symbol: str, timeframe: str, bars: pd.DataFrame) -> BarArrays:
+        """Features of `bars`, (re)built unless already materialized from the same bars."""
+        raw = bars[[col for col in BAR_COLUMNS if col in bars.columns]]
+        fingerprint = data_fingerprint(raw, symbol, timeframe)
+        with self._lock:
+            lock = self._locks.setdefault((symbol, timeframe), threading.Lock())
+        with lock:
+            arrays = self.open(symbol, timeframe)
+            if arrays is not None and arrays.meta.get("source") == fingerprint:
+                self.hits += 1
+                return arrays
+
+            features = self.compute(raw)
+            path = write_bar_arrays(
+                features, self.path(symbol, timeframe),
+                meta={"source": fingerprint, "version": self.version},
+            )
+            for stale in path.parent.iterdir():
+                if stale.is_dir() and stale.name != self.version and not stale.name.endswith(".tmp"):
+                    shutil.rmtree(stale, ignore_errors=True)
+            self.builds += 1
+            return BarArrays(path)
+
+    def frame(
+            self,
+            symbol: str,
+            timeframe: str,
+            start=None,
+            end=None,
+            columns: Optional[Sequence[str]] = None,
+    ) -> pd.DataFrame:
+        """
+        Materialized features in [start, end) as a DataFrame of read-only
+        views. Raises KeyError when nothing is materialized yet.
+        """
+        arrays = self.open(symbol, timeframe)
+        if arrays is None:
+            raise KeyError(f"No features for {symbol} {timeframe} ({self.version})")
+        return arrays.between(start, end).to_frame(columns, copy=False)
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "builds": self.builds}
@@ -3,46 +3,99 @@ Data fetchers for historical OHLCV and real-time quotes.
 """
 
 import csv
-import json
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, Optional
 
 import pandas as pd
 import requests
 import websocket
 
 from perceptrader.config.settings import settings
+from perceptrader.data.coverage import CoverageIndex
+from perceptrader.data.handlers import BarProvider, MT5Provider
+from perceptrader.data.store import BarStore, create_bar_store
+from perceptrader.data.stream import DROP_OLDEST, TickRingBuffer, parse_message
+from perceptrader.data.timeframes import timeframe_delta
 
 
 class HistoricalFetcher:
-    """Fetches historical OHLCV bars via MT5 and caches to CSV."""
+    """
+    Fetches historical OHLCV bars from a `BarProvider` (MT5 by default)
+    and caches them in a bar store.
 
-    def __init__(self, symbol: str, timeframe: str, cache_dir: Path):
+    A per-series `CoverageIndex` records which time ranges are cached, so
+    each call only downloads the missing head, tail and interior gaps.
+    """
+
+    def __init__(
+            self,
+            symbol: str,
+            timeframe: str,
+            cache_dir: Path,
+            store: Optional[BarStore] = None,
+            provider: Optional[BarProvider] = None,
+    ):
         self.symbol = symbol
         self.timeframe = timeframe
         self.cache_dir = cache_dir
-        self.cache_dir.mkdir(parents=True, exist_ok=True)
-        self.cache_file = self.cache_dir / f"{symbol}_{timeframe}.csv"
+        self.store = store or create_bar_store(settings.BAR_STORE, cache_dir)
+        self._provider = provider
+        self.coverage = CoverageIndex(
+            Path(cache_dir) / "_coverage" / f"{symbol}_{timeframe}.json"
+        )
+
+    @property
+    def provider(self) -> BarProvider:
+        if self._provider is None:
+            self._provider = MT5Provider()
+        return self._provider
+
+    def _default_end(self) -> pd.Timestamp:
+        """Open time of the current, still-forming bar."""
+        return pd.Timestamp.now().floor(timeframe_delta(self.timeframe))
+
+    def _seed_coverage(self) -> None:
+        """Index caches written before coverage tracking existed."""
+        times = self.store.load(self.symbol, self.timeframe, columns=[]).index
+        if len(times):
+            self.coverage.add(times[0], times[-1] + timeframe_delta(self.timeframe))
 
     def fetch(self, start: str = None, end: str = None) -> pd.DataFrame:
         """
-        Load from cache if present; otherwise, fetch via MT5 and save.
-        `start`/`end` in 'YYYY-MM-DD' format.
+        Return bars in [start, end), downloading only uncached sub-ranges.
+        A failing download raises and leaves its range uncached.
+        `start`/`end` in 'YYYY-MM-DD' format; they default to
+        settings.HISTORY_START and the start of the current bar.
         """
-        if self.cache_file.exists():
-            df = pd.read_csv(self.cache_file, parse_dates=["time"], index_col="time")
-            return df
+        start = pd.Timestamp(start or settings.HISTORY_START)
+        end = pd.Timestamp(end) if end else self._default_end()
+
+        if not self.coverage and self.store.exists(self.symbol, self.timeframe):
+            self._seed_coverage()
 
-        # Placeholder: implement actual MT5 data pull here
-        ohlcv = []  # list of dicts: time, open, high, low, close, volume
-        # e.g., mt5.copy_rates_range(...)
-        df = pd.DataFrame(ohlcv).set_index("time")
-        df.to_csv(self.cache_file)
-        return df
+        for gap_start, gap_end in self.coverage.missing(start, end):
+            bars = self.provider.fetch_range(self.symbol, self.timeframe, gap_start, gap_end)
+            self.store.merge(self.symbol, self.timeframe, bars)
+            if gap_end == end:
+                # the newest bars may not be in the source yet: only the
+                # range up to the last bar received counts as cached
+                if bars.empty:
+                    continue
+                gap_end = bars.index[-1] + timeframe_delta(self.timeframe)
+            self.coverage.add(gap_start, gap_end)
+            self.coverage.save()
+
+        return self.store.load(self.symbol, self.timeframe, start, end)
 
 
 class RealtimeFetcher:
-    """Streams real-time quotes via Intrinio WebSocket or REST."""
+    """
+    Streams real-time quotes via Intrinio WebSocket or REST.
+
+    `start` blocks on a single symbol and keeps the latest ticks in
+    `buffer`; use `perceptrader.data.stream.TickStream` to ingest many
+    symbols over one connection from asyncio code.
+    """
 
     WS_URL = "wss://api.intrinio.com/stream"
 
@@ -50,11 +103,12 @@ class RealtimeFetcher:
         self.symbol = symbol
         self.api_key = api_key
         self.ws: websocket.WebSocketApp = None  # type: ignore
+        self.buffer = TickRingBuffer(settings.TICK_BUFFER_SIZE, DROP_OLDEST)
 
     def _on_message(self, ws, message: str) -> None:
-        data: Dict = json.loads(message)
-        # Process tick… e.g., send to a queue or callback
-        # print(data)
+        ticks = parse_message(message).get(self.symbol)
+        if ticks is not None:
+            self.buffer.push(ticks)
 
     def start(self) -> None:
         """Open WebSocket and subscribe to the symbol."""
@@ -2,10 +2,14 @@
 
 """
 Data source handlers subpackage.
+ - BarProvider : interface for historical bar sources
+ - MT5Provider : MetaTrader5 terminal (imports MT5 lazily)
 Future extensions can add:
- - CSVHandler
  - APIHandler
  - DatabaseHandler
 """
 
-__all__ = []
+from .base import BarProvider
+from .mt5 import MT5Provider
+
+__all__ = ["BarProvider", "MT5Provider"]
@@ -0,0 +1,22 @@
+"""
+Base interface for historical bar providers.
+"""
+
+from abc import ABC, abstractmethod
+
+import pandas as pd
+
+
+class BarProvider(ABC):
+    """Source of historical OHLCV bars (broker terminal, API, fixture, …)."""
+
+    @abstractmethod
+    def fetch_range(
+            self, symbol: str, timeframe: str, start: pd.Timestamp, end: pd.Timestamp
+    ) -> pd.DataFrame:
+        """
+        Return bars opened in [start, end), indexed by `time` with
+        open/high/low/close/volume columns. Empty if none exist; raises
+        when the source fails, so the range is not recorded as cached.
+        """
+        ...
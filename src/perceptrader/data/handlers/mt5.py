@@ -0,0 +1,54 @@
+"""
+MetaTrader5 historical bar provider.
+"""
+
+import threading
+
+import pandas as pd
+
+from perceptrader.config.settings import settings
+from perceptrader.data.handlers.base import BarProvider
+
+
+class MT5Provider(BarProvider):
+    """Pulls bars with `mt5.copy_rates_range` from a local MT5 terminal."""
+
+    # the MT5 terminal connection is process-wide and not thread-safe
+    _lock = threading.Lock()
+    _initialized = False
+
+    def __init__(self) -> None:
+        # imported here so the data package works on hosts without MT5
+        import MetaTrader5 as mt5
+
+        self.mt5 = mt5
+        # every provider (one per concurrent fetcher) shares one connection
+        with self._lock:
+            if not MT5Provider._initialized:
+                if not mt5.initialize(path=settings.MT5_PATH):
+                    raise RuntimeError(f"MT5 initialize failed: {mt5.last_error()}")
+                MT5Provider._initialized = True
+
+    def fetch_range(self, symbol, timeframe, start, end) -> pd.DataFrame:
+        tf = getattr(self.mt5, f"TIMEFRAME_{timeframe}")
+        with self._lock:
+            self.mt5.symbol_select(symbol, True)
+            rates = self.mt5.copy_rates_range(
+                symbol, tf, start.to_pydatetime(), end.to_pydatetime()
+            )
+            # None is MT5's error signal, not "no bars"
+            error = self.mt5.last_error() if rates is None else None
+        if rates is None:
+            raise RuntimeError(f"copy_rates_range failed for {symbol} {timeframe}: {error}")
+        if len(rates) == 0:
+            return pd.DataFrame(
+                columns=["open", "high", "low", "close", "volume"],
+                index=pd.DatetimeIndex([], name="time"),
+            )
+
+        df = pd.DataFrame(rates)
+        df["time"] = pd.to_datetime(df["time"], unit="s")
+        df = df.rename(columns={"tick_volume": "volume"}).set_index("time")
+        df = df[["open", "high", "low", "close", "volume"]]
+        # copy_rates_range is inclusive of `end`
+        return df[df.index < end]
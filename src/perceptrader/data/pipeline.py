@@ -2,15 +2,59 @@
 Pipeline orchestration for fetching and preprocessing data.
 """
 
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import List
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
 
 import pandas as pd
 
 from perceptrader.data.fetch import HistoricalFetcher, RealtimeFetcher
-from perceptrader.utils.fetch import add_indicators
+from perceptrader.data.handlers import BarProvider
+from perceptrader.data.resample import can_derive, derive_timeframes
+from perceptrader.data.store import BarStore, create_bar_store
+from perceptrader.data.timeframes import TIMEFRAME_MINUTES
+from perceptrader.utils.logger import setup_logger
 from perceptrader.config.settings import settings
 
+SeriesKey = Tuple[str, str]
+ProgressCallback = Callable[[str, str, Optional[str]], None]
+
+
+def _describe(error: Exception) -> str:
+    return f"{type(error).__name__}: {error}"
+
+
+def _process_series(
+        df: pd.DataFrame,
+        symbol: str,
+        source: str,
+        targets: List[str],
+        backend: str,
+        processed_dir: Path,
+        session: Dict[str, Any],
+) -> Dict[str, Optional[str]]:
+    """
+    CPU stage (runs in a worker process): derive every target timeframe
+    from the fetched `source` bars and serialize them. Indicators are left
+    to the `FeatureStore`, so they are computed once, from the bars.
+    Returns {timeframe: error message or None}.
+    """
+    try:
+        frames = derive_timeframes(df, source, targets, **session)
+    except Exception as e:
+        return {tf: _describe(e) for tf in targets}
+
+    store = create_bar_store(backend, processed_dir)
+    results: Dict[str, Optional[str]] = {}
+    for tf in targets:
+        try:
+            store.write(symbol, tf, frames[tf])
+        except Exception as e:
+            results[tf] = _describe(e)
+        else:
+            results[tf] = None
+    return results
+
 
 class DataPipeline:
     """Orchestrates full data retrieval and preprocessing."""
@@ -18,16 +62,131 @@ class DataPipeline:
     def __init__(self, symbols: List[str], timeframes: List[str]):
         self.symbols = symbols
         self.timeframes = timeframes
-        self.cache_dir = Path("data/raw")
-        self.processed_dir = Path("data/processed")
-        self.processed_dir.mkdir(parents=True, exist_ok=True)
+        self.cache_dir = settings.DATA_DIR / "raw"
+        self.processed_dir = settings.DATA_DIR / "processed"
+        self.store_backend = settings.BAR_STORE
+        self.base_timeframe = settings.BASE_TIMEFRAME  # "" fetches every timeframe
+        self.session = {
+            "offset": settings.SESSION_OFFSET,
+            "tz": settings.SESSION_TZ or None,
+            "data_tz": settings.DATA_TZ,
+        }
+        self.provider: Optional[BarProvider] = None  # MT5 when left unset
+        self.logger = setup_logger("pipeline")
+
+    def raw_store(self) -> BarStore:
+        return create_bar_store(self.store_backend, self.cache_dir)
+
+    def processed_store(self) -> BarStore:
+        return create_bar_store(self.store_backend, self.processed_dir)
+
+    def _fetch(self, symbol: str, timeframe: str, raw: BarStore) -> pd.DataFrame:
+        """I/O stage: pull (or read cached) raw bars for one series."""
+        hist = HistoricalFetcher(
+            symbol, timeframe, self.cache_dir, store=raw, provider=self.provider
+        )
+        return hist.fetch()
 
-    def run(self) -> None:
-        """Fetch raw data, apply indicators, and save processed CSVs."""
+    def _plan(self) -> Dict[SeriesKey, List[str]]:
+        """
+        Map each series to fetch onto the timeframes built from it. Only
+        the base timeframe is downloaded; every timeframe that nests into
+        it is resampled locally, the rest are fetched as before.
+        """
+        base = self.base_timeframe
+        derived = [
+            tf for tf in self.timeframes
+            if base and tf in TIMEFRAME_MINUTES
+            and can_derive(base, tf, self.session["offset"])
+        ]
+        plan: Dict[SeriesKey, List[str]] = {}
         for symbol in self.symbols:
+            if derived:
+                plan[(symbol, base)] = derived
             for tf in self.timeframes:
-                hist = HistoricalFetcher(symbol, tf, self.cache_dir)
-                df = hist.fetch()
-                df_ind = add_indicators(df)
-                out_file = self.processed_dir / f"{symbol}_{tf}.csv"
-                df_ind.to_csv(out_file)
+                if tf not in derived:
+                    plan[(symbol, tf)] = [tf]
+        return plan
+
+    def run(
+            self,
+            workers: Optional[int] = None,
+            progress: Optional[ProgressCallback] = None,
+    ) -> Dict[SeriesKey, str]:
+        """
+        Fetch raw data, derive timeframes, and save the processed bars.
+
+        With more than one worker, fetches run on a thread pool and the
+        resampling/serialization stage on a process pool, so slow
+        downloads overlap with computation. A failing series is logged and
+        reported without aborting the others.
+
+        Returns a mapping of (symbol, timeframe) to error message for every
+        series that failed; empty on full success.
+        """
+        workers = workers or settings.PIPELINE_WORKERS
+        plan = self._plan()
+        total = len(self.symbols) * len(self.timeframes)
+        failures: Dict[SeriesKey, str] = {}
+        done = 0
+
+        def report(symbol: str, results: Dict[str, Optional[str]]) -> None:
+            nonlocal done
+            for tf, error in results.items():
+                done += 1
+                if error is None:
+                    self.logger.info(f"[{done}/{total}] {symbol} {tf} processed")
+                else:
+                    failures[(symbol, tf)] = error
+                    self.logger.error(f"[{done}/{total}] {symbol} {tf} failed: {error}")
+                if progress is not None:
+                    progress(symbol, tf, error)
+
+        raw = self.raw_store()
+        self.processed_dir.mkdir(parents=True, exist_ok=True)
+
+        def process_args(key: SeriesKey, df: pd.DataFrame) -> tuple:
+            symbol, source = key
+            return (df, symbol, source, plan[key], self.store_backend,
+                    self.processed_dir, self.session)
+
+        if workers <= 1:
+            for key in plan:
+                try:
+                    df = self._fetch(*key, raw)
+                except Exception as e:
+                    report(key[0], {tf: _describe(e) for tf in plan[key]})
+                else:
+                    report(key[0], _process_series(*process_args(key, df)))
+            return failures
+
+        with ThreadPoolExecutor(workers) as io_pool, ProcessPoolExecutor(workers) as cpu_pool:
+            fetches = {io_pool.submit(self._fetch, *key, raw): key for key in plan}
+            jobs = {}
+            for fut in as_completed(fetches):
+                key = fetches[fut]
+                try:
+                    df = fut.result()
+                except Exception as e:
+                    report(key[0], {tf: _describe(e) for tf in plan[key]})
+                    continue
+                jobs[cpu_pool.submit(_process_series, *process_args(key, df))] = key
+            for fut in as_completed(jobs):
+                key = jobs[fut]
+                try:
+                    results = fut.result()
+                except Exception as e:
+                    results = {tf: _describe(e) for tf in plan[key]}
+                report(key[0], results)
+        return failures
+
+    def load(
+            self,
+            symbol: str,
+            timeframe: str,
+            start=None,
+            end=None,
+            columns: Optional[Sequence[str]] = None,
+    ) -> pd.DataFrame:
+        """Load processed bars, optionally projected and time-filtered."""
+        return self.processed_store().load(symbol, timeframe, start, end, columns)
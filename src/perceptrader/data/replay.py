@@ -0,0 +1,67 @@
+"""
+Local WebSocket stand-in that replays recorded ticks.
+
+Speaks the `perceptrader.data.stream` wire format, so `TickStream` can be
+exercised (tests, paper trading, load runs) without a broker connection.
+"""
+
+import asyncio
+import json
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+import websockets
+
+
+class TickReplayServer:
+    """
+    Serves recorded ticks (columns: symbol, time, bid, ask, volume; `time`
+    in epoch ms) to each client for the symbols it subscribes to.
+
+    `rate` is ticks per second per connection (None replays as fast as
+    possible) and `batch` the number of ticks per message.
+    """
+
+    def __init__(self, ticks: pd.DataFrame, rate: Optional[float] = None, batch: int = 100):
+        self.ticks = ticks.sort_values("time", kind="stable")
+        self.rate = rate
+        self.batch = batch
+        self.server = None
+        self.url = ""
+
+    @classmethod
+    def from_csv(cls, path: Path, **kwargs) -> "TickReplayServer":
+        return cls(pd.read_csv(path), **kwargs)
+
+    async def _serve(self, ws) -> None:
+        request = json.loads(await ws.recv())
+        symbols = set(request.get("symbols", []))
+        ticks = self.ticks[self.ticks["symbol"].isin(symbols)]
+        names = ticks["symbol"].to_numpy()
+        values = ticks[["time", "bid", "ask", "volume"]].to_numpy(dtype=np.float64)
+
+        delay = self.batch / self.rate if self.rate else 0.0
+        for lo in range(0, len(ticks), self.batch):
+            chunk_names = names[lo:lo + self.batch]
+            chunk = values[lo:lo + self.batch]
+            message = [
+                {"symbol": sym, "ticks": chunk[chunk_names == sym].tolist()}
+                for sym in dict.fromkeys(chunk_names)
+            ]
+            await ws.send(json.dumps(message))
+            await asyncio.sleep(delay)
+        await ws.close()
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Start listening and return the ws:// URL."""
+        self.server = await websockets.serve(self._serve, host, port)
+        host, port = list(self.server.sockets)[0].getsockname()[:2]
+        self.url = f"ws://{host}:{port}"
+        return self.url
+
+    async def stop(self) -> None:
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
@@ -0,0 +1,133 @@
+"""
+Vectorized OHLCV resampling: build higher timeframes from a base series.
+
+Bins are aligned to the epoch. Whole-day timeframes are binned on the
+session clock: with `tz` set, naive timestamps are read as `data_tz` and
+binned on `tz` wall time, so D1 bars follow the session's midnight across
+DST changes (23h/25h days). Intraday timeframes stay on the absolute
+`data_tz` clock, so a repeated wall-clock hour never merges two real
+hours. `offset` shifts every bin boundary, e.g. "17h" for New York close
+daily bars. Bins without bars (weekends, holidays) are not emitted,
+matching broker-side bars.
+"""
+
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+from perceptrader.data.timeframes import TIMEFRAME_MINUTES, timeframe_delta
+
+# reduction applied to each known column; other columns are dropped
+AGGREGATIONS: Dict[str, str] = {
+    "open": "first",
+    "high": "max",
+    "low": "min",
+    "close": "last",
+    "volume": "sum",
+    "tick_volume": "sum",
+    "real_volume": "sum",
+    "spread": "max",
+}
+
+
+def can_derive(base: str, timeframe: str, offset: str = "0h") -> bool:
+    """True if `timeframe` bins are exact unions of `base` bins."""
+    base_min = TIMEFRAME_MINUTES[base]
+    offset_min = pd.Timedelta(offset) / pd.Timedelta(minutes=1)
+    return (
+            TIMEFRAME_MINUTES[timeframe] % base_min == 0
+            and offset_min % base_min == 0
+    )
+
+
+def _session_tz(timeframe: str, tz: Optional[str]) -> Optional[str]:
+    """`tz` for whole-day timeframes; intraday ones bin on the data clock."""
+    return tz if timeframe_delta(timeframe) % pd.Timedelta(days=1) == pd.Timedelta(0) else None
+
+
+def _session_ns(index: pd.DatetimeIndex, tz: Optional[str], data_tz: str) -> np.ndarray:
+    """Timestamps as int64 ns on the session wall clock."""
+    index = index.as_unit("ns")
+    if tz:
+        index = index.tz_localize(data_tz).tz_convert(tz).tz_localize(None)
+    return index.asi8
+
+
+def _labels(starts_ns: np.ndarray, tz: Optional[str], data_tz: str) -> pd.DatetimeIndex:
+    labels = pd.DatetimeIndex(starts_ns.astype("datetime64[ns]"), name="time")
+    if not tz:
+        return labels
+    return (
+        labels.tz_localize(tz, ambiguous=True, nonexistent="shift_forward")
+        .tz_convert(data_tz)
+        .tz_localize(None)
+    )
+
+
+def resample_bars(
+        df: pd.DataFrame,
+        timeframe: str,
+        offset: str = "0h",
+        tz: Optional[str] = None,
+        data_tz: str = "UTC",
+) -> pd.DataFrame:
+    """Aggregate time-sorted bars into `timeframe` bars in one pass."""
+    columns = [c for c in df.columns if c in AGGREGATIONS]
+    if df.empty:
+        return df[columns].rename_axis("time")
+
+    tz = _session_tz(timeframe, tz)
+    period = timeframe_delta(timeframe).value
+    shift = pd.Timedelta(offset).value
+    bucket = (_session_ns(df.index, tz, data_tz) - shift) // period
+    starts = np.flatnonzero(np.r_[True, bucket[1:] != bucket[:-1]])
+    lasts = np.r_[starts[1:] - 1, len(df) - 1]
+
+    out = {}
+    for col in columns:
+        values = df[col].to_numpy()
+        how = AGGREGATIONS[col]
+        if how == "first":
+            out[col] = values[starts]
+        elif how == "last":
+            out[col] = values[lasts]
+        elif how == "max":
+            out[col] = np.maximum.reduceat(values, starts)
+        elif how == "min":
+            out[col] = np.minimum.reduceat(values, starts)
+        else:
+            out[col] = np.add.reduceat(values, starts)
+
+    index = _labels(bucket[starts] * period + shift, tz, data_tz)
+    return pd.DataFrame(out, index=index.as_unit(df.index.unit))
+
+
+def derive_timeframes(
+        base_df: pd.DataFrame,
+        base: str,
+        timeframes: Iterable[str],
+        offset: str = "0h",
+        tz: Optional[str] = None,
+        data_tz: str = "UTC",
+) -> Dict[str, pd.DataFrame]:
+    """
+    Build every requested timeframe from `base_df`. Each timeframe is
+    aggregated from the coarsest already-built one that nests into it
+    (M1 -> M5 -> M15 -> H1 …), so total work shrinks at every level.
+    """
+    built = {base: base_df}
+    for tf in sorted(set(timeframes), key=TIMEFRAME_MINUTES.__getitem__):
+        if tf in built:
+            continue
+        if not can_derive(base, tf, offset):
+            raise ValueError(f"{tf} cannot be derived from {base} bars")
+        # session-clock bins only nest into the base or other session-clock bins
+        session = _session_tz(tf, tz)
+        source = max(
+            (b for b in built
+             if can_derive(b, tf, offset) and (b == base or _session_tz(b, tz) == session)),
+            key=TIMEFRAME_MINUTES.__getitem__,
+        )
+        built[tf] = resample_bars(built[source], tf, offset, tz, data_tz)
+    return {tf: built[tf] for tf in timeframes}
@@ -0,0 +1,229 @@
+"""
+Bar storage backends for OHLCV and indicator frames.
+
+Every backend stores frames indexed by a ``time`` DatetimeIndex and is
+selected by name through `create_bar_store` (see ``settings.BAR_STORE``):
+  - parquet : typed columnar files partitioned by symbol/timeframe/month
+  - csv     : legacy flat ``{symbol}_{timeframe}.csv`` files
+"""
+
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Type
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - optional for the CSV backend
+    pa = pq = None
+
+TimeLike = Optional[object]
+
+
+def _to_timestamp(value: TimeLike) -> Optional[pd.Timestamp]:
+    return None if value is None else pd.Timestamp(value)
+
+
+def _empty_frame(columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    index = pd.DatetimeIndex([], name="time")
+    return pd.DataFrame(columns=list(columns or []), index=index)
+
+
+class BarStore(ABC):
+    """
+    Common interface for persisted bar series.
+
+    Time ranges are half-open: `start` is inclusive and `end` exclusive.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    @abstractmethod
+    def write(self, symbol: str, timeframe: str, df: pd.DataFrame) -> None:
+        """Replace the stored series with `df`."""
+        ...
+
+    @abstractmethod
+    def load(
+            self,
+            symbol: str,
+            timeframe: str,
+            start: TimeLike = None,
+            end: TimeLike = None,
+            columns: Optional[Sequence[str]] = None,
+    ) -> pd.DataFrame:
+        """Load bars in [start, end), optionally restricted to `columns`."""
+        ...
+
+    @abstractmethod
+    def paths(self, symbol: str, timeframe: str) -> List[Path]:
+        """Return the files that make up a stored series."""
+        ...
+
+    def merge(self, symbol: str, timeframe: str, df: pd.DataFrame) -> None:
+        """Upsert bars into the stored series; new rows win on duplicate times."""
+        if df.empty:
+            return
+        self.write(symbol, timeframe, self._combine(self.load(symbol, timeframe), df))
+
+    def exists(self, symbol: str, timeframe: str) -> bool:
+        return bool(self.paths(symbol, timeframe))
+
+    def size_bytes(self, symbol: str, timeframe: str) -> int:
+        return sum(p.stat().st_size for p in self.paths(symbol, timeframe))
+
+    @staticmethod
+    def _prepare(df: pd.DataFrame) -> pd.DataFrame:
+        """Name the index `time` and make sure it is sorted."""
+        df = df.rename_axis("time")
+        if not df.index.is_monotonic_increasing:
+            df = df.sort_index()
+        return df
+
+    @staticmethod
+    def _combine(old: pd.DataFrame, new: pd.DataFrame) -> pd.DataFrame:
+        if old.empty:
+            return new
+        both = pd.concat([old, new])
+        return both[~both.index.duplicated(keep="last")].sort_index()
+
+
+class CsvBarStore(BarStore):
+    """Legacy backend: one flat CSV file per series."""
+
+    def _file(self, symbol: str, timeframe: str) -> Path:
+        return self.root / f"{symbol}_{timeframe}.csv"
+
+    def paths(self, symbol: str, timeframe: str) -> List[Path]:
+        path = self._file(symbol, timeframe)
+        return [path] if path.exists() else []
+
+    def write(self, symbol: str, timeframe: str, df: pd.DataFrame) -> None:
+        self._prepare(df).to_csv(self._file(symbol, timeframe))
+
+    def load(self, symbol, timeframe, start=None, end=None, columns=None) -> pd.DataFrame:
+        path = self._file(symbol, timeframe)
+        if not path.exists():
+            return _empty_frame(columns)
+
+        usecols = None if columns is None else ["time", *columns]
+        df = pd.read_csv(path, parse_dates=["time"], index_col="time", usecols=usecols)
+        start, end = _to_timestamp(start), _to_timestamp(end)
+        if start is not None:
+            df = df[df.index >= start]
+        if end is not None:
+            df = df[df.index < end]
+        return df
+
+
+class ParquetBarStore(BarStore):
+    """
+    Columnar backend: ``{root}/{symbol}/{timeframe}/{YYYY-MM}.parquet``.
+
+    Loads prune month partitions by file name and push the remaining time
+    predicate and the column projection down into the Parquet reader.
+    """
+
+    COMPRESSION = "zstd"
+
+    def __init__(self, root: Path) -> None:
+        if pq is None:
+            raise ImportError("ParquetBarStore requires pyarrow (or set BAR_STORE=csv)")
+        super().__init__(root)
+
+    def _series_dir(self, symbol: str, timeframe: str) -> Path:
+        return self.root / symbol / timeframe
+
+    def paths(self, symbol: str, timeframe: str) -> List[Path]:
+        series_dir = self._series_dir(symbol, timeframe)
+        if not series_dir.exists():
+            return []
+        return sorted(series_dir.glob("*.parquet"))
+
+    @staticmethod
+    def _month_key(ts: pd.Timestamp) -> str:
+        return f"{ts.year:04d}-{ts.month:02d}"
+
+    def _partitions(self, df: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+        """Split a sorted frame into month partitions without a groupby."""
+        index = df.index
+        months = index.year.to_numpy() * 12 + index.month.to_numpy() - 1
+        bounds = np.flatnonzero(np.diff(months)) + 1
+        starts = np.concatenate(([0], bounds))
+        stops = np.concatenate((bounds, [len(df)]))
+        return {
+            self._month_key(index[lo]): df.iloc[lo:hi]
+            for lo, hi in zip(starts, stops)
+        }
+
+    def _write_partition(self, path: Path, part: pd.DataFrame) -> None:
+        table = pa.Table.from_pandas(part.reset_index(), preserve_index=False)
+        tmp = path.with_suffix(".tmp")
+        pq.write_table(table, tmp, compression=self.COMPRESSION)
+        tmp.replace(path)
+
+    def write(self, symbol: str, timeframe: str, df: pd.DataFrame) -> None:
+        series_dir = self._series_dir(symbol, timeframe)
+        series_dir.mkdir(parents=True, exist_ok=True)
+        for old in self.paths(symbol, timeframe):
+            old.unlink()
+        if df.empty:
+            return
+        for month, part in self._partitions(self._prepare(df)).items():
+            self._write_partition(series_dir / f"{month}.parquet", part)
+
+    def merge(self, symbol: str, timeframe: str, df: pd.DataFrame) -> None:
+        """Upsert bars, rewriting only the month partitions they touch."""
+        if df.empty:
+            return
+        series_dir = self._series_dir(symbol, timeframe)
+        series_dir.mkdir(parents=True, exist_ok=True)
+        for month, part in self._partitions(self._prepare(df)).items():
+            path = series_dir / f"{month}.parquet"
+            if path.exists():
+                old = pq.read_table(path).to_pandas().set_index("time")
+                part = self._combine(old, part)
+            self._write_partition(path, part)
+
+    def load(self, symbol, timeframe, start=None, end=None, columns=None) -> pd.DataFrame:
+        start, end = _to_timestamp(start), _to_timestamp(end)
+        first = None if start is None else self._month_key(start)
+        last = None if end is None else self._month_key(end - pd.Timedelta(1, "ns"))
+
+        filters = []
+        if start is not None:
+            filters.append(("time", ">=", start))
+        if end is not None:
+            filters.append(("time", "<", end))
+        read_cols = None if columns is None else ["time", *columns]
+
+        tables = []
+        for path in self.paths(symbol, timeframe):
+            month = path.stem
+            if (first is not None and month < first) or (last is not None and month > last):
+                continue
+            tables.append(pq.read_table(path, columns=read_cols, filters=filters or None))
+        if not tables:
+            return _empty_frame(columns)
+
+        table = pa.concat_tables(tables) if len(tables) > 1 else tables[0]
+        return table.to_pandas().set_index("time")
+
+
+_BACKENDS: Dict[str, Type[BarStore]] = {
+    "csv": CsvBarStore,
+    "parquet": ParquetBarStore,
+}
+
+
+def create_bar_store(backend: str, root: Path) -> BarStore:
+    """Instantiate a bar store backend by name."""
+    cls = _BACKENDS.get(backend)
+    if cls is None:
+        raise ValueError(f"Unknown bar store '{backend}'")
+    return cls(root)
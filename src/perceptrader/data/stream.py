@@ -0,0 +1,216 @@
+"""
+Asyncio real-time tick ingestion.
+
+One WebSocket connection carries every subscribed symbol. Incoming
+messages are parsed straight into preallocated NumPy ring buffers, one
+per subscription, so consumers pull contiguous tick arrays instead of
+Python objects.
+
+Wire format (JSON), either a single tick
+    {"symbol": "EURUSD", "time": 1700000000000, "bid": 1.1, "ask": 1.1002, "volume": 1}
+or a per-symbol batch
+    {"symbol": "EURUSD", "ticks": [[time, bid, ask, volume], ...]}
+or a list of either. `time` is epoch milliseconds.
+"""
+
+import asyncio
+import json
+from typing import Dict, List, Optional
+
+import numpy as np
+import websockets
+
+from perceptrader.config.settings import settings
+
+TICK_DTYPE = np.dtype([("time", "i8"), ("bid", "f8"), ("ask", "f8"), ("volume", "f8")])
+
+DROP_OLDEST = "drop_oldest"  # overwrite unread ticks (latest data wins)
+DROP_NEWEST = "drop_newest"  # reject incoming ticks while full
+BLOCK = "block"  # stop reading the socket until the consumer catches up
+POLICIES = (DROP_OLDEST, DROP_NEWEST, BLOCK)
+
+
+def parse_message(message) -> Dict[str, np.ndarray]:
+    """Decode one wire message into {symbol: ticks (TICK_DTYPE)}."""
+    payload = json.loads(message)
+    items = payload if isinstance(payload, list) else [payload]
+    rows: Dict[str, List] = {}
+    for item in items:
+        symbol = item.get("symbol")
+        if symbol is None:
+            continue  # heartbeats, acks, …
+        if "ticks" in item:
+            rows.setdefault(symbol, []).extend(item["ticks"])
+        else:
+            rows.setdefault(symbol, []).append(
+                (item["time"], item["bid"], item["ask"], item.get("volume", 0.0))
+            )
+
+    out = {}
+    for symbol, ticks in rows.items():
+        raw = np.asarray(ticks, dtype=np.float64).reshape(-1, 4)
+        arr = np.empty(len(raw), dtype=TICK_DTYPE)
+        arr["time"] = raw[:, 0].astype(np.int64) * 1_000_000  # ms -> ns
+        arr["bid"] = raw[:, 1]
+        arr["ask"] = raw[:, 2]
+        arr["volume"] = raw[:, 3]
+        out[symbol] = arr
+    return out
+
+
+class TickRingBuffer:
+    """Fixed-capacity FIFO of ticks backed by one preallocated array."""
+
+    def __init__(self, capacity: int, policy: str = DROP_OLDEST) -> None:
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown overflow policy '{policy}'")
+        self.data = np.zeros(capacity, dtype=TICK_DTYPE)
+        self.capacity = capacity
+        self.policy = policy
+        self.head = 0  # total ticks written
+        self.tail = 0  # total ticks consumed or dropped
+        self.dropped = 0
+
+    def __len__(self) -> int:
+        return self.head - self.tail
+
+    @property
+    def free(self) -> int:
+        return self.capacity - len(self)
+
+    def _write(self, ticks: np.ndarray) -> None:
+        start = self.head % self.capacity
+        first = min(len(ticks), self.capacity - start)
+        self.data[start:start + first] = ticks[:first]
+        self.data[:len(ticks) - first] = ticks[first:]
+        self.head += len(ticks)
+
+    def push(self, ticks: np.ndarray) -> int:
+        """
+        Append ticks according to the overflow policy and return how many
+        were accepted. Under BLOCK the caller must wait for `free` space.
+        """
+        n = len(ticks)
+        if n > self.free:
+            if self.policy == DROP_OLDEST:
+                if n > self.capacity:
+                    self.dropped += n - self.capacity
+                    ticks = ticks[-self.capacity:]
+                overflow = len(ticks) - self.free
+                self.tail += overflow
+                self.dropped += overflow
+            else:
+                if self.policy == DROP_NEWEST:
+                    self.dropped += n - self.free
+                ticks = ticks[:self.free]
+        self._write(ticks)
+        return len(ticks)
+
+    def pop(self, max_items: Optional[int] = None) -> np.ndarray:
+        """Remove and return up to `max_items` of the oldest ticks (a copy)."""
+        n = len(self) if max_items is None else min(max_items, len(self))
+        start = self.tail % self.capacity
+        if start + n <= self.capacity:
+            out = self.data[start:start + n].copy()
+        else:
+            out = np.concatenate((self.data[start:], self.data[:start + n - self.capacity]))
+        self.tail += n
+        return out
+
+
+class TickSubscription:
+    """A consumer's view of one symbol's tick stream."""
+
+    def __init__(self, symbol: str, capacity: int, policy: str) -> None:
+        self.symbol = symbol
+        self.buffer = TickRingBuffer(capacity, policy)
+        self._data = asyncio.Event()
+        self._space = asyncio.Event()
+
+    @property
+    def dropped(self) -> int:
+        return self.buffer.dropped
+
+    async def _put(self, ticks: np.ndarray) -> None:
+        while len(ticks):
+            accepted = self.buffer.push(ticks)
+            if accepted:
+                self._data.set()
+            ticks = ticks[accepted:]
+            if len(ticks) and self.buffer.policy == BLOCK:
+                self._space.clear()
+                await self._space.wait()
+            else:
+                break
+
+    def poll(self, max_items: Optional[int] = None) -> np.ndarray:
+        """Return buffered ticks without waiting (possibly empty)."""
+        ticks = self.buffer.pop(max_items)
+        if not len(self.buffer):
+            self._data.clear()
+        self._space.set()
+        return ticks
+
+    async def consume(self, max_items: Optional[int] = None) -> np.ndarray:
+        """Wait until ticks are available and return up to `max_items`."""
+        while not len(self.buffer):
+            await self._data.wait()
+            self._data.clear()
+        return self.poll(max_items)
+
+
+class TickStream:
+    """Multiplexes many symbols over a single WebSocket connection."""
+
+    def __init__(
+            self,
+            url: str = settings.TICK_STREAM_URL,
+            api_key: str = settings.BROKER_API_KEY,
+            capacity: int = settings.TICK_BUFFER_SIZE,
+            policy: str = settings.TICK_OVERFLOW,
+    ) -> None:
+        self.url = url
+        self.api_key = api_key
+        self.capacity = capacity
+        self.policy = policy
+        self.subscriptions: Dict[str, List[TickSubscription]] = {}
+        self.ws = None
+        self.received = 0
+
+    def subscribe(
+            self, symbol: str, capacity: Optional[int] = None, policy: Optional[str] = None
+    ) -> TickSubscription:
+        """Register a consumer; each gets its own buffer and overflow policy."""
+        sub = TickSubscription(symbol, capacity or self.capacity, policy or self.policy)
+        new_symbol = symbol not in self.subscriptions
+        self.subscriptions.setdefault(symbol, []).append(sub)
+        if new_symbol and self.ws is not None:
+            asyncio.ensure_future(self._send_subscribe([symbol]))
+        return sub
+
+    async def _send_subscribe(self, symbols: List[str]) -> None:
+        await self.ws.send(json.dumps({"action": "subscribe", "symbols": symbols}))
+
+    async def _dispatch(self, message) -> None:
+        for symbol, ticks in parse_message(message).items():
+            self.received += len(ticks)
+            for sub in self.subscriptions.get(symbol, ()):
+                await sub._put(ticks)
+
+    async def run(self) -> None:
+        """Connect, subscribe and ingest until the server closes or `stop`."""
+        headers = {"Authorization": f"Bearer {self.api_key}"}
+        async with websockets.connect(self.url, additional_headers=headers) as ws:
+            self.ws = ws
+            try:
+                await self._send_subscribe(list(self.subscriptions))
+                async for message in ws:
+                    await self._dispatch(message)
+            except websockets.ConnectionClosed:
+                pass
+            finally:
+                self.ws = None
+
+    async def stop(self) -> None:
+        if self.ws is not None:
+            await self.ws.close()
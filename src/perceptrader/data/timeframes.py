@@ -0,0 +1,25 @@
+"""
+Timeframe codes (MT5 style) and their bar durations.
+"""
+
+from typing import Dict
+
+import pandas as pd
+
+TIMEFRAME_MINUTES: Dict[str, int] = {
+    "M1": 1,
+    "M5": 5,
+    "M15": 15,
+    "M30": 30,
+    "H1": 60,
+    "H4": 240,
+    "D1": 1440,
+}
+
+
+def timeframe_delta(timeframe: str) -> pd.Timedelta:
+    """Duration of one bar of `timeframe`."""
+    minutes = TIMEFRAME_MINUTES.get(timeframe)
+    if minutes is None:
+        raise ValueError(f"Unknown timeframe '{timeframe}'")
+    return pd.Timedelta(minutes=minutes)
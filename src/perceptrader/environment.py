@@ -2,26 +2,62 @@ import gym
 import numpy as np
 import pandas as pd
 from gym import spaces
-from typing import Dict, Tuple, Any
+from numpy.lib.stride_tricks import sliding_window_view
+from typing import Dict, Tuple, Any, Union
+
+from perceptrader.data.arrays import BarArrays
+
+
+def rolling_max(values: np.ndarray, window: int, chunk: int = 1 << 18) -> np.ndarray:
+    """
+    Max of every length-`window` window (len(values) - window + 1 results),
+    reduced over strided views in chunks to bound temporary memory.
+    """
+    views = sliding_window_view(values, window)
+    out = np.empty(len(views))
+    for lo in range(0, len(views), chunk):
+        np.max(views[lo:lo + chunk], axis=1, out=out[lo:lo + chunk])
+    return out
 
 
 class TradingEnv(gym.Env):
-    """Gym environment for trading with OHLCV data."""
+    """
+    Gym environment for trading with OHLCV data.
+
+    `df` is either a DataFrame or memory-mapped `BarArrays`; only the
+    close and volume columns are read, as plain NumPy arrays, so arrays
+    backed by shared files cost no per-environment memory.
+
+    With ``obs_mode="precomputed"`` (default) the per-window volume max is
+    computed once and each observation is written from strided window
+    views into one reused buffer; copy it if you keep observations across
+    steps. ``obs_mode="legacy"`` recomputes and allocates on every step.
+    """
 
     metadata = {"render.modes": ["human"]}
 
     def __init__(
             self,
-            df: pd.DataFrame,
+            df: Union[pd.DataFrame, BarArrays],
             window: int = 50,
             initial_balance: float = 10_000.0,
+            obs_mode: str = "precomputed",
     ):
         super().__init__()
 
+        if obs_mode not in ("precomputed", "legacy"):
+            raise ValueError(f"Unknown obs_mode '{obs_mode}'")
+
         if "volume" not in df.columns:
             raise ValueError("DataFrame must contain a 'volume' column")
 
-        self.df = df.reset_index(drop=True)
+        self.data = df
+        if isinstance(df, BarArrays):
+            self.close = df["close"]
+            self.volume = df["volume"]
+        else:
+            self.close = df["close"].to_numpy(dtype=np.float64)
+            self.volume = df["volume"].to_numpy(dtype=np.float64)
         self.window = window
         self.initial_balance = float(initial_balance)
         self.action_space = spaces.Discrete(3)  # sell, hold, buy
@@ -30,8 +66,23 @@ class TradingEnv(gym.Env):
             low=-np.inf, high=np.inf, shape=(window * 2,), dtype=np.float32
         )
 
+        self.obs_mode = obs_mode
+        if obs_mode == "precomputed":
+            self._close_win = sliding_window_view(self.close, window)
+            self._vol_win = sliding_window_view(self.volume, window)
+            self._vol_max = rolling_max(self.volume, window)
+            self._scratch = np.empty(window)
+            self._obs = np.empty(window * 2, dtype=np.float32)
+
         self.reset()
 
+    @property
+    def df(self) -> pd.DataFrame:
+        """The source bars as a DataFrame (materialized for `BarArrays`)."""
+        if isinstance(self.data, BarArrays):
+            return self.data.to_frame()
+        return self.data
+
     def reset(self) -> np.ndarray:
         self.balance = self.initial_balance
         self.position = 0  # in units of the asset
@@ -39,7 +90,7 @@ class TradingEnv(gym.Env):
         return self._get_obs()
 
     def step(self, action: int) -> Tuple[np.ndarray, float, bool, Dict]:
-        price = self.df.loc[self.idx, "close"]
+        price = float(self.close[self.idx])
         # 0: sell, 1: hold, 2: buy
         if action == 0 and self.position > 0:
             self.balance += self.position * price
@@ -51,13 +102,25 @@ class TradingEnv(gym.Env):
 
         reward = self.balance + self.position * price - self.initial_balance
         self.idx += 1
-        done = self.idx >= len(self.df)
+        done = self.idx >= len(self.close)
         return self._get_obs(), float(reward), done, {}
 
     def _get_obs(self) -> np.ndarray:
-        window_df = self.df.iloc[self.idx - self.window: self.idx]
-        norm_close = window_df["close"].values / window_df["close"].iloc[0] - 1.0
-        norm_vol = window_df["volume"].values / window_df["volume"].max()
+        if self.obs_mode == "legacy":
+            return self._get_obs_legacy()
+        i = self.idx - self.window
+        np.divide(self._close_win[i], self.close[i], out=self._scratch)
+        self._scratch -= 1.0
+        self._obs[:self.window] = self._scratch
+        np.divide(self._vol_win[i], self._vol_max[i], out=self._scratch)
+        self._obs[self.window:] = self._scratch
+        return self._obs
+
+    def _get_obs_legacy(self) -> np.ndarray:
+        close = self.close[self.idx - self.window: self.idx]
+        volume = self.volume[self.idx - self.window: self.idx]
+        norm_close = close / close[0] - 1.0
+        norm_vol = volume / volume.max()
         return np.hstack([norm_close, norm_vol]).astype(np.float32)
 
     def render(self, mode: str = "human") -> None:
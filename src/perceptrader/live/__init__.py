@@ -1,10 +1,12 @@
 # src/perceptrader/live/__init__.py
 
 """
-Live trading subpackage: real and paper execution engines.
+Live trading subpackage: real and paper execution engines, plus the
+tick-to-bar aggregator feeding them.
 """
 
+from .aggregator import BarAggregator
 from .execution import LiveExecution
 from .paper import PaperExecution
 
-__all__ = ["LiveExecution", "PaperExecution"]
+__all__ = ["BarAggregator", "LiveExecution", "PaperExecution"]
@@ -0,0 +1,138 @@
+"""
+Vectorized tick-to-bar aggregation for the live path.
+"""
+
+from typing import Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from perceptrader.data.timeframes import TIMEFRAME_MINUTES, timeframe_delta
+
+BAR_DTYPE = np.dtype([
+    ("time", "i8"),  # bar open, epoch ns
+    ("open", "f8"),
+    ("high", "f8"),
+    ("low", "f8"),
+    ("close", "f8"),
+    ("volume", "f8"),
+])
+
+BarListener = Callable[[str, np.ndarray], None]
+
+
+def _group(time, open_, high, low, close, volume, period: int) -> np.ndarray:
+    """Reduce time-sorted rows into one BAR_DTYPE row per `period` bucket."""
+    bucket = time // period
+    starts = np.flatnonzero(np.r_[True, bucket[1:] != bucket[:-1]])
+    lasts = np.r_[starts[1:] - 1, len(time) - 1]
+    out = np.empty(len(starts), dtype=BAR_DTYPE)
+    out["time"] = bucket[starts] * period
+    out["open"] = open_[starts]
+    out["high"] = np.maximum.reduceat(high, starts)
+    out["low"] = np.minimum.reduceat(low, starts)
+    out["close"] = close[lasts]
+    out["volume"] = np.add.reduceat(volume, starts)
+    return out
+
+
+class BarAggregator:
+    """
+    Maintains in-progress OHLCV bars for several timeframes at once and
+    emits closed bars to listeners as ``listener(timeframe, bars)``.
+
+    Each tick batch (`perceptrader.data.stream.TICK_DTYPE`) is grouped with
+    NumPy reductions; coarser timeframes are grouped from the per-batch
+    bars of the finest timeframe that nests into them rather than from the
+    raw ticks. A bar closes when a tick of a later bar arrives (or on
+    `flush`). Late ticks are folded into the current bar.
+    """
+
+    def __init__(
+            self,
+            timeframes: Iterable[str],
+            price: str = "bid",
+            volume: Optional[str] = None,
+    ) -> None:
+        self.timeframes = sorted(set(timeframes), key=TIMEFRAME_MINUTES.__getitem__)
+        self.periods = {tf: timeframe_delta(tf).value for tf in self.timeframes}
+        self.price = price
+        self.volume = volume  # None counts ticks, like MT5 tick_volume
+        self.current: Dict[str, Optional[np.ndarray]] = {tf: None for tf in self.timeframes}
+        self.listeners: List[BarListener] = []
+        self.last_time = np.iinfo(np.int64).min
+        self.sources: Dict[str, Optional[str]] = {}
+        for i, tf in enumerate(self.timeframes):
+            finer = [s for s in self.timeframes[:i] if self.periods[tf] % self.periods[s] == 0]
+            self.sources[tf] = finer[-1] if finer else None
+
+    def subscribe(self, listener: BarListener) -> None:
+        self.listeners.append(listener)
+
+    def _emit(self, timeframe: str, bars: np.ndarray) -> None:
+        for listener in self.listeners:
+            listener(timeframe, bars)
+
+    def _merge(self, timeframe: str, groups: np.ndarray) -> np.ndarray:
+        """Fold batch groups into the in-progress bar; return closed bars."""
+        cur = self.current[timeframe]
+        closed = groups[:-1]
+        if cur is not None:
+            if groups["time"][0] == cur["time"][0]:
+                first = groups[:1].copy()
+                first["open"] = cur["open"]
+                first["high"] = np.maximum(first["high"], cur["high"])
+                first["low"] = np.minimum(first["low"], cur["low"])
+                first["volume"] += cur["volume"]
+                groups = np.concatenate((first, groups[1:]))
+                closed = groups[:-1]
+            else:
+                closed = np.concatenate((cur, closed))
+        self.current[timeframe] = groups[-1:].copy()
+        return closed
+
+    def update(self, ticks: np.ndarray) -> Dict[str, np.ndarray]:
+        """Consume a tick batch; return and emit {timeframe: closed bars}."""
+        if not len(ticks):
+            return {}
+        time = np.maximum.accumulate(np.maximum(ticks["time"], self.last_time))
+        self.last_time = time[-1]
+        price = np.ascontiguousarray(ticks[self.price], dtype=np.float64)
+        if self.volume is None:
+            volume = np.ones(len(ticks))
+        else:
+            volume = np.ascontiguousarray(ticks[self.volume], dtype=np.float64)
+
+        batch: Dict[str, np.ndarray] = {}
+        closed: Dict[str, np.ndarray] = {}
+        for tf in self.timeframes:
+            src = self.sources[tf]
+            if src is None:
+                rows = (time, price, price, price, price, volume)
+            else:
+                b = batch[src]
+                rows = (b["time"], b["open"], b["high"], b["low"], b["close"], b["volume"])
+            batch[tf] = _group(*rows, period=self.periods[tf])
+            bars = self._merge(tf, batch[tf])
+            if len(bars):
+                closed[tf] = bars
+                self._emit(tf, bars)
+        return closed
+
+    def flush(self, now_ns: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """
+        Close in-progress bars whose period has ended by `now_ns`
+        (all of them when omitted).
+        """
+        if now_ns is not None:
+            # later stragglers belong to the next bar, not a closed one
+            self.last_time = max(self.last_time, now_ns)
+        closed = {}
+        for tf in self.timeframes:
+            cur = self.current[tf]
+            if cur is None:
+                continue
+            if now_ns is None or now_ns >= cur["time"][0] + self.periods[tf]:
+                self.current[tf] = None
+                closed[tf] = cur
+                self._emit(tf, cur)
+        return closed
@@ -3,29 +3,70 @@ Live trading execution.
 """
 
 import time
+from typing import Optional
 
 import MetaTrader5 as mt5
+import numpy as np
+import pandas as pd
+
 from perceptrader.config import settings
+from perceptrader.live.aggregator import BAR_DTYPE, BarAggregator
 from perceptrader.live.base import BaseExecution
-from perceptrader.utils.mt5_utils import calculate_lot_size
+from perceptrader.strategy.base import StrategyBase
+from perceptrader.utils.indicators import IndicatorEngine
+from perceptrader.utils.mt5_utils import calculate_lot_size, ticks_from_mt5
 from perceptrader.utils.logger import setup_logger
 
 
 class LiveExecution(BaseExecution):
-    """Streams live ticks and places orders."""
+    """
+    Streams live ticks, aggregates them into bars and places orders.
+
+    Every tick since the previous poll is pulled with `copy_ticks_from`
+    and fed to a `BarAggregator`; each closed bar updates the incremental
+    indicators and, when a strategy is attached, produces a signal.
+    """
 
-    def __init__(self, symbol: str, timeframe: str) -> None:
+    MAX_TICKS_PER_POLL = 100_000
+
+    def __init__(
+            self, symbol: str, timeframe: str, strategy: Optional[StrategyBase] = None
+    ) -> None:
         super().__init__(symbol, timeframe)
         mt5.initialize(path=settings.MT5_PATH)
         mt5.symbol_select(symbol, True)
         self.logger = setup_logger(f"live_{symbol}_{timeframe}")
+        self.strategy = strategy
+        self.indicators = IndicatorEngine()
+        self.aggregator = BarAggregator([timeframe])
+        self.aggregator.subscribe(self._on_bars)
+
+    def _on_bars(self, timeframe: str, bars: np.ndarray) -> None:
+        for bar in bars:
+            row = {name: bar[name] for name in BAR_DTYPE.names if name != "time"}
+            row.update(self.indicators.update(bar["close"]))
+            ts = pd.Timestamp(int(bar["time"]))
+            self.logger.info(f"{timeframe} bar closed at {ts}: close={row['close']}")
+            if self.strategy is None or not self.indicators.ready:
+                continue
+            frame = pd.DataFrame([row], index=pd.DatetimeIndex([ts], name="time"))
+            signal = int(self.strategy.generate_signals(frame).iloc[-1])
+            self.logger.info(f"{self.strategy.name()} signal: {signal}")
+            # Placeholder: order logic here
+            # lot = calculate_lot_size(...)
+            # mt5.order_send(...)
 
     def run(self) -> None:
         self.logger.info(f"Starting live execution for {self.symbol}")
+        last_msc = mt5.symbol_info_tick(self.symbol).time_msc
         while True:
-            tick = mt5.symbol_info_tick(self.symbol)
-            price = tick.ask
-            # Placeholder: decision logic here
-            # lot = calculate_lot_size(...)
-            # mt5.order_send(...)
+            raw = mt5.copy_ticks_from(
+                self.symbol, last_msc // 1000, self.MAX_TICKS_PER_POLL, mt5.COPY_TICKS_ALL
+            )
+            ticks = ticks_from_mt5(raw)
+            # copy_ticks_from works at second resolution; drop ticks already seen
+            ticks = ticks[ticks["time"] > last_msc * 1_000_000]
+            if len(ticks):
+                last_msc = int(ticks["time"][-1] // 1_000_000)
+                self.aggregator.update(ticks)
             time.sleep(1)
@@ -0,0 +1,107 @@
+"""
+Compiled random-forest inference.
+
+A fitted `RandomForestClassifier` is flattened into contiguous NumPy node
+arrays shared by all trees, and rows are routed through every tree at once
+with at most one gather/compare step per tree level. There is no input
+validation or joblib dispatch, so a single live bar costs a fraction of a
+millisecond instead of several milliseconds. Results are bit-for-bit those of sklearn's `predict` and
+`predict_proba` (with the default `n_jobs=None`): inputs are compared as
+float32 against the same float64 thresholds, and tree probabilities are
+summed in estimator order before dividing by the number of trees.
+"""
+
+from typing import Any
+
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+
+
+class CompiledForest:
+    """Flattened node arrays of a single-output random-forest classifier."""
+
+    def __init__(
+            self,
+            feature: np.ndarray,
+            threshold: np.ndarray,
+            left: np.ndarray,
+            right: np.ndarray,
+            missing_left: np.ndarray,
+            value: np.ndarray,
+            roots: np.ndarray,
+            depth: int,
+            classes: np.ndarray,
+    ) -> None:
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.children = np.column_stack([left, right]).ravel()  # left, right per node
+        self.missing_left = missing_left
+        self.value = value  # (nodes, classes) leaf probabilities
+        self.roots = roots
+        self.depth = depth
+        self.classes = classes
+        self.n_features = int(feature.max()) + 1 if len(feature) else 0
+
+    @classmethod
+    def from_sklearn(cls, forest: RandomForestClassifier) -> "CompiledForest":
+        if forest.n_outputs_ != 1:
+            raise ValueError("Only single-output forests can be compiled")
+        features, thresholds, lefts, rights, missing, values, roots = [], [], [], [], [], [], []
+        offset = 0
+        depth = 0
+        for estimator in forest.estimators_:
+            tree = estimator.tree_
+            nodes = np.arange(tree.node_count)
+            leaf = tree.children_left < 0
+            # leaves point at themselves, so all rows step through the trees together
+            features.append(np.where(leaf, 0, tree.feature))
+            thresholds.append(tree.threshold)
+            lefts.append(np.where(leaf, nodes, tree.children_left) + offset)
+            rights.append(np.where(leaf, nodes, tree.children_right) + offset)
+            missing.append(np.asarray(getattr(tree, "missing_go_to_left", np.zeros(tree.node_count)), bool))
+            values.append(tree.value[:, 0, :forest.n_classes_])
+            roots.append(offset)
+            offset += tree.node_count
+            depth = max(depth, tree.max_depth)
+        return cls(
+            np.concatenate(features).astype(np.intp),
+            np.concatenate(thresholds),
+            np.concatenate(lefts).astype(np.intp),
+            np.concatenate(rights).astype(np.intp),
+            np.concatenate(missing),
+            np.ascontiguousarray(np.concatenate(values), dtype=np.float64),
+            np.array(roots, dtype=np.intp),
+            depth,
+            forest.classes_,
+        )
+
+    def apply(self, X: Any) -> np.ndarray:
+        """(rows, trees) leaf node indices."""
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X[None, :]
+        flat = X.ravel()
+        offsets = (np.arange(len(X)) * X.shape[1])[:, None]
+        nan = bool(np.isnan(flat).any())
+        node = np.broadcast_to(self.roots, (len(X), len(self.roots)))
+        for step in range(self.depth):
+            x = flat.take(offsets + self.feature.take(node))
+            go_left = x <= self.threshold.take(node)
+            if nan:
+                go_left = np.where(np.isnan(x), self.missing_left.take(node), go_left)
+            node = self.children.take(2 * node + ~go_left)
+            if step % 4 == 3 and (self.children.take(2 * node) == node).all():
+                break  # every row has reached a leaf
+        return node
+
+    def predict_proba(self, X: Any) -> np.ndarray:
+        leaves = self.apply(X)
+        # cumsum adds strictly in tree order, like sklearn's accumulation
+        proba = np.cumsum(self.value[leaves], axis=1)[:, -1]
+        proba /= leaves.shape[1]
+        return proba
+
+    def predict(self, X: Any) -> np.ndarray:
+        return self.classes.take(np.argmax(self.predict_proba(X), axis=1), axis=0)
@@ -6,8 +6,13 @@ from pathlib import Path
 from typing import Dict
 
 from perceptrader.models.ml import MLModel
+from perceptrader.models.numpy_policy import NumpyPolicy
+from perceptrader.models.registry import ML, POLICY, RL, ModelRegistry
 from perceptrader.models.rl import RLAgent
 
+# shared, lazily loaded models of settings.MODEL_DIR
+registry = ModelRegistry({ML: MLModel.load, RL: RLAgent.load, POLICY: NumpyPolicy.load})
+
 
 def create_ml_model(params: Dict) -> MLModel:
     return MLModel(params)
@@ -19,8 +24,5 @@ def create_rl_agent(params: Dict) -> RLAgent:
 
 
 def load_model(path: Path):
-    ext = path.suffix
-    if ext == ".joblib":
-        return MLModel.load(path)
-    else:
-        return RLAgent.load(path)
+    """Shared instance of the model at `path` (treat as read-only)."""
+    return registry.get(path)
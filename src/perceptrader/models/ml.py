@@ -2,37 +2,179 @@
 ML model training and inference.
 """
 
-import joblib
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Callable, Dict, Hashable, Mapping, Optional, Union
+
+import joblib
 
+import numpy as np
 import pandas as pd
 from sklearn.ensemble import RandomForestClassifier
 
 from perceptrader.config.settings import settings
+from perceptrader.models.compiled import CompiledForest
+from perceptrader.models.registry import ML, read_record, write_record
 
 
 class MLModel:
-    """RandomForest-based classifier for signal prediction."""
+    """
+    RandomForest-based classifier for signal prediction.
+
+    Small batches (up to `ML_COMPILED_MAX_ROWS` rows, e.g. one live bar)
+    are predicted by a `CompiledForest` built after training or loading,
+    which gives the same results as sklearn without its per-call overhead.
+
+    `update` grows a trained forest with trees fitted on new bars only
+    (sklearn warm start) and retires the oldest trees beyond `max_trees`,
+    so retraining cost follows the new data rather than the full history.
+    """
 
     def __init__(self, params: Dict[str, Any]) -> None:
         self.params = params
         self.model = RandomForestClassifier(**params)
+        self.compiled: Optional[CompiledForest] = None
+        self.trained_until: Any = None  # index of the last bar trained on
+        self.trees_grown = 0  # trees ever fitted, retired ones included
+
+    @property
+    def is_fitted(self) -> bool:
+        return hasattr(self.model, "estimators_")
 
     def train(self, X: pd.DataFrame, y: pd.Series) -> None:
         self.model.fit(X, y)
+        self.trained_until = X.index[-1] if len(X) else None
+        self.trees_grown = len(self.model.estimators_)
+        self.compile()
+
+    def new_rows(self, X: pd.DataFrame) -> pd.DataFrame:
+        """Rows of `X` after the last bar the model was trained on."""
+        if self.trained_until is None:
+            return X
+        return X[X.index > self.trained_until]
 
-    def predict(self, X: pd.DataFrame) -> pd.Series:
+    def update(
+            self,
+            X: pd.DataFrame,
+            y: pd.Series,
+            n_trees: int = settings.ML_UPDATE_TREES,
+            max_trees: int = settings.ML_MAX_TREES,
+    ) -> None:
+        """
+        Add `n_trees` trees fitted on (X, y) only, then keep at most the
+        `max_trees` newest trees (0 keeps all). Untrained models are trained.
+        Raises ValueError for labels or features the forest was not trained on.
+        """
+        if not self.is_fitted:
+            self.train(X, y)
+            return
+        if len(X) == 0:
+            return
+        names = getattr(self.model, "feature_names_in_", None)
+        if names is not None and list(X.columns) != list(names):
+            raise ValueError(f"Features {list(X.columns)} differ from the model's; retrain it")
+        labels = np.asarray(y)
+        classes = self.model.classes_
+        unknown = np.setdiff1d(labels, classes)
+        if len(unknown):
+            raise ValueError(f"Labels {unknown.tolist()} are new to the model; retrain it")
+        # absent classes get zero-weight rows so the new trees keep every class column
+        absent = np.setdiff1d(classes, labels)
+        weights = np.ones(len(labels))
+        if len(absent):
+            X = pd.concat([X, X.iloc[[0] * len(absent)]])
+            labels = np.concatenate([labels, absent])
+            weights = np.concatenate([weights, np.zeros(len(absent))])
+
+        # warm start skips one seed per existing tree, which after retiring
+        # trees would hand new trees the seeds of trees still in the forest
+        seed = self.params.get("random_state")
+        entropy = int(seed) if isinstance(seed, (int, np.integer)) else None
+        fresh = np.random.SeedSequence(entropy, spawn_key=(self.trees_grown,)).generate_state(1)[0]
+        self.model.set_params(
+            warm_start=True, n_estimators=len(self.model.estimators_) + n_trees, random_state=int(fresh)
+        )
+        try:
+            self.model.fit(X, labels, sample_weight=weights)
+        finally:
+            self.model.set_params(warm_start=False, random_state=seed)
+        self.trees_grown += n_trees
+        if max_trees and len(self.model.estimators_) > max_trees:
+            self.model.estimators_ = self.model.estimators_[-max_trees:]
+            self.model.n_estimators = max_trees
+        self.trained_until = X.index[len(y) - 1]
+        self.compile()
+
+    def compile(self) -> None:
+        self.compiled = None
+        if settings.ML_COMPILED_MAX_ROWS > 0 and self.model.n_outputs_ == 1:
+            self.compiled = CompiledForest.from_sklearn(self.model)
+
+    def _matrix(self, X: Union[pd.DataFrame, pd.Series, np.ndarray]) -> np.ndarray:
+        """Feature values in training column order; a Series is one row."""
+        names = getattr(self.model, "feature_names_in_", None)
+        if names is not None and isinstance(X, (pd.Series, pd.DataFrame)):
+            labels = X.index if isinstance(X, pd.Series) else X.columns
+            if not np.array_equal(labels, names):
+                X = X[list(names)]
+        return np.asarray(X, dtype=np.float32)
+
+    def predict(self, X: Union[pd.DataFrame, pd.Series, np.ndarray]) -> np.ndarray:
+        if self.compiled is not None:
+            rows = 1 if np.ndim(X) == 1 else len(X)
+            if rows <= settings.ML_COMPILED_MAX_ROWS:
+                return self.compiled.predict(self._matrix(X))
         return self.model.predict(X)
 
     def save(self, name: str) -> Path:
         path = settings.MODEL_DIR / f"{name}_rf.joblib"
+        path.parent.mkdir(parents=True, exist_ok=True)
         joblib.dump(self.model, path)
+        # timestamps go to JSON as ISO strings, integer positions as numbers
+        trained_until = self.trained_until
+        if isinstance(trained_until, pd.Timestamp):
+            trained_until = trained_until.isoformat()
+        elif isinstance(trained_until, np.generic):
+            trained_until = trained_until.item()
+        write_record(
+            path, name, ML, self.params, trained_until=trained_until, trees_grown=self.trees_grown
+        )
         return path
 
     @classmethod
     def load(cls, path: Path) -> "MLModel":
         model = joblib.load(path)
-        inst = cls(params={})
+        record = read_record(path)
+        inst = cls(params=record["params"])
         inst.model = model
+        trained_until = record.get("trained_until")
+        if isinstance(trained_until, str):
+            trained_until = pd.Timestamp(trained_until)
+        inst.trained_until = trained_until
+        inst.trees_grown = record.get("trees_grown", len(getattr(model, "estimators_", ())))
+        inst.compile()
         return inst
+
+
+def train_concurrently(
+        tasks: Mapping[Hashable, Callable[[int], Any]],
+        workers: int = settings.ML_WORKERS,
+) -> Dict[Hashable, Any]:
+    """
+    Run independent training tasks (e.g. one per symbol/timeframe) on at
+    most `workers` threads. Each task is called with its `n_jobs` share of
+    the cores, so concurrent forests never run more threads than there are
+    cores. sklearn builds trees without holding the GIL, so threads run in
+    parallel and no data is pickled. Results (or raised exceptions) are
+    returned per task.
+    """
+    if not tasks:
+        return {}
+    workers = max(1, min(workers, len(tasks)))
+    n_jobs = max(1, (os.cpu_count() or 1) // workers)
+    with ThreadPoolExecutor(workers) as pool:
+        futures = {key: pool.submit(task, n_jobs) for key, task in tasks.items()}
+    return {
+        key: future.exception() or future.result() for key, future in futures.items()
+    }
@@ -0,0 +1,109 @@
+"""
+Framework-free inference for exported PPO policies.
+
+`NumpyPolicy.from_agent` copies the actor of a trained `RLAgent` (the MLP
+layers and the action head of an SB3 ``MlpPolicy`` with discrete actions)
+into float32 NumPy arrays, and `save` writes them to one ``.npz`` file.
+Loading that file needs neither stable-baselines3 nor torch, and the
+deterministic action is the argmax of the logits computed in float32, as
+torch does.
+"""
+
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+from perceptrader.config.settings import settings
+from perceptrader.models.registry import POLICY, write_record
+
+
+def _relu(x: np.ndarray) -> np.ndarray:
+    return np.maximum(x, 0.0, out=x)
+
+
+def _tanh(x: np.ndarray) -> np.ndarray:
+    return np.tanh(x, out=x)
+
+
+ACTIVATIONS = {"Tanh": _tanh, "ReLU": _relu}
+
+
+class NumpyPolicy:
+    """Deterministic actor of a PPO agent as plain NumPy matrices."""
+
+    def __init__(
+            self,
+            layers: List[Tuple[np.ndarray, np.ndarray]],
+            action: Tuple[np.ndarray, np.ndarray],
+            activation: str,
+    ) -> None:
+        if activation not in ACTIVATIONS:
+            raise ValueError(f"Unsupported activation '{activation}'")
+        # weights are stored (inputs, outputs), so a forward step is x @ W + b
+        self.layers = layers
+        self.action = action
+        self.activation = activation
+        self._activate = ACTIVATIONS[activation]
+        self.observation_size = (layers[0][0] if layers else action[0]).shape[0]
+
+    @classmethod
+    def from_agent(cls, agent: Any) -> "NumpyPolicy":
+        """Export the actor of a trained `RLAgent` (or SB3 PPO model)."""
+        policy = getattr(agent, "agent", agent).policy
+        if type(policy.pi_features_extractor).__name__ != "FlattenExtractor":
+            raise ValueError("Only policies with a flatten feature extractor can be exported")
+        if not hasattr(policy.action_space, "n"):
+            raise ValueError("Only discrete-action policies can be exported")
+
+        def linear(module) -> Tuple[np.ndarray, np.ndarray]:
+            weight = module.weight.detach().cpu().numpy().astype(np.float32)
+            bias = module.bias.detach().cpu().numpy().astype(np.float32)
+            return np.ascontiguousarray(weight.T), bias
+
+        layers = []
+        activation = None
+        for module in policy.mlp_extractor.policy_net:
+            name = type(module).__name__
+            if name == "Linear":
+                layers.append(linear(module))
+            elif name in ACTIVATIONS and activation in (None, name):
+                activation = name
+            else:
+                raise ValueError(f"Cannot export policy layer {name}")
+        return cls(layers, linear(policy.action_net), activation or "Tanh")
+
+    def logits(self, obs: Any) -> np.ndarray:
+        x = np.asarray(obs, dtype=np.float32).reshape(-1, self.observation_size)
+        for weight, bias in self.layers:
+            x = self._activate(x @ weight + bias)
+        weight, bias = self.action
+        return x @ weight + bias
+
+    def predict(self, obs: Any) -> np.ndarray:
+        """Greedy actions for a batch of observations (or one observation)."""
+        actions = np.argmax(self.logits(obs), axis=1)
+        return actions if np.ndim(obs) > 1 else actions[0]
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        out = {"activation": np.array(self.activation)}
+        for i, (weight, bias) in enumerate(self.layers):
+            out[f"w{i}"], out[f"b{i}"] = weight, bias
+        out["w_action"], out["b_action"] = self.action
+        return out
+
+    def save(self, name: str) -> Path:
+        path = settings.MODEL_DIR / f"{name}_policy.npz"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        np.savez(path, **self.arrays())
+        write_record(path, name, POLICY, {"activation": self.activation, "layers": len(self.layers)})
+        return path
+
+    @classmethod
+    def load(cls, path: Path) -> "NumpyPolicy":
+        with np.load(path) as data:
+            layers = []
+            while f"w{len(layers)}" in data:
+                i = len(layers)
+                layers.append((data[f"w{i}"], data[f"b{i}"]))
+            return cls(layers, (data["w_action"], data["b_action"]), str(data["activation"]))
@@ -0,0 +1,174 @@
+"""
+Registry of saved models.
+
+Every artifact saved to `settings.MODEL_DIR` gets a JSON sidecar
+(``{artifact}.json``) with its name, kind, version and training params.
+The registry indexes them and loads models lazily on first use. It keeps
+at most `max_loaded` models in an LRU and hands the same instance to every
+caller, so many strategies and threads share one read-only copy per file.
+"""
+
+import json
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from perceptrader.config.settings import settings
+from perceptrader.utils.checkpoint import atomic_write
+
+ML = "ml"
+RL = "rl"
+POLICY = "policy"  # NumPy export of an RL agent's policy
+
+# (resolved path, mtime, size): a re-saved file gets a new key
+_FileKey = Tuple[str, int, int]
+
+
+def artifact_path(path: Path) -> Path:
+    """The file behind `path` (PPO models are saved with an implicit ``.zip``)."""
+    path = Path(path)
+    if not path.exists() and path.with_name(path.name + ".zip").exists():
+        return path.with_name(path.name + ".zip")
+    return path
+
+
+def model_kind(path: Path) -> str:
+    suffix = Path(path).suffix
+    if suffix == ".joblib":
+        return ML
+    return POLICY if suffix == ".npz" else RL
+
+
+def read_record(path: Path) -> Dict[str, Any]:
+    """Metadata of an artifact; files saved before the registry get version 0."""
+    path = artifact_path(path)
+    sidecar = path.with_name(path.name + ".json")
+    if sidecar.exists():
+        record = json.loads(sidecar.read_text())
+    else:
+        stat = path.stat()
+        record = {
+            "name": path.name,
+            "kind": model_kind(path),
+            "version": 0,
+            "created": datetime.fromtimestamp(stat.st_mtime, timezone.utc).isoformat(),
+            "params": {},
+        }
+    record["path"] = str(path)
+    return record
+
+
+def write_record(
+        path: Path, name: str, kind: str, params: Dict[str, Any], **extra: Any
+) -> Dict[str, Any]:
+    """Write the sidecar of a freshly saved artifact, bumping its version."""
+    path = artifact_path(path)
+    sidecar = path.with_name(path.name + ".json")
+    version = json.loads(sidecar.read_text())["version"] + 1 if sidecar.exists() else 1
+    record = {
+        "name": name,
+        "kind": kind,
+        "version": version,
+        "created": datetime.now(timezone.utc).isoformat(),
+        "params": params,
+        **extra,
+    }
+    atomic_write(sidecar, lambda tmp: tmp.write_text(json.dumps(record, indent=2, default=str)))
+    return record
+
+
+class ModelRegistry:
+    """
+    Lazy, thread-safe LRU of loaded models keyed by file. Concurrent
+    requests for the same model wait for a single load. Loaded models are
+    shared and must be treated as read-only.
+    """
+
+    def __init__(
+            self,
+            loaders: Dict[str, Callable[[Path], Any]],
+            root: Optional[Path] = None,
+            max_loaded: int = settings.MODEL_CACHE_SIZE,
+    ) -> None:
+        self.loaders = loaders
+        self._root = root
+        self.max_loaded = max_loaded
+        self.loaded: "OrderedDict[_FileKey, Any]" = OrderedDict()
+        self.hits = 0
+        self.loads = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._loading: Dict[_FileKey, threading.Lock] = {}
+
+    @property
+    def root(self) -> Path:
+        return Path(self._root or settings.MODEL_DIR)
+
+    def records(self) -> List[Dict[str, Any]]:
+        """Metadata of every artifact in the model directory."""
+        if not self.root.exists():
+            return []
+        artifacts = (
+            sorted(self.root.glob("*.joblib"))
+            + sorted(self.root.glob("*_ppo.zip"))
+            + sorted(self.root.glob("*_policy.npz"))
+        )
+        return [read_record(path) for path in artifacts]
+
+    def latest(self, name: str, kind: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Newest record saved under `name` (e.g. ``EURUSD_M1``)."""
+        matches = [
+            r for r in self.records()
+            if r["name"] == name and (kind is None or r["kind"] == kind)
+        ]
+        return max(matches, key=lambda r: r["created"], default=None)
+
+    def get(self, path: Path) -> Any:
+        """The model saved at `path`, loaded on first use."""
+        path = artifact_path(path)
+        stat = path.stat()
+        key = (str(path.resolve()), stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            if key in self.loaded:
+                self.loaded.move_to_end(key)
+                self.hits += 1
+                return self.loaded[key]
+            gate = self._loading.setdefault(key, threading.Lock())
+
+        with gate:
+            with self._lock:
+                if key in self.loaded:  # loaded by another thread meanwhile
+                    self.loaded.move_to_end(key)
+                    self.hits += 1
+                    return self.loaded[key]
+            try:
+                model = self.loaders[model_kind(path)](path)
+            except BaseException:
+                with self._lock:
+                    self._loading.pop(key, None)
+                raise
+            with self._lock:
+                self._loading.pop(key, None)
+                self.loads += 1
+                # an older version of the same file is no longer needed
+                for stale in [k for k in self.loaded if k[0] == key[0]]:
+                    del self.loaded[stale]
+                self.loaded[key] = model
+                while len(self.loaded) > self.max_loaded:
+                    self.loaded.popitem(last=False)
+                    self.evictions += 1
+            return model
+
+    def clear(self) -> None:
+        with self._lock:
+            self.loaded.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "loaded": len(self.loaded),
+            "hits": self.hits,
+            "loads": self.loads,
+            "evictions": self.evictions,
+        }
@@ -1,13 +1,24 @@
 """
 RL agent training and inference.
+
+stable-baselines3 (and with it torch) is imported only when an agent is
+trained or loaded, so processes that run exported `NumpyPolicy` files
+never pay for it.
 """
 
+import random
 from pathlib import Path
-from typing import Any, Dict
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
 
-from stable_baselines3 import PPO
+import numpy as np
 
 from perceptrader.config.settings import settings
+from perceptrader.scheduler import SuccessiveHalving
+from perceptrader.models.registry import RL, write_record
+from perceptrader.utils.checkpoint import atomic_write
+
+if TYPE_CHECKING:
+    from stable_baselines3 import PPO
 
 
 class RLAgent:
@@ -16,22 +27,139 @@ class RLAgent:
     def __init__(self, policy: str = "MlpPolicy", **kwargs: Any) -> None:
         self.policy = policy
         self.kwargs = kwargs
-        self.agent: PPO = None  # type: ignore
+        self.agent: "PPO" = None  # type: ignore
+
+    @property
+    def timesteps(self) -> int:
+        return 0 if self.agent is None else self.agent.num_timesteps
+
+    @property
+    def observation_size(self) -> int:
+        return self.agent.observation_space.shape[0]
+
+    def train(
+            self,
+            env,
+            total_timesteps: int,
+            resume: bool = False,
+            checkpoint: Optional[Path] = None,
+            checkpoint_every: int = settings.RL_CHECKPOINT_TIMESTEPS,
+    ) -> None:
+        """
+        Train for `total_timesteps`; `resume` continues the current model
+        instead. With a `checkpoint` file the model is saved every
+        `checkpoint_every` timesteps, a restarted call picks up from the
+        last save, and the file is removed once training completes.
+        """
+        from stable_baselines3 import PPO
+
+        if not resume or self.agent is None:
+            self.agent = PPO(self.policy, env, **self.kwargs)
+            resume = False
+        if checkpoint is None:
+            self.agent.learn(total_timesteps=total_timesteps, reset_num_timesteps=not resume)
+            return
+
+        checkpoint = Path(checkpoint)
+        goal = self.agent.num_timesteps + total_timesteps
+        if checkpoint.exists():
+            self.agent = PPO.load(str(checkpoint), env=env)
+        while self.agent.num_timesteps < goal:
+            chunk = goal - self.agent.num_timesteps
+            if checkpoint_every > 0:
+                chunk = min(chunk, checkpoint_every)
+            self.agent.learn(total_timesteps=chunk, reset_num_timesteps=False)
+            atomic_write(checkpoint, self._save_to)
+        checkpoint.unlink(missing_ok=True)
+
+    def _save_to(self, path: Path) -> None:
+        with open(path, "wb") as fh:
+            self.agent.save(fh)
 
-    def train(self, env, total_timesteps: int) -> None:
-        self.agent = PPO(self.policy, env, **self.kwargs)
-        self.agent.learn(total_timesteps=total_timesteps)
+    def evaluate(self, env, steps: int) -> float:
+        """Mean reward per step of the deterministic policy over `steps` steps of a VecEnv."""
+        obs = env.reset()
+        total = 0.0
+        for _ in range(steps):
+            obs, rewards, _, _ = env.step(self.predict(obs))
+            total += float(np.mean(rewards))
+        return total / steps
 
     def predict(self, obs):
         return self.agent.predict(obs, deterministic=True)[0]
 
     def save(self, name: str) -> Path:
         path = settings.MODEL_DIR / f"{name}_ppo"
+        path.parent.mkdir(parents=True, exist_ok=True)
         self.agent.save(str(path))
+        write_record(path, name, RL, {"policy": self.policy, **self.kwargs})
         return path
 
     @classmethod
     def load(cls, path: Path) -> "RLAgent":
+        from stable_baselines3 import PPO
+
         inst = cls()
         inst.agent = PPO.load(str(path))
         return inst
+
+
+def sample_ppo_configs(n: int, seed: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Random PPO hyperparameters for `search_rl_agents`."""
+    rng = random.Random(seed)
+    return [
+        {
+            "learning_rate": 10 ** rng.uniform(-4.5, -3),
+            "n_steps": rng.choice([64, 128, 256, 512]),
+            "gamma": rng.choice([0.9, 0.95, 0.99, 0.999]),
+            "ent_coef": rng.choice([0.0, 0.001, 0.01]),
+            "seed": rng.randrange(2 ** 31),
+        }
+        for _ in range(n)
+    ]
+
+
+def search_rl_agents(
+        configs: List[Dict[str, Any]],
+        make_env: Callable[[], Any],
+        eval_env,
+        min_timesteps: int,
+        max_timesteps: int,
+        eta: float = 3,
+        eval_steps: int = 1000,
+) -> Tuple[RLAgent, List[Tuple[int, float, RLAgent]]]:
+    """
+    Successive halving over PPO `configs` with training timesteps as the
+    budget. Each agent trains on its own `make_env()` environment and
+    promoted agents continue training rather than starting over, so a
+    survivor's budget is its total timesteps. Agents are scored with
+    `RLAgent.evaluate` on `eval_env`. An agent's environment is closed as
+    soon as it is eliminated.
+
+    Returns the best fully trained agent and the ranking of all agents.
+    """
+    scheduler: SuccessiveHalving[RLAgent] = SuccessiveHalving(min_timesteps, max_timesteps, eta)
+    agents = [RLAgent(**config) for config in configs]
+    envs: Dict[int, Any] = {}
+
+    def evaluate(batch: List[RLAgent], budget: float) -> List[float]:
+        # eliminated agents release their environments (and worker processes) now
+        for key in set(envs) - {id(agent) for agent in batch}:
+            envs.pop(key).close()
+        scores = []
+        for agent in batch:
+            if id(agent) not in envs:
+                envs[id(agent)] = make_env()
+            env = envs[id(agent)]
+            remaining = int(budget) - agent.timesteps
+            if remaining > 0:
+                agent.train(env, remaining, resume=True)
+            scores.append(agent.evaluate(eval_env, eval_steps))
+        return scores
+
+    try:
+        ranking = scheduler.run(agents, evaluate)
+    finally:
+        for env in envs.values():
+            env.close()
+    return ranking[0][2], ranking
@@ -1,52 +1,284 @@
 import random
-from typing import Any, Dict
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 
+from perceptrader.backtest import PERIODS_PER_YEAR, MatrixBacktester, periods_per_year
 from perceptrader.config.settings import settings
-from perceptrader.environment import TradingEnv
+from perceptrader.data.arrays import BarArrays, write_bar_arrays
+from perceptrader.scheduler import SuccessiveHalving
+from perceptrader.strategy.factory import create_strategy
+from perceptrader.utils.checkpoint import Checkpoint
+from perceptrader.utils.fitness_cache import FitnessCache, data_fingerprint, params_key
+
+# backtest metrics where smaller values are better
+_MINIMIZE = {"max_drawdown", "turnover", "n_trades"}
+
+# scores a population on the last `rows` bars of the data
+Scorer = Callable[[List[Dict[str, Any]], int], List[float]]
+
+# per-process state of evaluation workers (set by `_init_worker`)
+_worker_score: Optional[Scorer] = None
+
+
+def _init_worker(optimizer: "Optimizer", arrays: BarArrays) -> None:
+    global _worker_score
+    _worker_score = optimizer._scorer(arrays.to_frame(copy=False))
+
+
+def _score_in_worker(job: Tuple[int, List[Dict[str, Any]]]) -> List[float]:
+    rows, population = job
+    return _worker_score(population, rows)
 
 
 class Optimizer:
-    """Genetic-algorithm–based strategy optimizer."""
+    """
+    Genetic-algorithm–based strategy optimizer.
+
+    Each generation is scored as one signal matrix per batch
+    (`StrategyBase.generate_signal_matrix` + `MatrixBacktester`). With
+    `workers` > 1 the batches are spread over a process pool. The
+    market data is written once to memory-mapped arrays that every worker
+    maps read-only, so tasks only carry parameter dicts. All randomness
+    comes from one `seed`ed generator in the parent and scores come back in
+    population order, so results do not depend on the worker count.
 
-    def __init__(self, base_params: Dict[str, Any]):
+    Scores are memoized in a `FitnessCache` keyed by the parameters, the
+    data fingerprint and the scoring config; only distinct, unseen
+    candidates are backtested.
+
+    With `halving_min_fraction` > 0 each generation is raced through a
+    `SuccessiveHalving` scheduler whose budget is the fraction of bars
+    backtested: every candidate is scored on the most recent slice, and
+    only the best 1/`halving_eta` move on to `halving_eta` times more bars,
+    up to the full data. Candidates are ranked by the rung they reached,
+    then by score; only full-data scores can become the best result.
+
+    With a `checkpoint` the population, best-so-far result and RNG state
+    are saved every `checkpoint_every` generations; a later `optimize` of
+    the same data and configuration resumes from there and returns what
+    an uninterrupted run would have.
+    """
+
+    def __init__(
+            self,
+            base_params: Dict[str, Any],
+            strategy: str = settings.STRATEGY,
+            metric: str = settings.OPTIMIZATION_METRIC,
+            spread: float = settings.BACKTEST_SPREAD,
+            commission: float = settings.BACKTEST_COMMISSION,
+            workers: int = settings.OPTIMIZATION_PARAMS["workers"],
+            seed: Optional[int] = settings.OPTIMIZATION_PARAMS["seed"],
+            cache: Optional[FitnessCache] = None,
+            halving_min_fraction: float = settings.OPTIMIZATION_PARAMS["halving_min_fraction"],
+            halving_eta: float = settings.OPTIMIZATION_PARAMS["halving_eta"],
+            checkpoint: Optional[Checkpoint] = None,
+            checkpoint_every: int = settings.CHECKPOINT_EVERY,
+    ):
         self.base = base_params
+        self.strategy = strategy
+        self.metric = metric
+        self.spread = spread
+        self.commission = commission
+        self.periods_per_year = PERIODS_PER_YEAR  # set from the timeframe by `optimize`
+        self.workers = workers
+        self.seed = seed
+        self.rng = random.Random(seed)
+        if cache is None and settings.FITNESS_CACHE_SIZE > 0:
+            cache = FitnessCache(settings.FITNESS_CACHE_SIZE, settings.FITNESS_CACHE_PATH or None)
+        self.cache = cache
+        self.scheduler = (
+            SuccessiveHalving(halving_min_fraction, 1.0, halving_eta)
+            if halving_min_fraction > 0 else None
+        )
+        self.checkpoint = checkpoint
+        self.checkpoint_every = max(1, checkpoint_every)
+        self.history: List[float] = []  # best score after each generation of the last run
         self.pop_size = settings.OPTIMIZATION_PARAMS["population_size"]
         self.generations = settings.OPTIMIZATION_PARAMS["generations"]
 
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        state["cache"] = None  # the cache is consulted in the parent only
+        return state
+
     def _mutate_params(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """Apply small random perturbations to parameters."""
         mutated = params.copy()
         for key, value in params.items():
             if isinstance(value, (int, float)):
-                noise = random.uniform(-0.1, 0.1) * value
+                noise = self.rng.uniform(-0.1, 0.1) * value
                 mutated[key] = type(value)(max(0, value + noise))
         return mutated
 
-    def optimize(self, df: pd.DataFrame) -> Dict[str, Any]:
+    def _tester(self, df: pd.DataFrame) -> MatrixBacktester:
+        return MatrixBacktester(
+            df["close"], spread=self.spread, commission=self.commission,
+            periods_per_year=self.periods_per_year,
+        )
+
+    def _score_batch(
+            self, df: pd.DataFrame, tester: MatrixBacktester, population: List[Dict[str, Any]]
+    ) -> List[float]:
+        """Backtest every parameter set of `population` at once; higher is better."""
+        grid = {key: np.array([params[key] for params in population]) for key in population[0]}
+        strategy = create_strategy(self.strategy, population[0])
+        scores = tester.run(strategy.generate_signal_matrix(df, **grid))[self.metric]
+        scores = np.asarray(scores, dtype=np.float64)
+        if self.metric in _MINIMIZE:
+            scores = -scores
+        return np.where(np.isfinite(scores), scores, -np.inf).tolist()
+
+    def _scorer(self, df: pd.DataFrame) -> Scorer:
+        """Score on trailing slices of `df`, keeping one backtester per slice length."""
+        testers: Dict[int, MatrixBacktester] = {}
+
+        def score(population: List[Dict[str, Any]], rows: int) -> List[float]:
+            frame = df.iloc[len(df) - rows:]
+            if rows not in testers:
+                testers[rows] = self._tester(frame)
+            return self._score_batch(frame, testers[rows], population)
+
+        return score
+
+    def _score(self, df: pd.DataFrame, params: Dict[str, Any]) -> float:
+        """Backtest the strategy with `params` on `df`; higher is better."""
+        return self._score_batch(df, self._tester(df), [params])[0]
+
+    def _config(self) -> Dict[str, Any]:
+        return {
+            "strategy": self.strategy,
+            "metric": self.metric,
+            "spread": self.spread,
+            "commission": self.commission,
+            "periods_per_year": self.periods_per_year,
+        }
+
+    def _cached(
+            self,
+            evaluate: Scorer,
+            population: List[Dict[str, Any]],
+            fingerprint: str,
+            rows: int,
+    ) -> List[float]:
+        """Score `population`, backtesting only candidates missing from the cache."""
+        if self.cache is None:
+            return evaluate(population, rows)
+        config = self._config()
+        keys = [self.cache.key(fingerprint, config, params) for params in population]
+        known: Dict[str, float] = {}
+        pending: Dict[str, Dict[str, Any]] = {}
+        for key, params in zip(keys, population):
+            if key in known or key in pending:
+                continue
+            score = self.cache.get(key)
+            if score is None:
+                pending[key] = params
+            else:
+                known[key] = score
+        if pending:
+            fresh = dict(zip(pending, evaluate(list(pending.values()), rows)))
+            self.cache.put_many(fresh)
+            known.update(fresh)
+        return [known[key] for key in keys]
+
+    def _run_key(self, df: pd.DataFrame, symbol: str, timeframe: str) -> str:
+        """Identify an optimization run, so a checkpoint only resumes the same one."""
+        return params_key({
+            "data": data_fingerprint(df, symbol, timeframe),
+            "config": self._config(),
+            "base": self.base,
+            "seed": self.seed,
+            "pop_size": self.pop_size,
+            "generations": self.generations,
+            "halving": None if self.scheduler is None else self.scheduler.budgets(),
+        })
+
+    @contextmanager
+    def _evaluator(self, df: pd.DataFrame) -> Iterator[Scorer]:
+        """Yield a function scoring a population in order, serially or on a pool."""
+        if self.workers <= 1:
+            yield self._scorer(df)
+            return
+
+        with tempfile.TemporaryDirectory(prefix="perceptrader-opt-") as tmp:
+            arrays = BarArrays(write_bar_arrays(df, Path(tmp) / "data"))
+            with ProcessPoolExecutor(
+                    self.workers, initializer=_init_worker, initargs=(self, arrays)
+            ) as pool:
+                def evaluate(population: List[Dict], rows: int) -> List[float]:
+                    size = -(-len(population) // self.workers)
+                    jobs = [(rows, population[i:i + size]) for i in range(0, len(population), size)]
+                    return [s for scores in pool.map(_score_in_worker, jobs) for s in scores]
+
+                yield evaluate
+
+    def optimize(self, df: pd.DataFrame, symbol: str = "", timeframe: str = "") -> Dict[str, Any]:
         """Run the genetic algorithm and return the best-found parameters."""
-        population = [self._mutate_params(self.base) for _ in range(self.pop_size)]
-        best_score = float("-inf")
-        best_params = self.base
-
-        for _ in range(self.generations):
-            scores = []
-            for params in population:
-                env = TradingEnv(df, window=params.get("window", 50))
-                # TODO: replace with real backtest/run
-                score = 0.0  # placeholder for Sharpe or PnL metric
-                scores.append((score, params))
-
-            scores.sort(key=lambda x: x[0], reverse=True)
-            top_score, top_params = scores[0]
-            if top_score > best_score:
-                best_score, best_params = top_score, top_params
-
-            # breed next generation
-            population = [
-                self._mutate_params(random.choice(scores[: max(1, self.pop_size // 2)])[1])
-                for _ in range(self.pop_size)
-            ]
+        self.periods_per_year = periods_per_year(timeframe)
+        fingerprints: Dict[int, str] = {}
+
+        def score(evaluate: Scorer, population: List[Dict[str, Any]], rows: int) -> List[float]:
+            if self.cache is not None and rows not in fingerprints:
+                fingerprints[rows] = data_fingerprint(df.iloc[len(df) - rows:], symbol, timeframe)
+            return self._cached(evaluate, population, fingerprints.get(rows, ""), rows)
+
+        run_key = self._run_key(df, symbol, timeframe) if self.checkpoint is not None else ""
+        state = self.checkpoint.load() if self.checkpoint is not None else None
+        if state is not None and state["run"] == run_key:
+            start = state["generation"]
+            population = state["population"]
+            best_score, best_params = state["best_score"], state["best_params"]
+            self.history = state["history"]
+            self.rng.setstate(state["rng"])
+        else:
+            start = 0
+            population = [self._mutate_params(self.base) for _ in range(self.pop_size)]
+            best_score = float("-inf")
+            best_params = self.base
+            self.history = []
+
+        with self._evaluator(df) as evaluate:
+            for generation in range(start, self.generations):
+                if self.scheduler is None:
+                    scores = list(zip(score(evaluate, population, len(df)), population))
+                    scores.sort(key=lambda x: x[0], reverse=True)
+                else:
+                    ranked = self.scheduler.run(
+                        population,
+                        lambda batch, fraction: score(
+                            evaluate, batch, max(2, int(round(fraction * len(df))))
+                        ),
+                    )
+                    scores = [(s, params) for _, s, params in ranked]
+
+                top_score, top_params = scores[0]
+                if top_score > best_score:
+                    best_score, best_params = top_score, top_params
+                self.history.append(best_score)
+
+                # breed next generation
+                population = [
+                    self._mutate_params(self.rng.choice(scores[: max(1, self.pop_size // 2)])[1])
+                    for _ in range(self.pop_size)
+                ]
+
+                if self.checkpoint is not None and (generation + 1) % self.checkpoint_every == 0:
+                    self.checkpoint.save({
+                        "run": run_key,
+                        "generation": generation + 1,
+                        "population": population,
+                        "best_score": best_score,
+                        "best_params": best_params,
+                        "history": self.history,
+                        "rng": self.rng.getstate(),
+                    })
 
+        if self.checkpoint is not None:
+            self.checkpoint.clear()
         return best_params
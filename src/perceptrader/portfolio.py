@@ -0,0 +1,273 @@
+"""
+Multi-symbol portfolio backtesting.
+
+The symbols' bars are merged onto their shared (union) time index and
+processed in chunks of rows as (time x symbol) arrays: prices and signals
+are forward-filled, signals become positions, `RiskManagement` sizes them
+as fractions of equity and caps gross leverage, and the portfolio stops
+trading once its drawdown exceeds the limit. Metrics are accumulated chunk
+by chunk and only the per-bar equity curve is kept, so memory depends on
+the chunk size and the number of symbols rather than the length of the
+history. Inputs may be memory-mapped `BarArrays`.
+"""
+
+from typing import Dict, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from perceptrader.backtest import ArrayLike, positions_from_signals
+from perceptrader.backtest import periods_per_year as bars_per_year
+from perceptrader.config.settings import settings
+from perceptrader.data.arrays import BarArrays
+from perceptrader.risk.management import RiskManagement
+
+Bars = Union[pd.DataFrame, BarArrays]
+
+
+def _as_int64(times: np.ndarray) -> np.ndarray:
+    times = np.asarray(times)
+    if times.dtype.kind == "M":
+        return times.astype("datetime64[ns]").view(np.int64)
+    return times.astype(np.int64)
+
+
+def aligned_rows(
+        times: Sequence[np.ndarray], chunk_size: int
+) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Merge sorted per-symbol bar times into chunks of at most `chunk_size`
+    union times. Yields (union times as int64, (rows x symbols) indices of
+    each symbol's latest bar at or before that time, -1 before its first
+    bar). Only `chunk_size` times per symbol are read at once.
+    """
+    cursors = [0] * len(times)
+    while True:
+        windows = [_as_int64(t[c:c + chunk_size]) for t, c in zip(times, cursors)]
+        live = [w for w in windows if len(w)]
+        if not live:
+            return
+        # bars beyond a window that stops short of its series end are not seen yet
+        partial = [w[-1] for w, t, c in zip(windows, times, cursors) if c + chunk_size < len(t)]
+        cutoff = min(partial) if partial else max(w[-1] for w in live)
+        union = np.unique(np.concatenate([w[w <= cutoff] for w in windows]))
+        if len(union) > chunk_size:
+            union = union[:chunk_size]
+            cutoff = union[-1]
+
+        rows = np.empty((len(union), len(times)), dtype=np.int64)
+        for j, window in enumerate(windows):
+            taken = int(np.searchsorted(window, cutoff, side="right"))
+            rows[:, j] = cursors[j] + np.searchsorted(window[:taken], union, side="right") - 1
+            cursors[j] += taken
+        yield union, rows
+
+
+class PortfolioResult:
+    """Portfolio equity curve plus aggregate and per-symbol metrics."""
+
+    def __init__(
+            self,
+            equity: pd.Series,
+            summary: Dict[str, float],
+            per_symbol: pd.DataFrame,
+            correlation: pd.DataFrame,
+    ) -> None:
+        self.equity = equity
+        self.per_symbol = per_symbol  # return contribution, turnover, trades
+        self.correlation = correlation  # of the symbols' net strategy returns
+        self.summary = summary
+
+    def metrics(self) -> Dict[str, float]:
+        return dict(self.summary)
+
+
+class PortfolioBacktester:
+    """
+    Backtests several symbols as one account.
+
+    Without `risk` every symbol holds a position of its full equity, as
+    `run_backtest` does per symbol. With a `RiskManagement`, a position is
+    sized when it is opened so that a stop `stop_atr` ATRs away (ATR from
+    close-to-close moves over `atr_window` bars) risks `risk_per_trade` of
+    equity, gross exposure is capped at `max_leverage`, and everything is
+    flattened for good once drawdown exceeds `max_drawdown`.
+    """
+
+    def __init__(
+            self,
+            risk: Optional[RiskManagement] = None,
+            spread: Union[float, Mapping[str, float]] = settings.BACKTEST_SPREAD,
+            commission: float = settings.BACKTEST_COMMISSION,
+            initial_balance: float = 10_000.0,
+            timeframe: str = "",
+            periods_per_year: Optional[float] = None,
+            long_only: bool = False,
+            atr_window: int = settings.PORTFOLIO_ATR_WINDOW,
+            stop_atr: float = settings.PORTFOLIO_STOP_ATR,
+            chunk_size: int = settings.PORTFOLIO_CHUNK_BARS,
+            account_leverage: float = settings.ACCOUNT_LEVERAGE,
+    ) -> None:
+        self.risk = risk
+        self.spread = spread
+        self.commission = commission
+        self.initial_balance = float(initial_balance)
+        # Sharpe annualization: derived from the bar timeframe unless given
+        self.periods_per_year = periods_per_year or bars_per_year(timeframe)
+        self.long_only = long_only
+        self.atr_window = atr_window
+        self.stop_atr = stop_atr
+        self.chunk_size = chunk_size
+        self.account_leverage = account_leverage
+
+    def run(
+            self,
+            bars: Mapping[str, Bars],
+            signals: Optional[Mapping[str, ArrayLike]] = None,
+    ) -> PortfolioResult:
+        """
+        Backtest `signals` (aligned with each symbol's own bars; by default
+        their "signal" column) against the symbols' close prices.
+        """
+        symbols: List[str] = list(bars)
+        n = len(symbols)
+        times = [np.asarray(bars[s].index) for s in symbols]
+        closes = [np.asarray(bars[s]["close"], dtype=np.float64) for s in symbols]
+        if signals is None:
+            signals = {s: bars[s]["signal"] for s in symbols}
+        sigs = [np.asarray(signals[s], dtype=np.float64) for s in symbols]
+        for s, close, sig in zip(symbols, closes, sigs):
+            if len(close) != len(sig):
+                raise ValueError(f"{s}: {len(sig)} signals for {len(close)} bars")
+        if isinstance(self.spread, Mapping):
+            spread = np.array([self.spread.get(s, 0.0) for s in symbols])
+        else:
+            spread = np.full(n, float(self.spread))
+
+        # carried from one chunk to the next
+        last_price = np.full(n, np.nan)
+        last_pos = np.zeros(n)
+        last_size = np.zeros(n)
+        last_w = np.zeros(n)
+        atr_tail = np.zeros((self.atr_window, n))
+        equity_last = peak = self.initial_balance
+        halted_at = None
+
+        # running metrics
+        count = 0
+        sum_r = sum_r2 = sum_gross = max_gross = max_dd = 0.0
+        turnover = np.zeros(n)
+        n_trades = np.zeros(n, dtype=np.int64)
+        sum_net = np.zeros(n)
+        sum_cross = np.zeros((n, n))
+        curve_times: List[np.ndarray] = []
+        curve: List[np.ndarray] = []
+
+        for union, rows in aligned_rows(times, self.chunk_size):
+            valid = rows >= 0
+            prices = np.full(rows.shape, np.nan)
+            targets = np.zeros(rows.shape)
+            for j in range(n):
+                ok = valid[:, j]
+                prices[ok, j] = closes[j][rows[ok, j]]
+                targets[ok, j] = sigs[j][rows[ok, j]]
+
+            prev_prices = np.vstack([last_price, prices[:-1]])
+            with np.errstate(divide="ignore", invalid="ignore"):
+                moves = np.nan_to_num(prices / prev_prices - 1.0)
+                cost_rate = np.nan_to_num(0.5 * spread / prices) + self.commission
+            pos = positions_from_signals(np.vstack([last_pos, targets]), self.long_only)[1:]
+
+            if self.risk is None:
+                size = np.ones_like(pos)
+            else:
+                diffs = np.vstack([atr_tail, np.nan_to_num(np.abs(prices - prev_prices))])
+                sums = np.cumsum(diffs, axis=0)
+                atr = (sums[self.atr_window:] - sums[:-self.atr_window]) / self.atr_window
+                atr_tail = diffs[-self.atr_window:]
+                raw = self.risk.position_weights(np.nan_to_num(prices), self.stop_atr * atr)
+                # size is fixed when a position is opened or reversed
+                prev_pos = np.vstack([last_pos, pos[:-1]])
+                opened = (pos != prev_pos) & (pos != 0)
+                step = np.arange(len(pos))[:, None]
+                last_open = np.where(opened, step, -1)
+                np.maximum.accumulate(last_open, axis=0, out=last_open)
+                size = np.take_along_axis(raw, np.maximum(last_open, 0), axis=0)
+                size = np.where(last_open >= 0, size, last_size)
+            weights = pos * size
+            if self.risk is not None:
+                weights = self.risk.limit_leverage(weights)
+            if halted_at is not None:
+                weights[:] = 0.0
+
+            def pnl(w: np.ndarray):
+                w_prev = np.vstack([last_w, w[:-1]])
+                trades = np.abs(w - w_prev)
+                net = w_prev * moves - trades * cost_rate
+                eq = equity_last * np.cumprod(1.0 + net.sum(axis=1))
+                return w_prev, trades, net, eq
+
+            w_prev, trades, net, eq = pnl(weights)
+            if self.risk is not None and halted_at is None:
+                peaks = np.maximum(peak, np.maximum.accumulate(eq))
+                breach = np.flatnonzero(1.0 - eq / peaks > self.risk.max_drawdown)
+                if len(breach):
+                    weights[breach[0]:] = 0.0  # flatten at the breaching bar's close
+                    halted_at = union[breach[0]]
+                    w_prev, trades, net, eq = pnl(weights)
+
+            rets = net.sum(axis=1)
+            peaks = np.maximum(peak, np.maximum.accumulate(eq))
+            max_dd = max(max_dd, float((1.0 - eq / peaks).max()))
+            gross = np.abs(weights).sum(axis=1)
+            count += len(rets)
+            sum_r += rets.sum()
+            sum_r2 += rets @ rets
+            sum_gross += gross.sum()
+            max_gross = max(max_gross, float(gross.max()))
+            turnover += trades.sum(axis=0)
+            n_trades += np.count_nonzero(np.sign(weights) != np.sign(w_prev), axis=0)
+            sum_net += net.sum(axis=0)
+            sum_cross += net.T @ net
+            curve_times.append(union)
+            curve.append(eq)
+
+            last_price = prices[-1]
+            last_pos = pos[-1]
+            last_size = size[-1]
+            last_w = weights[-1]
+            equity_last, peak = eq[-1], peaks[-1]
+
+        if count == 0:
+            raise ValueError("No bars to backtest")
+        index = np.concatenate(curve_times)
+        if times[0].dtype.kind == "M":
+            index = pd.DatetimeIndex(index.view("datetime64[ns]"), name="time")
+            halted_at = None if halted_at is None else pd.Timestamp(halted_at)
+        equity = pd.Series(np.concatenate(curve), index=index, name="equity")
+
+        mean = sum_r / count
+        std = np.sqrt(max(sum_r2 / count - mean * mean, 0.0))
+        summary = {
+            "sharpe": float(mean / std * np.sqrt(self.periods_per_year)) if std > 0 else 0.0,
+            "max_drawdown": max_dd,
+            "total_return": float(equity_last / self.initial_balance - 1.0),
+            "turnover": float(turnover.sum()),
+            "n_trades": int(n_trades.sum()),
+            "mean_gross_leverage": sum_gross / count,
+            "max_gross_leverage": max_gross,
+            "max_margin_usage": max_gross / self.account_leverage,  # margin / equity
+            "halted_at": halted_at,
+        }
+        per_symbol = pd.DataFrame(
+            {"return_contribution": sum_net, "turnover": turnover, "n_trades": n_trades},
+            index=pd.Index(symbols, name="symbol"),
+        )
+        means = sum_net / count
+        cov = sum_cross / count - np.outer(means, means)
+        scale = np.sqrt(np.clip(np.diag(cov), 0.0, None))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            corr = np.nan_to_num(cov / np.outer(scale, scale))
+        np.fill_diagonal(corr, 1.0)
+        correlation = pd.DataFrame(corr, index=symbols, columns=symbols)
+        return PortfolioResult(equity, summary, per_symbol, correlation)
@@ -1,3 +1,5 @@
+import numpy as np
+
 from perceptrader.config import settings
 
 
@@ -7,6 +9,7 @@ class RiskManagement:
     def __init__(self):
         self.risk_per_trade = settings.RISK_PER_TRADE
         self.max_drawdown = settings.MAX_DRAWDOWN
+        self.max_leverage = settings.MAX_LEVERAGE
 
     def calculate_position_size(self, entry_price: float, stop_loss: float, balance: float) -> float:
         """Calculate lot size based on risk parameters"""
@@ -16,6 +19,23 @@ class RiskManagement:
             return 0.0
         return round(risk_amount / (price_diff * 10), 2)
 
+    def position_weights(self, prices: np.ndarray, stop_distance: np.ndarray) -> np.ndarray:
+        """
+        Vectorized sizing as a fraction of equity held in notional: a move
+        of `stop_distance` (price units) against the position loses
+        `risk_per_trade` of equity. Zero where the stop distance is not positive.
+        """
+        with np.errstate(divide="ignore", invalid="ignore"):
+            weights = self.risk_per_trade * prices / stop_distance
+        return np.where(stop_distance > 0, np.nan_to_num(weights), 0.0)
+
+    def limit_leverage(self, weights: np.ndarray) -> np.ndarray:
+        """Scale rows of (time x symbol) `weights` whose gross exposure exceeds `max_leverage`."""
+        gross = np.abs(weights).sum(axis=-1, keepdims=True)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            scale = np.where(gross > self.max_leverage, self.max_leverage / gross, 1.0)
+        return weights * scale
+
     def validate_exposure(self, current_drawdown: float) -> bool:
         """Check against maximum allowed drawdown"""
         return current_drawdown <= self.max_drawdown
@@ -0,0 +1,60 @@
+"""
+Successive-halving search scheduling.
+
+Every candidate is first scored on a small budget (a slice of the data, a
+few training timesteps, ...); only the best 1/`eta` of each rung move on
+to an `eta`-times larger budget, until the survivors are scored on the
+full budget. Poor candidates are dropped after costing a fraction of a
+full evaluation.
+"""
+
+import math
+from typing import Callable, Generic, List, Sequence, Tuple, TypeVar
+
+T = TypeVar("T")
+
+# scores `candidates` at `budget`, higher is better, in candidate order
+Evaluate = Callable[[List[T], float], Sequence[float]]
+
+
+class SuccessiveHalving(Generic[T]):
+    """
+    Budgets run from `min_budget` up to `max_budget` in factors of `eta`
+    (the last rung is always `max_budget`).
+    """
+
+    def __init__(self, min_budget: float, max_budget: float, eta: float = 3) -> None:
+        if not 0 < min_budget <= max_budget:
+            raise ValueError("Need 0 < min_budget <= max_budget")
+        if eta <= 1:
+            raise ValueError("eta must be > 1")
+        self.min_budget = min_budget
+        self.max_budget = max_budget
+        self.eta = eta
+        self.spent = 0.0  # sum of budgets evaluated, across runs
+
+    def budgets(self) -> List[float]:
+        n_rungs = int(math.floor(math.log(self.max_budget / self.min_budget, self.eta) + 1e-9)) + 1
+        return [self.max_budget / self.eta ** k for k in range(n_rungs - 1, -1, -1)]
+
+    def run(self, candidates: Sequence[T], evaluate: Evaluate) -> List[Tuple[int, float, T]]:
+        """
+        Race `candidates` through the rungs. Returns (rung reached, score
+        at that rung, candidate), best first: candidates that reached a
+        higher rung rank above all that were cut earlier.
+        """
+        alive = list(range(len(candidates)))
+        reached: List[Tuple[int, float, int]] = []
+        budgets = self.budgets()
+        for rung, budget in enumerate(budgets):
+            scores = evaluate([candidates[i] for i in alive], budget)
+            self.spent += budget * len(alive)
+            order = sorted(range(len(alive)), key=lambda j: scores[j], reverse=True)
+            last = rung == len(budgets) - 1
+            keep = 0 if last else max(1, int(math.ceil(len(alive) / self.eta)))
+            reached.extend((rung, scores[j], alive[j]) for j in order[keep:])
+            alive = [alive[j] for j in order[:keep]]
+
+        # stable sort: ties keep candidate order
+        reached.sort(key=lambda item: (item[0], item[1]), reverse=True)
+        return [(rung, score, candidates[i]) for rung, score, i in reached]
@@ -5,6 +5,7 @@ Base Strategy interface.
 from abc import ABC, abstractmethod
 from typing import Any, Dict
 
+import numpy as np
 import pandas as pd
 
 
@@ -23,6 +24,23 @@ class StrategyBase(ABC):
         """
         ...
 
+    def generate_signal_matrix(self, df: pd.DataFrame, **params: Any) -> np.ndarray:
+        """
+        Signals for many parameter sets at once. Each keyword is an array
+        of values for that parameter (one per set); the result is an int8
+        (n_sets, n_bars) matrix. This default calls `generate_signals` per
+        set; strategies override it with a broadcast implementation.
+        """
+        names = list(params)
+        columns = [np.asarray(params[key]) for key in names]
+        n_sets = len(columns[0]) if columns else 1
+        out = np.empty((n_sets, len(df)), dtype=np.int8)
+        for i in range(n_sets):
+            values = {key: col[i].item() for key, col in zip(names, columns)}
+            strategy = type(self)({**self.params, **values})
+            out[i] = strategy.generate_signals(df).to_numpy()
+        return out
+
     @abstractmethod
     def name(self) -> str:
         """Return a unique strategy name."""
@@ -2,30 +2,65 @@
 Deep RL Strategy wrapper.
 """
 
+from pathlib import Path
 from typing import Any, Dict
 
 import numpy as np
 import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
 
+from perceptrader.config.settings import settings
+from perceptrader.environment import rolling_max
 from perceptrader.strategy.base import StrategyBase
-from perceptrader.models.rl import RLAgent
+from perceptrader.models.factory import load_model
+
+# action (0 sell, 1 hold, 2 buy) -> signal
+ACTION_SIGNALS = np.array([-1, 0, 1], dtype=np.int8)
 
 
 class DeepRLStrategy(StrategyBase):
-    """Uses a pretrained RL agent to generate actions."""
+    """
+    Uses a pretrained RL agent to generate actions. `model_path` may be a
+    saved `RLAgent` or its `NumpyPolicy` export (``.npz``), which gives
+    the same actions without loading stable-baselines3 or torch.
+
+    The signal at bar t is the agent's action on the `TradingEnv`
+    observation of the `window` bars ending at t; bars before the first
+    full window hold. Observations are built from strided views of the
+    close/volume columns and fed to the policy `batch_size` rows at a
+    time, so a long history is one vectorized pass.
+    """
 
     def __init__(self, params: Dict[str, Any]) -> None:
         super().__init__(params)
         model_path = params["model_path"]
-        self.agent = RLAgent.load(model_path)
+        self.agent = load_model(Path(model_path))
+        # observations are (window * 2,): normalized closes then volumes
+        self.window = int(params.get("window") or self.agent.observation_size // 2)
+        self.batch_size = int(params.get("batch_size", settings.RL_INFERENCE_BATCH))
+
+    def observations(self, close: np.ndarray, volume: np.ndarray, start: int, stop: int) -> np.ndarray:
+        """Observations of the windows starting at rows [start, stop), as `TradingEnv` builds them."""
+        w = self.window
+        close_win = sliding_window_view(close, w)[start:stop]
+        vol_win = sliding_window_view(volume, w)[start:stop]
+        obs = np.empty((len(close_win), 2 * w), dtype=np.float32)
+        obs[:, :w] = close_win / close[start:stop, None] - 1.0
+        vol_max = rolling_max(volume[start:stop + w - 1], w)
+        obs[:, w:] = vol_win / vol_max[:, None]
+        return obs
 
     def generate_signals(self, df: pd.DataFrame) -> pd.Series:
-        obs = df[["close", "volume", "rsi", "macd", "macd_signal"]].values
-        actions = self.agent.predict(obs)  # returns 0,1,2
-        # map 0->-1, 1->0, 2->+1
-        mapping = {0: -1, 1: 0, 2: 1}
-        signals = np.vectorize(mapping.get)(actions)
-        return pd.Series(signals, index=df.index, dtype=int)
+        close = df["close"].to_numpy(dtype=np.float64)
+        volume = df["volume"].to_numpy(dtype=np.float64)
+        actions = np.ones(len(df), dtype=np.intp)  # hold until a window is full
+        n_windows = max(len(df) - self.window + 1, 0)
+        for start in range(0, n_windows, self.batch_size):
+            stop = min(start + self.batch_size, n_windows)
+            obs = self.observations(close, volume, start, stop)
+            lo = start + self.window - 1  # bar that ends the first window
+            actions[lo:lo + len(obs)] = np.asarray(self.agent.predict(obs)).reshape(-1)
+        return pd.Series(ACTION_SIGNALS[actions], index=df.index, dtype=int)
 
     def name(self) -> str:
         return "deeprl"
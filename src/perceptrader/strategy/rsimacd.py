@@ -2,8 +2,9 @@
 RSI + MACD Crossover Strategy.
 """
 
-from typing import Dict
+from typing import Any, Dict, Optional
 
+import numpy as np
 import pandas as pd
 
 from perceptrader.strategy.base import StrategyBase
@@ -30,5 +31,36 @@ class RsiMacdStrategy(StrategyBase):
         signal[sell] = -1
         return signal
 
+    def generate_signal_matrix(
+            self,
+            df: pd.DataFrame,
+            rsi_lower: Optional[np.ndarray] = None,
+            rsi_upper: Optional[np.ndarray] = None,
+            **unused: Any,
+    ) -> np.ndarray:
+        """
+        (n_sets, n_bars) int8 signals for arrays of thresholds, broadcast
+        against the indicator columns in a single pass per side. Other
+        parameters are ignored, as `__init__` ignores them, but still count
+        towards the number of sets.
+        """
+        lower = np.atleast_1d(self.rsi_lower if rsi_lower is None else rsi_lower)
+        upper = np.atleast_1d(self.rsi_upper if rsi_upper is None else rsi_upper)
+        lower, upper = np.broadcast_arrays(
+            lower.astype(np.float64), upper.astype(np.float64),
+            *(np.atleast_1d(values) for values in unused.values()),
+        )[:2]
+
+        rsi = df["rsi"].to_numpy(np.float64)
+        macd = df["macd"].to_numpy(np.float64)
+        macd_signal = df["macd_signal"].to_numpy(np.float64)
+        # RSI where each MACD side holds, NaN elsewhere (NaN compares False)
+        rsi_up = np.where(macd > macd_signal, rsi, np.nan)
+        rsi_down = np.where(macd < macd_signal, rsi, np.nan)
+
+        buy = rsi_up < lower[:, None]
+        sell = rsi_down > upper[:, None]
+        return buy.view(np.int8) - sell.view(np.int8)
+
     def name(self) -> str:
         return "rsimacd"
@@ -0,0 +1,85 @@
+"""
+Durable checkpoints for long optimization and training runs.
+
+Files are written to a temporary sibling, flushed to disk and renamed over
+the target, so a crash at any point leaves either the previous checkpoint
+or the new one — never a torn file.
+"""
+
+import json
+import os
+import pickle
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+
+def atomic_write(path: Path, write: Callable[[Path], None]) -> None:
+    """Call `write(tmp)` for a temporary file, fsync it and rename it to `path`."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    write(tmp)
+    with open(tmp, "rb") as fh:
+        os.fsync(fh.fileno())
+    tmp.replace(path)
+
+
+class Checkpoint:
+    """A pickled state object at `path`, saved atomically."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def save(self, state: Any) -> None:
+        atomic_write(self.path, lambda tmp: tmp.write_bytes(pickle.dumps(state)))
+
+    def load(self) -> Optional[Any]:
+        """The saved state, or None when there is none or it cannot be read."""
+        try:
+            return pickle.loads(self.path.read_bytes())
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return None
+
+    def clear(self) -> None:
+        self.path.unlink(missing_ok=True)
+
+
+class RunManifest:
+    """
+    Results of finished pipeline stages, as JSON keyed by series (e.g.
+    ``EURUSD-M1``) and stage name. Each series remembers the fingerprint of
+    the data its stages ran on; a different fingerprint discards them.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self.series: Dict[str, Dict[str, Any]] = {}
+        if self.path.exists():
+            self.series = json.loads(self.path.read_text())
+
+    def bind(self, key: str, fingerprint: str) -> None:
+        """Start (or continue) `key` on data identified by `fingerprint`."""
+        if self.series.get(key, {}).get("fingerprint") != fingerprint:
+            self.series[key] = {"fingerprint": fingerprint, "stages": {}}
+            self.save()
+
+    def done(self, key: str, stage: str) -> bool:
+        return stage in self.series.get(key, {}).get("stages", {})
+
+    def get(self, key: str, stage: str) -> Any:
+        return self.series[key]["stages"][stage]
+
+    def mark(self, key: str, stage: str, result: Any = None) -> None:
+        self.series[key]["stages"][stage] = result
+        self.save()
+
+    def save(self) -> None:
+        blob = json.dumps(self.series, indent=2, default=str)
+        atomic_write(self.path, lambda tmp: tmp.write_text(blob))
+
+    def clear(self) -> None:
+        self.series = {}
+        self.path.unlink(missing_ok=True)
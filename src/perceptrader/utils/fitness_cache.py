@@ -0,0 +1,117 @@
+"""
+Memoized optimizer fitness: an in-memory LRU in front of an optional
+SQLite file, keyed by parameters, data fingerprint and scoring config.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+
+def params_key(params: Dict[str, Any]) -> str:
+    """Canonical hash of a parameter dict (key order does not matter)."""
+    blob = json.dumps(params, sort_keys=True, default=str)
+    return hashlib.sha256(blob.encode()).hexdigest()
+
+
+def data_fingerprint(df: pd.DataFrame, symbol: str = "", timeframe: str = "") -> str:
+    """
+    Identify a dataset by symbol, timeframe, index range and a hash of its
+    numeric content, so edited or extended data gets new cache keys.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(np.ascontiguousarray(df.index.to_numpy()).view(np.uint8))
+    for col in df.select_dtypes("number").columns:
+        digest.update(str(col).encode())
+        digest.update(np.ascontiguousarray(df[col].to_numpy(np.float64)).view(np.uint8))
+    start, end = (df.index[0], df.index[-1]) if len(df) else ("", "")
+    return f"{symbol}|{timeframe}|{start}|{end}|{len(df)}|{digest.hexdigest()}"
+
+
+class FitnessCache:
+    """
+    Two-tier score cache. `path` enables the SQLite tier, which outlives
+    the process so reruns and resumed optimizations reuse earlier scores.
+    """
+
+    def __init__(self, max_items: int = 4096, path: Optional[Path] = None) -> None:
+        self.max_items = max_items
+        self.memory: "OrderedDict[str, float]" = OrderedDict()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._db = None
+        if path:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(str(path), check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS fitness (key TEXT PRIMARY KEY, score REAL)"
+            )
+
+    @staticmethod
+    def key(fingerprint: str, config: Dict[str, Any], params: Dict[str, Any]) -> str:
+        return params_key({"data": fingerprint, "config": config, "params": params})
+
+    def _remember(self, key: str, score: float) -> None:
+        self.memory[key] = score
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.max_items:
+            self.memory.popitem(last=False)
+
+    def get(self, key: str) -> Optional[float]:
+        with self._lock:
+            if key in self.memory:
+                self.memory.move_to_end(key)
+                self.hits += 1
+                return self.memory[key]
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT score FROM fitness WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    score = float("-inf") if row[0] is None else row[0]
+                    self._remember(key, score)
+                    self.disk_hits += 1
+                    return score
+            self.misses += 1
+            return None
+
+    def put(self, key: str, score: float) -> None:
+        self.put_many({key: score})
+
+    def put_many(self, scores: Dict[str, float]) -> None:
+        """Store several scores with a single disk transaction."""
+        with self._lock:
+            for key, score in scores.items():
+                self._remember(key, score)
+            if self._db is not None:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO fitness VALUES (?, ?)", scores.items()
+                )
+                self._db.commit()
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.disk_hits + self.misses
+        return (self.hits + self.disk_hits) / lookups if lookups else 0.0
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": self.hit_rate,
+        }
+
+    def close(self) -> None:
+        if self._db is not None:
+            self._db.close()
+            self._db = None
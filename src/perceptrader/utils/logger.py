@@ -20,6 +20,10 @@ def setup_logger(name: str) -> logging.Logger:
     logger = logging.getLogger(name)
     logger.setLevel(logging.INFO)
 
+    if logger.handlers:
+        # already configured (e.g. several pipelines/executions per process)
+        return logger
+
     log_file = log_dir / f"{name}.log"
     handler = RotatingFileHandler(log_file, maxBytes=1_000_000, backupCount=5)
     fmt = "%(asctime)s — %(name)s — %(levelname)s — %(message)s"
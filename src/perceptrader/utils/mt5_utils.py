@@ -5,6 +5,7 @@ MT5 symbol mapping and order helpers.
 from typing import List, Optional
 
 import MetaTrader5 as mt5
+import numpy as np
 
 from perceptrader.config.settings import settings
 
@@ -39,3 +40,20 @@ def calculate_lot_size(
     dollar_risk = balance * risk_per_trade
     lots = dollar_risk / (stop_pips * pip_value)
     return max(0.01, lots)
+
+
+def ticks_from_mt5(raw) -> np.ndarray:
+    """
+    Convert a `mt5.copy_ticks_*` result into the stream tick layout
+    (`perceptrader.data.stream.TICK_DTYPE`).
+    """
+    from perceptrader.data.stream import TICK_DTYPE
+
+    if raw is None or len(raw) == 0:
+        return np.empty(0, dtype=TICK_DTYPE)
+    ticks = np.empty(len(raw), dtype=TICK_DTYPE)
+    ticks["time"] = raw["time_msc"].astype(np.int64) * 1_000_000
+    ticks["bid"] = raw["bid"]
+    ticks["ask"] = raw["ask"]
+    ticks["volume"] = raw["volume"]
+    return ticks
@@ -0,0 +1,366 @@
+"""
+Batched trading environment: N independent accounts stepped with one
+NumPy call, exposed through stable-baselines3's `VecEnv` interface.
+`SubprocTradingEnv` spreads several such batches over worker processes,
+each trading its own window of the history.
+"""
+
+import multiprocessing as mp
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+from gymnasium import spaces
+from numpy.lib.stride_tricks import sliding_window_view
+from stable_baselines3.common.vec_env import VecEnv
+
+from perceptrader.config.settings import settings
+from perceptrader.data.arrays import BarArrays, write_bar_arrays
+from perceptrader.environment import rolling_max
+
+
+class VecTradingEnv(VecEnv):
+    """
+    Vectorized counterpart of `TradingEnv` with the same actions
+    (0 sell, 1 hold, 2 buy), rewards and observations.
+
+    Every account keeps its own balance, position and bar index as entries
+    of NumPy arrays over the same shared close/volume arrays. Episodes
+    start at random offsets (`random_start`) and end at the last bar or
+    after `episode_length` steps; finished accounts are reset
+    automatically, with the final observation in
+    ``info["terminal_observation"]`` as SB3 expects.
+    """
+
+    render_mode = None
+
+    def __init__(
+            self,
+            df: Union[pd.DataFrame, BarArrays],
+            num_envs: int = 8,
+            window: int = 50,
+            initial_balance: float = 10_000.0,
+            episode_length: Optional[int] = None,
+            random_start: bool = True,
+            seed: Optional[int] = None,
+    ):
+        if "volume" not in df.columns:
+            raise ValueError("DataFrame must contain a 'volume' column")
+        if isinstance(df, BarArrays):
+            self.prices, self.volume = df["close"], df["volume"]
+        else:
+            self.prices = df["close"].to_numpy(dtype=np.float64)
+            self.volume = df["volume"].to_numpy(dtype=np.float64)
+        self.window = window
+        self.initial_balance = float(initial_balance)
+        self.episode_length = episode_length
+        self.random_start = random_start
+        self.rng = np.random.default_rng(seed)
+
+        self._close_win = sliding_window_view(self.prices, window)
+        self._vol_win = sliding_window_view(self.volume, window)
+        self._vol_max = rolling_max(self.volume, window)
+
+        self.balance = np.full(num_envs, self.initial_balance)
+        self.position = np.zeros(num_envs)
+        self.idx = np.full(num_envs, window, dtype=np.int64)
+        self.steps = np.zeros(num_envs, dtype=np.int64)
+        self._actions = np.ones(num_envs, dtype=np.int64)
+        self._obs = np.empty((num_envs, window * 2), dtype=np.float32)
+        self._buf = np.empty((num_envs, window))
+
+        observation_space = spaces.Box(
+            low=-np.inf, high=np.inf, shape=(window * 2,), dtype=np.float32
+        )
+        super().__init__(num_envs, observation_space, spaces.Discrete(3))
+
+    def _starts(self, n: int) -> np.ndarray:
+        if not self.random_start:
+            return np.full(n, self.window, dtype=np.int64)
+        last = len(self.prices) - (self.episode_length or 1)
+        return self.rng.integers(self.window, max(self.window, last) + 1, n)
+
+    def _reset_accounts(self, mask: np.ndarray) -> None:
+        self.balance[mask] = self.initial_balance
+        self.position[mask] = 0.0
+        self.idx[mask] = self._starts(int(mask.sum()))
+        self.steps[mask] = 0
+
+    def _observe(self) -> np.ndarray:
+        rows = self.idx - self.window
+        np.divide(self._close_win[rows], self.prices[rows][:, None], out=self._buf)
+        self._buf -= 1.0
+        self._obs[:, :self.window] = self._buf
+        np.divide(self._vol_win[rows], self._vol_max[rows][:, None], out=self._buf)
+        self._obs[:, self.window:] = self._buf
+        return self._obs.copy()
+
+    def reset(self) -> np.ndarray:
+        if self._seeds[0] is not None:
+            self.rng = np.random.default_rng(self._seeds[0])
+        self._reset_seeds()
+        self._reset_accounts(np.ones(self.num_envs, dtype=bool))
+        return self._observe()
+
+    def step_async(self, actions: np.ndarray) -> None:
+        self._actions = np.asarray(actions, dtype=np.int64).reshape(self.num_envs)
+
+    def step_wait(self):
+        price = self.prices[self.idx]
+        sell = (self._actions == 0) & (self.position > 0)
+        self.balance = np.where(sell, self.balance + self.position * price, self.balance)
+        self.position = np.where(sell, 0.0, self.position)
+        buy = self._actions == 2
+        units = np.where(buy, self.balance / price, 0.0)
+        self.position += units
+        self.balance = np.where(buy, self.balance - units * price, self.balance)
+
+        rewards = (self.balance + self.position * price - self.initial_balance).astype(np.float32)
+        self.idx += 1
+        self.steps += 1
+        ended = self.idx >= len(self.prices)
+        truncated = np.zeros(self.num_envs, dtype=bool)
+        if self.episode_length:
+            truncated = ~ended & (self.steps >= self.episode_length)
+        dones = ended | truncated
+
+        # the window ending at the last bar is valid even when idx == len
+        obs = self._observe()
+        infos: List[dict] = [{} for _ in range(self.num_envs)]
+        if dones.any():
+            for i in np.flatnonzero(dones):
+                infos[i]["terminal_observation"] = obs[i].copy()
+                infos[i]["TimeLimit.truncated"] = bool(truncated[i])
+            self._reset_accounts(dones)
+            obs[dones] = self._observe()[dones]
+        return obs, rewards, dones, infos
+
+    def close(self) -> None:
+        pass
+
+    def _indices(self, indices) -> List[int]:
+        if indices is None:
+            return list(range(self.num_envs))
+        if isinstance(indices, int):
+            return [indices]
+        return list(indices)
+
+    def get_attr(self, attr_name: str, indices=None) -> List[Any]:
+        value = getattr(self, attr_name)
+        if isinstance(value, np.ndarray) and value.shape[:1] == (self.num_envs,):
+            return [value[i] for i in self._indices(indices)]
+        return [value for _ in self._indices(indices)]
+
+    def set_attr(self, attr_name: str, value: Any, indices=None) -> None:
+        current = getattr(self, attr_name, None)
+        if isinstance(current, np.ndarray) and current.shape[:1] == (self.num_envs,):
+            current[self._indices(indices)] = value
+        else:
+            setattr(self, attr_name, value)
+
+    def env_method(self, method_name: str, *method_args, indices=None, **method_kwargs):
+        result = getattr(self, method_name)(*method_args, **method_kwargs)
+        return [result for _ in self._indices(indices)]
+
+    def env_is_wrapped(self, wrapper_class, indices=None) -> List[bool]:
+        return [False for _ in self._indices(indices)]
+
+
+def worker_windows(length: int, workers: int, bars: int, window: int) -> List[Tuple[int, int]]:
+    """
+    Row ranges [start, stop) of the history for each worker. With
+    ``bars <= 0`` the history is split into contiguous slices (overlapping
+    by `window` rows, so every bar can be traded); otherwise each worker
+    gets `bars` rows, the windows' starts evenly spread over the history.
+    """
+    if length <= window:
+        raise ValueError(f"Need more than {window} bars, got {length}")
+    if bars <= 0:
+        edges = np.linspace(window, length, workers + 1).astype(int)
+        return [(int(lo) - window, int(hi)) for lo, hi in zip(edges[:-1], edges[1:])]
+    bars = min(max(bars, window + 1), length)
+    starts = np.linspace(0, length - bars, workers).astype(int)
+    return [(int(lo), int(lo) + bars) for lo in starts]
+
+
+def _worker(remote, parent_remote, arrays: BarArrays, kwargs: Dict[str, Any]) -> None:
+    parent_remote.close()
+    env = VecTradingEnv(arrays, **kwargs)
+    try:
+        while True:
+            cmd, data = remote.recv()
+            if cmd == "step":
+                remote.send(env.step(data))
+            elif cmd == "reset":
+                if data is not None:
+                    env.seed(data)
+                remote.send(env.reset())
+            elif cmd == "get_attr":
+                remote.send(env.get_attr(*data))
+            elif cmd == "set_attr":
+                remote.send(env.set_attr(*data))
+            elif cmd == "env_method":
+                name, args, kwargs_, indices = data
+                remote.send(env.env_method(name, *args, indices=indices, **kwargs_))
+            elif cmd == "close":
+                remote.close()
+                break
+    except (KeyboardInterrupt, EOFError):
+        pass
+
+
+class SubprocTradingEnv(VecEnv):
+    """
+    `VecTradingEnv` batches of `envs_per_worker` accounts in `workers`
+    subprocesses, stepped in parallel. Worker ``i`` trades the rows
+    `worker_windows` assigns it (``worker_bars``) with its own random
+    episode offsets (seeded ``seed + i``).
+
+    The bars are handed to workers as memory-mapped `BarArrays`; a
+    DataFrame is first written to a temporary directory that lives until
+    `close`. Only actions, observations and rewards cross process
+    boundaries.
+    """
+
+    render_mode = None
+
+    def __init__(
+            self,
+            df: Union[pd.DataFrame, BarArrays],
+            workers: int = settings.RL_WORKERS,
+            envs_per_worker: int = settings.RL_N_ENVS,
+            window: int = 50,
+            worker_bars: int = settings.RL_WORKER_BARS,
+            initial_balance: float = 10_000.0,
+            episode_length: Optional[int] = None,
+            seed: Optional[int] = None,
+            start_method: Optional[str] = None,
+    ):
+        if "volume" not in df.columns:
+            raise ValueError("DataFrame must contain a 'volume' column")
+        workers = max(1, workers)
+        self._tmp = None
+        if isinstance(df, BarArrays):
+            arrays = df
+        else:
+            self._tmp = tempfile.TemporaryDirectory(prefix="perceptrader-rl-")
+            arrays = BarArrays(write_bar_arrays(df, Path(self._tmp.name) / "data", ["close", "volume"]))
+        self.windows = worker_windows(len(arrays), workers, worker_bars, window)
+        self.envs_per_worker = envs_per_worker
+
+        if start_method is None:
+            # forking a process that has initialised torch threads is unsafe
+            start_method = "forkserver" if "forkserver" in mp.get_all_start_methods() else "spawn"
+        ctx = mp.get_context(start_method)
+        self.remotes, self.processes = [], []
+        for i, (lo, hi) in enumerate(self.windows):
+            kwargs = {
+                "num_envs": envs_per_worker,
+                "window": window,
+                "initial_balance": initial_balance,
+                "episode_length": episode_length,
+                "seed": None if seed is None else seed + i,
+            }
+            remote, work_remote = ctx.Pipe()
+            process = ctx.Process(
+                target=_worker, args=(work_remote, remote, arrays.slice(lo, hi), kwargs), daemon=True
+            )
+            process.start()
+            work_remote.close()
+            self.remotes.append(remote)
+            self.processes.append(process)
+        self.closed = False
+
+        observation_space = spaces.Box(
+            low=-np.inf, high=np.inf, shape=(window * 2,), dtype=np.float32
+        )
+        super().__init__(workers * envs_per_worker, observation_space, spaces.Discrete(3))
+
+    def step_async(self, actions: np.ndarray) -> None:
+        actions = np.asarray(actions, dtype=np.int64).reshape(len(self.remotes), self.envs_per_worker)
+        for remote, batch in zip(self.remotes, actions):
+            remote.send(("step", batch))
+
+    def step_wait(self):
+        results = [remote.recv() for remote in self.remotes]
+        obs, rewards, dones, infos = zip(*results)
+        return (
+            np.concatenate(obs), np.concatenate(rewards), np.concatenate(dones),
+            [info for batch in infos for info in batch],
+        )
+
+    def reset(self) -> np.ndarray:
+        for i, remote in enumerate(self.remotes):
+            remote.send(("reset", self._seeds[i * self.envs_per_worker]))
+        obs = np.concatenate([remote.recv() for remote in self.remotes])
+        self._reset_seeds()
+        return obs
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        for remote in self.remotes:
+            remote.send(("close", None))
+        for process in self.processes:
+            process.join()
+        if self._tmp is not None:
+            self._tmp.cleanup()
+        self.closed = True
+
+    def _targets(self, indices) -> Dict[int, List[int]]:
+        """Worker -> its local env indices, for global `indices`."""
+        if indices is None:
+            indices = range(self.num_envs)
+        elif isinstance(indices, int):
+            indices = [indices]
+        targets: Dict[int, List[int]] = {}
+        for i in indices:
+            targets.setdefault(i // self.envs_per_worker, []).append(i % self.envs_per_worker)
+        return targets
+
+    def _call(self, cmd: str, build, indices) -> List[Any]:
+        targets = self._targets(indices)
+        for worker, local in targets.items():
+            self.remotes[worker].send((cmd, build(local)))
+        return [value for worker in targets for value in self.remotes[worker].recv()]
+
+    def get_attr(self, attr_name: str, indices=None) -> List[Any]:
+        return self._call("get_attr", lambda local: (attr_name, local), indices)
+
+    def set_attr(self, attr_name: str, value: Any, indices=None) -> None:
+        targets = self._targets(indices)
+        for worker, local in targets.items():
+            self.remotes[worker].send(("set_attr", (attr_name, value, local)))
+        for worker in targets:
+            self.remotes[worker].recv()
+
+    def env_method(self, method_name: str, *method_args, indices=None, **method_kwargs):
+        return self._call(
+            "env_method", lambda local: (method_name, method_args, method_kwargs, local), indices
+        )
+
+    def env_is_wrapped(self, wrapper_class, indices=None) -> List[bool]:
+        return [False for local in self._targets(indices).values() for _ in local]
+
+
+def make_training_env(
+        df: Union[pd.DataFrame, BarArrays],
+        window: int = 50,
+        workers: int = settings.RL_WORKERS,
+        num_envs: int = settings.RL_N_ENVS,
+        worker_bars: int = settings.RL_WORKER_BARS,
+        episode_length: Optional[int] = settings.RL_EPISODE_LENGTH or None,
+        seed: Optional[int] = None,
+) -> VecEnv:
+    """
+    The PPO training environment: `num_envs` accounts in process, or with
+    ``workers > 0`` that many accounts in each of `workers` subprocesses.
+    """
+    if workers > 0:
+        return SubprocTradingEnv(
+            df, workers=workers, envs_per_worker=num_envs, window=window,
+            worker_bars=worker_bars, episode_length=episode_length, seed=seed,
+        )
+    return VecTradingEnv(df, num_envs=num_envs, window=window, episode_length=episode_length, seed=seed)
@@ -0,0 +1,200 @@
+"""
+Walk-forward evaluation: optimize (and train the ML model) on each
+training window, then measure the chosen parameters on the following
+unseen window.
+
+Indicators are computed once over the whole series; folds are row slices
+of it, so no fold recomputes or copies them. With `workers` > 1 folds run
+on a process pool over the series written once as memory-mapped arrays.
+"""
+
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from perceptrader.backtest import periods_per_year, run_backtest
+from perceptrader.config.settings import settings
+from perceptrader.data.arrays import BarArrays, write_bar_arrays
+from perceptrader.models.ml import MLModel
+from perceptrader.optimization import Optimizer
+from perceptrader.strategy.factory import create_strategy
+from perceptrader.utils import fetch as indicators
+from perceptrader.utils.indicators import IndicatorEngine
+
+ROLLING = "rolling"  # fixed-length training window that moves forward
+ANCHORED = "anchored"  # training window always starts at the first bar
+MODES = (ROLLING, ANCHORED)
+
+Fold = Tuple[slice, slice]
+
+# per-process state of fold workers (set by `_init_worker`)
+_worker_engine: Optional["WalkForward"] = None
+_worker_frame: Optional[pd.DataFrame] = None
+
+
+def walk_forward_folds(
+        n_bars: int,
+        train_size: int,
+        test_size: int,
+        step: Optional[int] = None,
+        mode: str = ROLLING,
+) -> List[Fold]:
+    """(train, test) row slices; test windows advance by `step` (default `test_size`)."""
+    if mode not in MODES:
+        raise ValueError(f"Unknown walk-forward mode '{mode}'")
+    step = step or test_size
+    folds = []
+    start = 0
+    while start + train_size + test_size <= n_bars:
+        split = start + train_size
+        train = slice(0 if mode == ANCHORED else start, split)
+        folds.append((train, slice(split, split + test_size)))
+        start += step
+    return folds
+
+
+def _init_worker(engine: "WalkForward", arrays: BarArrays) -> None:
+    global _worker_engine, _worker_frame
+    _worker_engine = engine
+    _worker_frame = arrays.to_frame(copy=False)
+
+
+def _run_fold_in_worker(job: Tuple[int, slice, slice]) -> Dict[str, Any]:
+    return _worker_engine._run_fold(_worker_frame, *job)
+
+
+class WalkForward:
+    """Rolling or anchored walk-forward around `Optimizer` and `MLModel`."""
+
+    def __init__(
+            self,
+            base_params: Dict[str, Any],
+            train_size: int = settings.WF_TRAIN_BARS,
+            test_size: int = settings.WF_TEST_BARS,
+            step: Optional[int] = settings.WF_STEP_BARS or None,
+            mode: str = settings.WF_MODE,
+            workers: int = settings.WF_WORKERS,
+            strategy: str = settings.STRATEGY,
+            ml_params: Optional[Dict[str, Any]] = None,
+            seed: Optional[int] = settings.OPTIMIZATION_PARAMS["seed"],
+    ) -> None:
+        if mode not in MODES:
+            raise ValueError(f"Unknown walk-forward mode '{mode}'")
+        self.base = base_params
+        self.train_size = train_size
+        self.test_size = test_size
+        self.step = step
+        self.mode = mode
+        self.workers = workers
+        self.strategy = strategy
+        self.ml_params = ml_params  # None skips the ML model
+        self.seed = seed
+        self.spread = settings.BACKTEST_SPREAD
+        self.commission = settings.BACKTEST_COMMISSION
+        self.timeframe = ""  # bar timeframe of the current `run`, for Sharpe annualization
+
+    def _backtest(self, df: pd.DataFrame, signals):
+        return run_backtest(
+            df["close"], signals, spread=self.spread, commission=self.commission,
+            periods_per_year=periods_per_year(self.timeframe),
+        )
+
+    def _run_fold(self, df: pd.DataFrame, i: int, train: slice, test: slice) -> Dict[str, Any]:
+        train_df, test_df = df.iloc[train], df.iloc[test]
+        seed = None if self.seed is None else self.seed + i
+        optimizer = Optimizer(self.base, strategy=self.strategy, workers=1, seed=seed)
+        params = optimizer.optimize(train_df, timeframe=self.timeframe)
+
+        strategy = create_strategy(self.strategy, params)
+        train_signals = strategy.generate_signals(train_df)
+        test_signals = strategy.generate_signals(test_df)
+        oos = self._backtest(test_df, test_signals)
+        row: Dict[str, Any] = {
+            "fold": i,
+            "train_start": df.index[train.start],
+            "test_start": df.index[test.start],
+            "test_end": df.index[test.stop - 1],
+            "params": params,
+            "is_sharpe": float(self._backtest(train_df, train_signals).sharpe),
+            **{f"oos_{key}": float(value) for key, value in oos.metrics().items()},
+            "_returns": oos.returns,
+        }
+
+        if self.ml_params is not None:
+            # the model learns to reproduce the fold's optimized signals
+            features = [col for col in IndicatorEngine.COLUMNS if col in df.columns]
+            model = MLModel(dict(self.ml_params))
+            model.train(train_df[features], train_signals)
+            predicted = np.asarray(model.predict(test_df[features]))
+            ml = self._backtest(test_df, predicted)
+            row["ml_oos_sharpe"] = float(ml.sharpe)
+            row["ml_oos_total_return"] = float(ml.total_return)
+            row["ml_accuracy"] = float(np.mean(predicted == test_signals.to_numpy()))
+        return row
+
+    def _run_folds(self, df: pd.DataFrame, folds: List[Fold]) -> List[Dict[str, Any]]:
+        jobs = [(i, train, test) for i, (train, test) in enumerate(folds)]
+        if self.workers <= 1 or len(jobs) <= 1:
+            return [self._run_fold(df, *job) for job in jobs]
+
+        with tempfile.TemporaryDirectory(prefix="perceptrader-wf-") as tmp:
+            arrays = BarArrays(write_bar_arrays(df, Path(tmp) / "data"))
+            with ProcessPoolExecutor(
+                    min(self.workers, len(jobs)), initializer=_init_worker, initargs=(self, arrays)
+            ) as pool:
+                return list(pool.map(_run_fold_in_worker, jobs))
+
+    def run(self, df: pd.DataFrame, symbol: str = "", timeframe: str = "") -> "WalkForwardReport":
+        """Evaluate every fold of `df` and aggregate the out-of-sample results."""
+        periods_per_year(timeframe)  # fail fast on an unknown timeframe
+        if not set(IndicatorEngine.COLUMNS) <= set(df.columns):
+            df = indicators.add_indicators(df)  # once, for all folds
+        folds = walk_forward_folds(len(df), self.train_size, self.test_size, self.step, self.mode)
+        if not folds:
+            raise ValueError(
+                f"{len(df)} bars are too few for {self.train_size} training "
+                f"+ {self.test_size} test bars"
+            )
+        self.timeframe = timeframe  # before `_run_folds`, which ships `self` to the workers
+        return WalkForwardReport(symbol, timeframe, self._run_folds(df, folds))
+
+
+class WalkForwardReport:
+    """
+    Per-fold results plus metrics of the out-of-sample returns stitched in
+    fold order (test windows overlap when `step` < `test_size`).
+    """
+
+    def __init__(self, symbol: str, timeframe: str, rows: List[Dict[str, Any]]) -> None:
+        self.symbol = symbol
+        self.timeframe = timeframe
+        returns = [row.pop("_returns") for row in rows]
+        self.folds = pd.DataFrame(rows).set_index("fold")
+        self.oos_returns = np.concatenate(returns)
+
+    def summary(self) -> Dict[str, Any]:
+        rets = self.oos_returns
+        equity = np.cumprod(1.0 + rets)
+        peak = np.maximum.accumulate(equity)
+        std = rets.std()
+        annualization = np.sqrt(periods_per_year(self.timeframe))
+        summary = {
+            "symbol": self.symbol,
+            "timeframe": self.timeframe,
+            "folds": len(self.folds),
+            "oos_bars": len(rets),
+            "oos_sharpe": float(rets.mean() / std * annualization) if std > 0 else 0.0,
+            "oos_total_return": float(equity[-1] - 1.0),
+            "oos_max_drawdown": float((1.0 - equity / peak).max()),
+            "mean_fold_sharpe": float(self.folds["oos_sharpe"].mean()),
+            "positive_folds": float((self.folds["oos_total_return"] > 0).mean()),
+            "is_oos_sharpe_gap": float((self.folds["is_sharpe"] - self.folds["oos_sharpe"]).mean()),
+        }
+        if "ml_oos_sharpe" in self.folds:
+            summary["ml_mean_fold_sharpe"] = float(self.folds["ml_oos_sharpe"].mean())
+            summary["ml_accuracy"] = float(self.folds["ml_accuracy"].mean())
+        return summary
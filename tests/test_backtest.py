@@ -0,0 +1,134 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from perceptrader.backtest import (
+    MatrixBacktester, positions_from_signals, product_grid, run_backtest, sweep,
+)
+from perceptrader.optimization import Optimizer
+from perceptrader.strategy.factory import create_strategy
+
+
+def test_positions_forward_fill_signals():
+    signals = np.array([0, 1, 0, 0, -1, 0, 1])
+    assert list(positions_from_signals(signals)) == [0, 1, 1, 1, -1, -1, 1]
+    assert list(positions_from_signals(signals, long_only=True)) == [0, 1, 1, 1, 0, 0, 1]
+
+
+def test_backtest_returns_costs_and_metrics():
+    prices = np.array([100.0, 110.0, 121.0, 108.9, 108.9])
+    signals = np.array([1, 0, -1, 0, 0])
+    result = run_backtest(prices, signals, spread=1.0, commission=0.001, initial_balance=1.0)
+
+    # long from bar 0, reversed short at bar 2 (two units traded)
+    cost0 = 0.5 / 100.0 + 0.001
+    cost2 = 2 * (0.5 / 121.0 + 0.001)
+    expected = np.array([-cost0, 0.1, 0.1 - cost2, 0.1, 0.0])
+    np.testing.assert_allclose(result.returns, expected)
+    np.testing.assert_allclose(result.equity, np.cumprod(1 + expected))
+    assert result.turnover == 3
+    assert result.n_trades == 2
+    peak = np.maximum.accumulate(result.equity)
+    assert result.max_drawdown == pytest.approx((1 - result.equity / peak).max())
+
+
+def test_backtest_matrix_matches_columns():
+    rng = np.random.default_rng(0)
+    prices = 100 + np.cumsum(rng.normal(0, 1, 500))
+    signals = rng.choice([-1, 0, 0, 0, 1], size=(500, 6))
+    matrix = run_backtest(prices, signals, spread=0.02, commission=1e-4)
+    for k in range(signals.shape[1]):
+        single = run_backtest(prices, signals[:, k], spread=0.02, commission=1e-4)
+        np.testing.assert_allclose(matrix.equity[:, k], single.equity)
+        assert matrix.sharpe[k] == pytest.approx(single.sharpe)
+        assert matrix.max_drawdown[k] == pytest.approx(single.max_drawdown)
+
+
+@pytest.mark.parametrize("long_only", [False, True])
+def test_matrix_backtester_matches_run_backtest(long_only):
+    rng = np.random.default_rng(3)
+    prices = 100 + np.cumsum(rng.normal(0, 0.5, 600))
+    signals = rng.choice([-1, 0, 0, 0, 0, 1], size=(12, 600)).astype(np.int8)
+    signals[0] = 0  # never trades
+    signals[1, :50] = 0  # flat before the first trade
+    signals[2, 0] = 1  # trades on the first bar
+
+    expected = run_backtest(prices, signals.T, spread=0.05, commission=1e-4, long_only=long_only)
+    tester = MatrixBacktester(prices, spread=0.05, commission=1e-4, long_only=long_only)
+    got = tester.run(signals)
+    for key, values in expected.metrics().items():
+        np.testing.assert_allclose(got[key], values, rtol=1e-7, atol=1e-12, err_msg=key)
+
+
+def test_sweep_over_product_grid():
+    rng = np.random.default_rng(4)
+    n = 800
+    df = pd.DataFrame({
+        "close": 100 + np.cumsum(rng.normal(0, 0.1, n)),
+        "rsi": np.clip(50 + np.cumsum(rng.normal(0, 5, n)), 0, 100),
+        "macd": rng.normal(0, 1, n),
+        "macd_signal": rng.normal(0, 1, n),
+    })
+    grid = product_grid(rsi_lower=[20, 30, 40], rsi_upper=[60, 70, 80, 90])
+    strategy = create_strategy("rsimacd", {})
+    result = sweep(df, strategy, grid, chunk_size=5, spread=0.01)
+
+    assert len(result) == 12
+    for _, row in result.iterrows():
+        params = {"rsi_lower": row["rsi_lower"], "rsi_upper": row["rsi_upper"]}
+        signals = create_strategy("rsimacd", params).generate_signals(df)
+        expected = run_backtest(df["close"], signals, spread=0.01)
+        assert row["sharpe"] == pytest.approx(expected.sharpe, rel=1e-7)
+        assert row["total_return"] == pytest.approx(expected.total_return, rel=1e-7)
+
+
+def test_optimizer_scores_with_backtest():
+    rng = np.random.default_rng(1)
+    n = 400
+    df = pd.DataFrame({
+        "close": 100 + np.cumsum(rng.normal(0, 0.1, n)),
+        "rsi": rng.uniform(0, 100, n),
+        "macd": rng.normal(0, 1, n),
+        "macd_signal": rng.normal(0, 1, n),
+    })
+    opt = Optimizer({"rsi_lower": 30, "rsi_upper": 70}, strategy="rsimacd")
+    score = opt._score(df, {"rsi_lower": 30, "rsi_upper": 70})
+    assert np.isfinite(score) and score != 0.0
+    # thresholds that never trigger leave the account flat
+    assert opt._score(df, {"rsi_lower": -1, "rsi_upper": 101}) == 0.0
+
+    best = opt.optimize(df)
+    assert set(best) == {"rsi_lower", "rsi_upper"}
+
+
+def test_optimizer_parallel_matches_serial_under_seed():
+    rng = np.random.default_rng(2)
+    n = 2000
+    df = pd.DataFrame({
+        "close": 100 + np.cumsum(rng.normal(0, 0.1, n)),
+        "rsi": rng.uniform(0, 100, n),
+        "macd": rng.normal(0, 1, n),
+        "macd_signal": rng.normal(0, 1, n),
+    }, index=pd.date_range("2021-01-01", periods=n, freq="min", name="time"))
+    base = {"rsi_lower": 30, "rsi_upper": 70}
+    serial = Optimizer(base, workers=1, seed=42).optimize(df)
+    parallel = Optimizer(base, workers=3, seed=42).optimize(df)
+    assert parallel == serial
+    assert Optimizer(base, workers=2, seed=42).optimize(df) == serial
+
+
+def test_periods_per_year_scales_with_timeframe():
+    from perceptrader.backtest import periods_per_year
+
+    assert periods_per_year("D1") == periods_per_year() == 252.0
+    assert periods_per_year("M1") == 252.0 * 1440
+    assert periods_per_year("H1") == 252.0 * 24
+    with pytest.raises(ValueError):
+        periods_per_year("W1")
+
+    rng = np.random.default_rng(0)
+    prices = 100 + np.cumsum(rng.normal(0, 1, 300))
+    signals = np.sign(rng.normal(size=300))
+    daily = run_backtest(prices, signals)
+    minute = run_backtest(prices, signals, periods_per_year=periods_per_year("M1"))
+    assert np.isclose(minute.sharpe, daily.sharpe * np.sqrt(1440))
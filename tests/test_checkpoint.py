@@ -0,0 +1,87 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from perceptrader.config.settings import settings
+from perceptrader.optimization import Optimizer
+from perceptrader.utils.checkpoint import Checkpoint, RunManifest
+
+
+def indicator_frame(n=1000, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "close": 100 + np.cumsum(rng.normal(0, 0.1, n)),
+        "rsi": rng.uniform(0, 100, n),
+        "macd": rng.normal(0, 1, n),
+        "macd_signal": rng.normal(0, 1, n),
+    }, index=pd.date_range("2021-01-01", periods=n, freq="min", name="time"))
+
+
+def test_checkpoint_roundtrip(tmp_path):
+    ckpt = Checkpoint(tmp_path / "sub" / "state.pkl")
+    assert ckpt.load() is None
+    ckpt.save({"generation": 3, "rng": (1, 2)})
+    assert ckpt.load() == {"generation": 3, "rng": (1, 2)}
+    assert not list(tmp_path.glob("sub/*.tmp"))
+
+    ckpt.path.write_bytes(b"\x80\x04torn")
+    assert ckpt.load() is None
+    ckpt.clear()
+    assert not ckpt.exists()
+
+
+def test_manifest_resets_on_new_data(tmp_path):
+    path = tmp_path / "manifest.json"
+    manifest = RunManifest(path)
+    manifest.bind("EURUSD-M1", "abc")
+    manifest.mark("EURUSD-M1", "optimize", {"rsi_lower": 25})
+
+    reopened = RunManifest(path)
+    reopened.bind("EURUSD-M1", "abc")
+    assert reopened.done("EURUSD-M1", "optimize")
+    assert reopened.get("EURUSD-M1", "optimize") == {"rsi_lower": 25}
+    assert not reopened.done("EURUSD-M1", "rl")
+
+    reopened.bind("EURUSD-M1", "changed")
+    assert not reopened.done("EURUSD-M1", "optimize")
+
+
+def test_optimizer_resumes_exactly(tmp_path, monkeypatch):
+    monkeypatch.setitem(settings.OPTIMIZATION_PARAMS, "population_size", 8)
+    monkeypatch.setitem(settings.OPTIMIZATION_PARAMS, "generations", 5)
+    monkeypatch.setattr(settings, "FITNESS_CACHE_SIZE", 0)
+    df = indicator_frame()
+    base = {"rsi_lower": 30, "rsi_upper": 70}
+
+    reference = Optimizer(base, seed=7)
+    expected = reference.optimize(df)
+
+    ckpt = Checkpoint(tmp_path / "ga.pkl")
+    original = Optimizer._score_batch
+    calls = []
+
+    def crash_in_fourth_generation(self, frame, tester, population):
+        calls.append(1)
+        if len(calls) == 4:
+            raise KeyboardInterrupt
+        return original(self, frame, tester, population)
+
+    monkeypatch.setattr(Optimizer, "_score_batch", crash_in_fourth_generation)
+    with pytest.raises(KeyboardInterrupt):
+        Optimizer(base, seed=7, checkpoint=ckpt).optimize(df)
+    assert ckpt.load()["generation"] == 3
+
+    monkeypatch.setattr(Optimizer, "_score_batch", original)
+    resumed = Optimizer(base, seed=7, checkpoint=ckpt)
+    assert resumed.optimize(df) == expected
+    assert resumed.history == reference.history
+    assert not ckpt.exists()
+
+
+def test_optimizer_ignores_foreign_checkpoint(tmp_path, monkeypatch):
+    monkeypatch.setitem(settings.OPTIMIZATION_PARAMS, "generations", 2)
+    ckpt = Checkpoint(tmp_path / "ga.pkl")
+    ckpt.save({"run": "other", "generation": 2, "population": [], "best_score": 9.0,
+               "best_params": {"rsi_lower": 1, "rsi_upper": 2}, "history": [], "rng": None})
+    best = Optimizer({"rsi_lower": 30, "rsi_upper": 70}, seed=0, checkpoint=ckpt).optimize(indicator_frame())
+    assert best != {"rsi_lower": 1, "rsi_upper": 2}
@@ -44,22 +44,373 @@ def test_historical_fetcher_cache(tmp_path, sample_df, monkeypatch):
 
 
 def test_data_pipeline(tmp_path, sample_df, monkeypatch):
-    # Patch HistoricalFetcher.fetch and add_indicators
+    # Patch HistoricalFetcher.fetch
     monkeypatch.setattr(
         "perceptrader.data.fetch.HistoricalFetcher.fetch",
         lambda self: sample_df
     )
-    monkeypatch.setattr(
-        "perceptrader.utils.fetch.add_indicators",
-        lambda df: df
-    )
 
     dp = DataPipeline(["SYM"], ["M1"])
     dp.cache_dir = tmp_path / "raw"
     dp.processed_dir = tmp_path / "processed"
+    dp.store_backend = "csv"
     dp.run()
 
     out_file = dp.processed_dir / "SYM_M1.csv"
     assert out_file.exists()
     df_out = pd.read_csv(out_file, index_col=0)
     assert not df_out.empty
+
+
+def test_parquet_store_partitions_and_pushdown(tmp_path):
+    pytest.importorskip("pyarrow")
+    from perceptrader.data.store import create_bar_store
+
+    idx = pd.date_range("2021-01-30", periods=5, freq="D", name="time")
+    df = pd.DataFrame({"close": [1.0, 2.0, 3.0, 4.0, 5.0], "volume": [1, 2, 3, 4, 5]}, index=idx)
+    store = create_bar_store("parquet", tmp_path)
+    store.write("SYM", "D1", df)
+
+    assert [p.stem for p in store.paths("SYM", "D1")] == ["2021-01", "2021-02"]
+    pd.testing.assert_frame_equal(store.load("SYM", "D1"), df, check_freq=False)
+
+    part = store.load("SYM", "D1", start="2021-02-01", end="2021-02-03", columns=["close"])
+    assert list(part.columns) == ["close"]
+    assert list(part["close"]) == [3.0, 4.0]
+
+
+class FakeProvider:
+    """Serves bars from an in-memory frame and records requested ranges."""
+
+    def __init__(self, df):
+        self.df = df
+        self.calls = []
+
+    def fetch_range(self, symbol, timeframe, start, end):
+        self.calls.append((start, end))
+        return self.df[(self.df.index >= start) & (self.df.index < end)]
+
+
+@pytest.fixture
+def daily_bars():
+    idx = pd.date_range("2021-01-01", periods=60, freq="D", name="time")
+    return pd.DataFrame({"close": range(60), "volume": 1.0}, index=idx).astype(float)
+
+
+@pytest.mark.parametrize("backend", ["csv", "parquet"])
+def test_historical_fetcher_fetches_only_gaps(tmp_path, daily_bars, backend):
+    if backend == "parquet":
+        pytest.importorskip("pyarrow")
+    from perceptrader.data.store import create_bar_store
+
+    provider = FakeProvider(daily_bars)
+    store = create_bar_store(backend, tmp_path)
+    fetcher = HistoricalFetcher("SYM", "D1", tmp_path, store=store, provider=provider)
+
+    fetcher.fetch("2021-01-10", "2021-01-20")
+    fetcher.fetch("2021-01-30", "2021-02-05")
+    provider.calls.clear()
+
+    df = fetcher.fetch("2021-01-05", "2021-02-10")
+    ts = pd.Timestamp
+    assert provider.calls == [
+        (ts("2021-01-05"), ts("2021-01-10")),
+        (ts("2021-01-20"), ts("2021-01-30")),
+        (ts("2021-02-05"), ts("2021-02-10")),
+    ]
+    expected = daily_bars.loc["2021-01-05":"2021-02-09"]
+    pd.testing.assert_frame_equal(df, expected, check_freq=False)
+
+    # coverage persists across fetcher instances
+    provider.calls.clear()
+    again = HistoricalFetcher("SYM", "D1", tmp_path, store=store, provider=provider)
+    again.fetch("2021-01-06", "2021-02-01")
+    assert provider.calls == []
+
+
+def test_indicator_engine_matches_add_indicators():
+    import numpy as np
+    from perceptrader.utils.fetch import add_indicators
+    from perceptrader.utils.indicators import IndicatorEngine
+
+    rng = np.random.default_rng(0)
+    idx = pd.date_range("2021-01-01", periods=400, freq="min", name="time")
+    df = pd.DataFrame({"close": 1.1 + np.cumsum(rng.normal(0, 1e-3, 400))}, index=idx)
+    expected = add_indicators(df)
+
+    engine = IndicatorEngine()
+    head = engine.update_frame(df.iloc[:250])
+    resumed = IndicatorEngine.from_snapshot(engine.snapshot())
+    tail = resumed.update_frame(df.iloc[250:])
+
+    streamed = pd.concat([head, tail])
+    pd.testing.assert_frame_equal(streamed, expected, rtol=1e-9, check_freq=False)
+
+
+def test_data_pipeline_parallel_isolates_failures(tmp_path, daily_bars):
+    class FlakyProvider(FakeProvider):
+        def fetch_range(self, symbol, timeframe, start, end):
+            if symbol == "BAD":
+                raise RuntimeError("no such symbol")
+            return super().fetch_range(symbol, timeframe, start, end)
+
+    dp = DataPipeline(["AAA", "BAD", "BBB"], ["D1"])
+    dp.cache_dir = tmp_path / "raw"
+    dp.processed_dir = tmp_path / "processed"
+    dp.store_backend = "csv"
+    dp.provider = FlakyProvider(daily_bars)
+    seen = []
+
+    failures = dp.run(workers=2, progress=lambda s, tf, err: seen.append(s))
+
+    assert list(failures) == [("BAD", "D1")]
+    assert "no such symbol" in failures[("BAD", "D1")]
+    assert sorted(seen) == ["AAA", "BAD", "BBB"]
+    assert len(dp.load("AAA", "D1")) == len(daily_bars)  # no indicator warm-up dropped
+
+
+def test_derive_timeframes_matches_pandas_resample():
+    import numpy as np
+    from perceptrader.data.resample import derive_timeframes
+
+    rng = np.random.default_rng(1)
+    idx = pd.date_range("2021-01-01 22:00", periods=3000, freq="min", name="time")
+    idx = idx.delete(slice(100, 400))  # a gap with empty bins
+    close = 1.1 + np.cumsum(rng.normal(0, 1e-4, len(idx)))
+    m1 = pd.DataFrame({
+        "open": close, "high": close + 1e-4, "low": close - 1e-4, "close": close,
+        "volume": rng.integers(1, 100, len(idx)).astype(float),
+    }, index=idx)
+
+    frames = derive_timeframes(m1, "M1", ["M5", "M15", "H1", "D1"])
+    agg = {"open": "first", "high": "max", "low": "min", "close": "last", "volume": "sum"}
+    for tf, rule in [("M5", "5min"), ("M15", "15min"), ("H1", "1h"), ("D1", "1D")]:
+        expected = m1.resample(rule).agg(agg).dropna()
+        pd.testing.assert_frame_equal(frames[tf], expected, check_freq=False)
+
+    # daily bars on the New York session clock, closing at 17:00 local time
+    ny = derive_timeframes(m1, "M1", ["D1"], offset="17h", tz="America/New_York")["D1"]
+    assert list(ny.index) == list(pd.date_range("2021-01-01 22:00", periods=3, freq="D"))
+    assert ny["volume"].sum() == m1["volume"].sum()
+
+
+def test_derive_timeframes_across_dst_fall_back():
+    from perceptrader.data.resample import derive_timeframes
+
+    # London leaves BST at 2024-10-27 01:00 UTC: 01:00-02:00 local happens twice
+    idx = pd.date_range("2024-10-26 22:00", "2024-10-27 04:00", freq="min", inclusive="left", name="time")
+    m1 = pd.DataFrame({"close": range(len(idx)), "volume": 1.0}, index=idx).astype(float)
+
+    frames = derive_timeframes(m1, "M1", ["M15", "H1", "H4", "D1"], tz="Europe/London")
+    h1 = frames["H1"]
+    assert list(h1.index) == list(pd.date_range("2024-10-26 22:00", periods=6, freq="h"))
+    assert (h1["volume"] == 60).all()
+    assert (frames["M15"]["volume"] == 15).all()
+    assert list(frames["H4"]["volume"]) == [120, 240]
+    # daily bars still follow the session's midnight (23:00 UTC during BST)
+    d1 = frames["D1"]
+    assert list(d1.index) == [pd.Timestamp("2024-10-25 23:00"), pd.Timestamp("2024-10-26 23:00")]
+    assert list(d1["volume"]) == [60, 300]
+
+
+def test_data_pipeline_fetches_base_timeframe_only(tmp_path):
+    idx = pd.date_range("2021-01-04", periods=2000, freq="min", name="time")
+    m1 = pd.DataFrame({"open": 1.0, "high": 1.0, "low": 1.0, "close": 1.0, "volume": 1.0}, index=idx)
+    m1["close"] += range(len(idx))
+    provider = FakeProvider(m1)
+
+    dp = DataPipeline(["SYM"], ["M1", "M5", "M15"])
+    dp.cache_dir = tmp_path / "raw"
+    dp.processed_dir = tmp_path / "processed"
+    dp.store_backend = "csv"
+    dp.provider = provider
+    assert dp.run(workers=1) == {}
+
+    assert len(provider.calls) == 1
+    assert len(dp.load("SYM", "M5")) == 2000 // 5
+    assert len(dp.load("SYM", "M15")) == -(-2000 // 15)
+    assert list(dp.load("SYM", "M5").columns) == ["open", "high", "low", "close", "volume"]
+
+
+def _ticks(times):
+    import numpy as np
+    from perceptrader.data.stream import TICK_DTYPE
+
+    arr = np.zeros(len(times), dtype=TICK_DTYPE)
+    arr["time"] = times
+    return arr
+
+
+@pytest.mark.parametrize("policy, kept, dropped", [
+    ("drop_oldest", [3, 4, 5, 6], 3),
+    ("drop_newest", [0, 1, 2, 3], 3),
+    ("block", [0, 1, 2, 3], 0),
+])
+def test_tick_ring_buffer_overflow_policies(policy, kept, dropped):
+    from perceptrader.data.stream import TickRingBuffer
+
+    ring = TickRingBuffer(4, policy)
+    ring.push(_ticks([0, 1, 2]))
+    accepted = ring.push(_ticks([3, 4, 5, 6]))
+    assert list(ring.pop()["time"]) == kept
+    assert ring.dropped == dropped
+    assert accepted == (1 if policy != "drop_oldest" else 4)
+
+    # wrap-around keeps FIFO order
+    ring.push(_ticks([7, 8, 9]))
+    assert list(ring.pop(2)["time"]) == [7, 8]
+    assert list(ring.pop()["time"]) == [9]
+
+
+def test_tick_stream_against_replay_server():
+    import asyncio
+    import numpy as np
+    from perceptrader.data.replay import TickReplayServer
+    from perceptrader.data.stream import TickStream
+
+    n = 3000
+    recorded = pd.DataFrame({
+        "symbol": np.array(["EURUSD", "USDJPY", "GBPUSD"])[np.arange(n) % 3],
+        "time": 1_600_000_000_000 + np.arange(n),
+        "bid": np.linspace(1.0, 2.0, n),
+        "ask": np.linspace(1.0, 2.0, n) + 1e-4,
+        "volume": 1.0,
+    })
+
+    async def scenario():
+        server = TickReplayServer(recorded, rate=200_000, batch=90)
+        url = await server.start()
+        stream = TickStream(url=url, api_key="test", capacity=256)
+        eur = stream.subscribe("EURUSD", policy="block")
+        jpy = stream.subscribe("USDJPY", policy="block")
+        runner = asyncio.create_task(stream.run())
+
+        got = {"EURUSD": [], "USDJPY": []}
+        while sum(map(len, got["EURUSD"])) < n // 3 or sum(map(len, got["USDJPY"])) < n // 3:
+            for sub in (eur, jpy):
+                ticks = sub.poll()
+                if len(ticks):
+                    got[sub.symbol].append(ticks)
+            await asyncio.sleep(0)
+
+        await runner
+        await server.stop()
+        return {k: np.concatenate(v) for k, v in got.items()}, eur.dropped
+
+    got, dropped = asyncio.run(scenario())
+    assert dropped == 0
+    for symbol, ticks in got.items():
+        expected = recorded[recorded["symbol"] == symbol]
+        assert list(ticks["time"]) == list(expected["time"] * 1_000_000)
+        assert np.array_equal(ticks["bid"], expected["bid"].to_numpy())
+
+
+def test_feature_store_materializes_once_and_invalidates(tmp_path, monkeypatch):
+    import numpy as np
+    from perceptrader.data import features as feature_module
+    from perceptrader.data.features import FEATURE_COLUMNS, FeatureStore
+    from perceptrader.environment import TradingEnv
+    from perceptrader.strategy.rsimacd import RsiMacdStrategy
+    from perceptrader.utils.fetch import add_indicators
+
+    rng = np.random.default_rng(0)
+    idx = pd.date_range("2021-01-01", periods=500, freq="min", name="time")
+    bars = pd.DataFrame({
+        "open": 100.0, "high": 101.0, "low": 99.0,
+        "close": 100 + np.cumsum(rng.normal(0, 0.1, 500)),
+        "volume": rng.uniform(1, 10, 500),
+    }, index=idx)
+    expected = add_indicators(bars)
+
+    store = FeatureStore(tmp_path)
+    arrays = store.get("EURUSD", "M1", bars)
+    assert store.get("EURUSD", "M1", bars.copy()).directory == arrays.directory
+    assert store.stats() == {"hits": 1, "builds": 1}
+    pd.testing.assert_frame_equal(arrays.to_frame(), expected, check_freq=False)
+
+    # consumers read views of the same files
+    frame = store.frame("EURUSD", "M1", "2021-01-01 02:00", "2021-01-01 03:00")
+    assert len(frame) == 60 and frame.index[0] == pd.Timestamp("2021-01-01 02:00")
+    base = frame["rsi"].to_numpy()
+    while base.base is not None and not isinstance(base, np.memmap):
+        base = base.base
+    assert isinstance(base, np.memmap)  # a view of the mapped file, not a copy
+    X = store.frame("EURUSD", "M1", columns=list(FEATURE_COLUMNS))
+    assert list(X.columns) == list(FEATURE_COLUMNS)
+    signals = RsiMacdStrategy({}).generate_signals(store.frame("EURUSD", "M1"))
+    assert signals.equals(RsiMacdStrategy({}).generate_signals(expected))
+    np.testing.assert_array_equal(TradingEnv(arrays, window=20).reset(), TradingEnv(expected, window=20).reset())
+
+    # new bars rebuild in place; an indicator code change moves to a new version
+    store.get("EURUSD", "M1", pd.concat([bars, bars.iloc[-1:].shift(1, freq="min")]))
+    assert store.stats()["builds"] == 2 and len(store.open("EURUSD", "M1")) == len(expected) + 1
+    monkeypatch.setattr(feature_module, "FEATURE_VERSION", 2)
+    newer = FeatureStore(tmp_path)
+    assert newer.version != store.version and newer.open("EURUSD", "M1") is None
+    newer.get("EURUSD", "M1", bars)
+    assert [p.name for p in (tmp_path / "EURUSD" / "M1").iterdir()] == [newer.version]
+    with pytest.raises(KeyError):
+        newer.frame("USDJPY", "M1")
+
+
+def test_historical_fetcher_does_not_cache_failed_or_empty_tail(tmp_path, daily_bars):
+    from perceptrader.data.store import create_bar_store
+
+    class FailingProvider(FakeProvider):
+        fail = True
+
+        def fetch_range(self, symbol, timeframe, start, end):
+            if self.fail:
+                raise RuntimeError("terminal disconnected")
+            return super().fetch_range(symbol, timeframe, start, end)
+
+    provider = FailingProvider(daily_bars)
+    fetcher = HistoricalFetcher("SYM", "D1", tmp_path, store=create_bar_store("csv", tmp_path), provider=provider)
+    with pytest.raises(RuntimeError):
+        fetcher.fetch("2021-01-10", "2021-01-20")
+    assert not fetcher.coverage
+
+    provider.fail = False
+    fetcher.fetch("2021-02-20", "2021-03-10")  # bars end on 2021-03-01
+    ts = pd.Timestamp
+    assert fetcher.coverage.intervals == [(ts("2021-02-20"), ts("2021-03-02"))]
+    provider.calls.clear()
+    fetcher.fetch("2021-02-20", "2021-03-10")
+    assert provider.calls == [(ts("2021-03-02"), ts("2021-03-10"))]
+
+
+def test_mt5_provider_raises_on_terminal_error(monkeypatch):
+    import sys
+    import types
+    from perceptrader.data.handlers.mt5 import MT5Provider
+
+    fake = types.SimpleNamespace(
+        TIMEFRAME_M1=1,
+        initialize=lambda **kwargs: True,
+        symbol_select=lambda symbol, enable: True,
+        copy_rates_range=lambda *args: None,
+        last_error=lambda: (-10004, "No IPC connection"),
+    )
+    monkeypatch.setitem(sys.modules, "MetaTrader5", fake)
+    monkeypatch.setattr(MT5Provider, "_initialized", False)
+    provider = MT5Provider()
+    with pytest.raises(RuntimeError, match="No IPC connection"):
+        provider.fetch_range("EURUSD", "M1", pd.Timestamp("2021-01-01"), pd.Timestamp("2021-01-02"))
+
+
+def test_mt5_provider_initializes_once_across_threads(monkeypatch):
+    import sys
+    import threading
+    import types
+    from perceptrader.data.handlers.mt5 import MT5Provider
+
+    calls = []
+    fake = types.SimpleNamespace(initialize=lambda **kwargs: calls.append(kwargs) or True)
+    monkeypatch.setitem(sys.modules, "MetaTrader5", fake)
+    monkeypatch.setattr(MT5Provider, "_initialized", False)
+    threads = [threading.Thread(target=MT5Provider) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(calls) == 1
@@ -0,0 +1,174 @@
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from perceptrader.data.arrays import BarArrays, write_bar_arrays
+from perceptrader.environment import TradingEnv
+from perceptrader.vec_env import VecTradingEnv
+
+
+@pytest.fixture
+def bars():
+    rng = np.random.default_rng(0)
+    n = 300
+    return pd.DataFrame({
+        "close": 100 + np.cumsum(rng.normal(0, 1, n)),
+        "volume": rng.integers(1, 1000, n).astype(float),
+    }, index=pd.date_range("2021-01-01", periods=n, freq="min", name="time"))
+
+
+def rollout(env, actions):
+    obs = [env.reset().copy()]
+    rewards = []
+    for action in actions:
+        ob, reward, done, _ = env.step(action)
+        obs.append(ob.copy())
+        rewards.append(reward)
+        if done:
+            break
+    return np.array(obs), np.array(rewards)
+
+
+def test_env_from_memory_mapped_arrays_matches_dataframe(tmp_path, bars):
+    arrays = BarArrays(write_bar_arrays(bars, tmp_path / "SYM_M1"))
+    assert isinstance(arrays["close"], np.memmap)
+
+    actions = np.random.default_rng(1).integers(0, 3, 400)
+    obs_df, rew_df = rollout(TradingEnv(bars, window=20), actions)
+    obs_mm, rew_mm = rollout(TradingEnv(arrays, window=20), actions)
+    assert np.array_equal(obs_df, obs_mm)
+    assert np.array_equal(rew_df, rew_mm)
+    pd.testing.assert_frame_equal(arrays.to_frame(), bars, check_freq=False)
+
+
+def test_bar_arrays_pickle_by_reference(tmp_path, bars):
+    arrays = BarArrays(write_bar_arrays(bars, tmp_path / "SYM_M1")).slice(100, 200)
+    payload = pickle.dumps(arrays)
+    assert len(payload) < 1000
+
+    clone = pickle.loads(payload)
+    assert len(clone) == 100
+    assert np.array_equal(clone["close"], bars["close"].to_numpy()[100:200])
+
+
+def test_precomputed_observations_match_legacy(bars):
+    actions = np.random.default_rng(2).integers(0, 3, 400)
+    obs_new, rew_new = rollout(TradingEnv(bars, window=20), actions)
+    obs_old, rew_old = rollout(TradingEnv(bars, window=20, obs_mode="legacy"), actions)
+    assert np.array_equal(obs_new, obs_old)
+    assert np.array_equal(rew_new, rew_old)
+
+
+def test_vec_env_matches_single_envs(bars):
+    n_envs = 4
+    actions = np.random.default_rng(3).integers(0, 3, (400, n_envs))
+    vec = VecTradingEnv(bars, num_envs=n_envs, window=20, random_start=False)
+    obs = [vec.reset()]
+    rewards = []
+    for step in actions:
+        ob, reward, done, infos = vec.step(step)
+        if done.any():
+            assert done.all()
+            ob = np.stack([info["terminal_observation"] for info in infos])
+        obs.append(ob)
+        rewards.append(reward)
+        if done.any():
+            break
+    obs, rewards = np.array(obs), np.array(rewards)
+
+    for i in range(n_envs):
+        obs_one, rew_one = rollout(TradingEnv(bars, window=20), actions[:, i])
+        assert np.array_equal(obs[:, i], obs_one)
+        np.testing.assert_allclose(rewards[:, i], rew_one, rtol=1e-6)
+
+
+def test_vec_env_random_starts_and_auto_reset(bars):
+    vec = VecTradingEnv(bars, num_envs=8, window=20, episode_length=30)
+    vec.seed(7)
+    vec.reset()
+    starts = vec.idx.copy()
+    assert starts.min() >= 20 and starts.max() <= len(bars) - 30
+    assert len(set(starts)) > 1
+
+    for _ in range(29):
+        _, _, done, _ = vec.step(np.full(8, 2))
+        assert not done.any()
+    _, _, done, infos = vec.step(np.full(8, 2))
+    assert done.all()
+    assert all(info["TimeLimit.truncated"] for info in infos)
+    assert (vec.steps == 0).all() and (vec.balance == 10_000).all()
+
+
+def test_vec_env_trains_with_ppo(bars):
+    from stable_baselines3 import PPO
+
+    vec = VecTradingEnv(bars, num_envs=4, window=20, episode_length=50, seed=0)
+    model = PPO("MlpPolicy", vec, n_steps=16, batch_size=32, n_epochs=1)
+    model.learn(total_timesteps=128)
+    assert model.num_timesteps >= 128
+    vec.close()  # VecEnv.close must stay callable
+
+
+def test_worker_windows_cover_history():
+    from perceptrader.vec_env import worker_windows
+
+    assert worker_windows(1000, 4, 0, 20) == [(0, 265), (245, 510), (490, 755), (735, 1000)]
+    assert worker_windows(1000, 3, 300, 20) == [(0, 300), (350, 650), (700, 1000)]
+    with pytest.raises(ValueError):
+        worker_windows(20, 2, 0, 20)
+
+
+def test_subproc_env_matches_in_process_workers(bars):
+    from stable_baselines3 import PPO
+    from perceptrader.vec_env import SubprocTradingEnv, worker_windows
+
+    sub = SubprocTradingEnv(
+        bars, workers=2, envs_per_worker=3, window=20, episode_length=40, seed=7,
+        start_method="fork",
+    )
+    try:
+        assert sub.num_envs == 6
+        windows = worker_windows(len(bars), 2, 0, 20)
+        local = [
+            VecTradingEnv(bars.iloc[lo:hi], num_envs=3, window=20, episode_length=40, seed=7 + i)
+            for i, (lo, hi) in enumerate(windows)
+        ]
+        np.testing.assert_array_equal(sub.reset(), np.concatenate([env.reset() for env in local]))
+        rng = np.random.default_rng(0)
+        for _ in range(60):
+            actions = rng.integers(0, 3, 6)
+            obs, rewards, dones, infos = sub.step(actions)
+            expected = [env.step(a) for env, a in zip(local, actions.reshape(2, 3))]
+            np.testing.assert_array_equal(obs, np.concatenate([e[0] for e in expected]))
+            np.testing.assert_array_equal(rewards, np.concatenate([e[1] for e in expected]))
+            np.testing.assert_array_equal(dones, np.concatenate([e[2] for e in expected]))
+        assert sub.get_attr("window", indices=[0, 4]) == [20, 20]
+
+        model = PPO("MlpPolicy", sub, n_steps=16, batch_size=32, n_epochs=1)
+        model.learn(total_timesteps=192)
+        assert model.num_timesteps >= 192
+    finally:
+        sub.close()
+
+
+def test_subproc_env_default_start_method(bars):
+    from perceptrader.vec_env import SubprocTradingEnv, worker_windows
+
+    # forkserver (or spawn) workers receive the bars by pickling, not by inheritance
+    sub = SubprocTradingEnv(bars, workers=2, envs_per_worker=2, window=20, episode_length=40, seed=3)
+    try:
+        local = [
+            VecTradingEnv(bars.iloc[lo:hi], num_envs=2, window=20, episode_length=40, seed=3 + i)
+            for i, (lo, hi) in enumerate(worker_windows(len(bars), 2, 0, 20))
+        ]
+        np.testing.assert_array_equal(sub.reset(), np.concatenate([env.reset() for env in local]))
+        for step in range(5):
+            actions = np.full(4, step % 3)
+            obs, rewards, _, _ = sub.step(actions)
+            expected = [env.step(a) for env, a in zip(local, actions.reshape(2, 2))]
+            np.testing.assert_array_equal(obs, np.concatenate([e[0] for e in expected]))
+            np.testing.assert_array_equal(rewards, np.concatenate([e[1] for e in expected]))
+    finally:
+        sub.close()
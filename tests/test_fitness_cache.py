@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+
+from perceptrader.optimization import Optimizer
+from perceptrader.utils.fitness_cache import FitnessCache, data_fingerprint, params_key
+
+
+def indicator_frame(n=1000, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "close": 100 + np.cumsum(rng.normal(0, 0.1, n)),
+        "rsi": rng.uniform(0, 100, n),
+        "macd": rng.normal(0, 1, n),
+        "macd_signal": rng.normal(0, 1, n),
+    }, index=pd.date_range("2021-01-01", periods=n, freq="min", name="time"))
+
+
+def test_keys_are_canonical():
+    assert params_key({"a": 1, "b": 2}) == params_key({"b": 2, "a": 1})
+    assert params_key({"a": 1}) != params_key({"a": 2})
+
+    df = indicator_frame()
+    assert data_fingerprint(df, "EURUSD", "M1") == data_fingerprint(df.copy(), "EURUSD", "M1")
+    assert data_fingerprint(df, "EURUSD", "M1") != data_fingerprint(df, "EURUSD", "M5")
+    edited = df.copy()
+    edited.iloc[500, 0] += 1e-9
+    assert data_fingerprint(edited, "EURUSD", "M1") != data_fingerprint(df, "EURUSD", "M1")
+
+
+def test_lru_evicts_least_recently_used():
+    cache = FitnessCache(max_items=2)
+    cache.put("a", 1.0)
+    cache.put("b", 2.0)
+    assert cache.get("a") == 1.0
+    cache.put("c", 3.0)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1.0 and cache.get("c") == 3.0
+    assert cache.stats()["hits"] == 3 and cache.stats()["misses"] == 1
+
+
+def test_disk_tier_survives_restart(tmp_path):
+    path = tmp_path / "fitness.sqlite"
+    cache = FitnessCache(path=path)
+    cache.put_many({"a": 1.5, "b": float("-inf")})
+    cache.close()
+
+    reopened = FitnessCache(path=path)
+    assert reopened.get("a") == 1.5
+    assert reopened.get("b") == float("-inf")
+    assert reopened.disk_hits == 2
+
+
+def test_optimizer_skips_cached_candidates(tmp_path, monkeypatch):
+    df = indicator_frame()
+    base = {"rsi_lower": 30, "rsi_upper": 70}
+    path = tmp_path / "fitness.sqlite"
+
+    calls = []
+    original = Optimizer._score_batch
+
+    def counting(self, frame, tester, population):
+        calls.extend(population)
+        return original(self, frame, tester, population)
+
+    monkeypatch.setattr(Optimizer, "_score_batch", counting)
+    first = Optimizer(base, seed=1, cache=FitnessCache(path=path))
+    best = first.optimize(df, "EURUSD", "M1")
+    evaluated = len(calls)
+    assert evaluated < first.pop_size * first.generations  # int params repeat
+    assert first.cache.hit_rate > 0
+
+    calls.clear()
+    rerun = Optimizer(base, seed=1, cache=FitnessCache(path=path))
+    assert rerun.optimize(df, "EURUSD", "M1") == best
+    assert calls == []
+    assert rerun.cache.hit_rate == 1.0
+
+    uncached = Optimizer(base, seed=1)
+    uncached.cache = None
+    assert uncached.optimize(df, "EURUSD", "M1") == best
@@ -21,3 +21,33 @@ def test_paper_execution_runs_quickly(monkeypatch):
 def test_live_execution_initialization():
     live = LiveExecution("EURUSD", "M1")
     assert live.symbol == "EURUSD"
+
+
+def test_bar_aggregator_matches_resample():
+    import numpy as np
+    import pandas as pd
+    from perceptrader.data.stream import TICK_DTYPE
+    from perceptrader.live.aggregator import BarAggregator
+
+    rng = np.random.default_rng(0)
+    n = 20_000
+    ticks = np.zeros(n, dtype=TICK_DTYPE)
+    ticks["time"] = np.sort(rng.integers(0, 3 * 3600 * 10**9, n)) + 1_600_000_000 * 10**9
+    ticks["bid"] = 1.1 + np.cumsum(rng.normal(0, 1e-5, n))
+
+    agg = BarAggregator(["M1", "M5", "H1"])
+    emitted = {"M1": [], "M5": [], "H1": []}
+    agg.subscribe(lambda tf, bars: emitted[tf].append(bars))
+    cuts = np.sort(rng.choice(np.arange(1, n), 50, replace=False))
+    for batch in np.split(ticks, cuts):
+        agg.update(batch)
+    agg.flush()
+
+    series = pd.Series(ticks["bid"], index=pd.to_datetime(ticks["time"]))
+    for tf, rule in [("M1", "1min"), ("M5", "5min"), ("H1", "1h")]:
+        bars = np.concatenate(emitted[tf])
+        expected = series.resample(rule).ohlc().dropna()
+        assert np.array_equal(pd.to_datetime(bars["time"]), expected.index)
+        for col in ("open", "high", "low", "close"):
+            assert np.array_equal(bars[col], expected[col].to_numpy())
+        assert np.array_equal(bars["volume"], series.resample(rule).count()[expected.index])
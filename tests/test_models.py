@@ -47,3 +47,253 @@ def test_rlagent_train_and_save(tmp_path):
     assert Path(path).exists()
     loaded = RLAgent.load(path)
     assert hasattr(loaded, "predict")
+
+
+def test_rl_search_promotes_and_resumes(monkeypatch):
+    import numpy as np
+    from perceptrader.models.rl import search_rl_agents
+    from perceptrader.vec_env import VecTradingEnv
+
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        "close": 100 + np.cumsum(rng.normal(0, 0.1, 500)),
+        "volume": rng.uniform(1, 10, 500),
+    })
+    configs = [{"n_steps": 32, "batch_size": 32, "n_epochs": 1, "seed": i} for i in range(3)]
+    opened, closed = [], []
+
+    class TrackedEnv(VecTradingEnv):
+        def close(self):
+            closed.append(self)
+            super().close()
+
+    def make_env():
+        opened.append(TrackedEnv(df, num_envs=2, window=10, seed=0))
+        return opened[-1]
+
+    train = RLAgent.train
+    open_while_training = []
+
+    def tracked_train(self, env, *args, **kwargs):
+        open_while_training.append(len(opened) - len(closed))
+        return train(self, env, *args, **kwargs)
+
+    monkeypatch.setattr(RLAgent, "train", tracked_train)
+    best, ranking = search_rl_agents(
+        configs,
+        make_env,
+        VecTradingEnv(df, num_envs=1, window=10, random_start=False),
+        min_timesteps=64, max_timesteps=192, eval_steps=20,
+    )
+    assert best is ranking[0][2]
+    assert [rung for rung, _, _ in ranking] == [1, 0, 0]
+    assert best.timesteps >= 192
+    assert all(agent.timesteps < 192 for _, _, agent in ranking[1:])
+    # only the survivor keeps its environment once the others are eliminated
+    assert open_while_training == [1, 2, 3, 1]
+    assert len(opened) == 3 and len(closed) == 3
+
+
+def test_rl_train_resumes_from_checkpoint(tmp_path, monkeypatch):
+    import numpy as np
+    from stable_baselines3 import PPO
+    from perceptrader.vec_env import VecTradingEnv
+
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        "close": 100 + np.cumsum(rng.normal(0, 0.1, 300)),
+        "volume": rng.uniform(1, 10, 300),
+    })
+    env = VecTradingEnv(df, num_envs=2, window=10, seed=0)
+    kwargs = {"n_steps": 32, "batch_size": 32, "n_epochs": 1, "seed": 0}
+    ckpt = tmp_path / "agent_ppo.zip"
+
+    interrupted = RLAgent(**kwargs)
+    interrupted.train(env, total_timesteps=64)
+    interrupted.agent.save(str(ckpt))  # as if the run died after its first checkpoint
+
+    chunks = []
+    learn = PPO.learn
+
+    def counting_learn(self, total_timesteps, **kw):
+        chunks.append(total_timesteps)
+        return learn(self, total_timesteps, **kw)
+
+    monkeypatch.setattr(PPO, "learn", counting_learn)
+    resumed = RLAgent(**kwargs)
+    resumed.train(env, total_timesteps=192, checkpoint=ckpt, checkpoint_every=64)
+    assert chunks == [64, 64]  # the first 64 timesteps came from the checkpoint
+    assert resumed.timesteps == 192
+    assert not ckpt.exists()
+
+
+def test_compiled_forest_matches_sklearn():
+    import numpy as np
+    from perceptrader.models.compiled import CompiledForest
+
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(2000, 5))
+    y = np.sign(X[:, 0] + X[:, 1] * X[:, 2] + rng.normal(0, 0.5, 2000)).astype(int)
+    X[rng.random(X.shape) < 0.02] = np.nan
+    model = MLModel({"n_estimators": 20, "random_state": 0})
+    model.train(pd.DataFrame(X, columns=list("abcde")), y)
+
+    compiled = CompiledForest.from_sklearn(model.model)
+    test = pd.DataFrame(rng.normal(size=(500, 5)), columns=list("abcde"))
+    test[test > 2.0] = np.nan
+    np.testing.assert_array_equal(compiled.predict_proba(test.to_numpy()), model.model.predict_proba(test))
+    np.testing.assert_array_equal(compiled.predict(test.to_numpy()), model.model.predict(test))
+
+    # one live bar as a Series, with columns in a different order
+    row = test.iloc[3][list("edcba")]
+    assert model.predict(row)[0] == model.model.predict(test.iloc[[3]])[0]
+    np.testing.assert_array_equal(model.predict(test.iloc[:10]), model.model.predict(test.iloc[:10]))
+
+
+def test_registry_versions_and_shares_models(tmp_path, monkeypatch, sample_X_y):
+    import threading
+    import time
+    from perceptrader.config.settings import settings
+    from perceptrader.models.registry import ML, ModelRegistry
+
+    monkeypatch.setattr(settings, "MODEL_DIR", tmp_path / "models")
+    X, y = sample_X_y
+    model = MLModel({"n_estimators": 3, "random_state": 0})
+    model.train(X, y)
+    first = model.save("EURUSD_M1")
+    other = MLModel({"n_estimators": 2, "random_state": 1})
+    other.train(X, y)
+    second = other.save("USDJPY_M1")
+
+    loads = []
+
+    def slow_load(path):
+        loads.append(path)
+        time.sleep(0.05)
+        return MLModel.load(path)
+
+    registry = ModelRegistry({ML: slow_load}, max_loaded=1)
+    assert [r["name"] for r in registry.records()] == ["EURUSD_M1", "USDJPY_M1"]
+    assert registry.latest("EURUSD_M1")["version"] == 1
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(registry.get(first))) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(loads) == 1 and all(r is results[0] for r in results)
+
+    registry.get(second)  # evicts the first model
+    assert registry.stats()["evictions"] == 1
+    registry.get(first)
+    assert len(loads) == 3
+
+    time.sleep(0.01)
+    model.save("EURUSD_M1")  # a new version replaces the cached one
+    assert registry.latest("EURUSD_M1")["version"] == 2
+    assert registry.get(first) is not results[0]
+    assert registry.stats()["loaded"] == 1
+
+
+def test_mlmodel_update_adds_and_retires_trees(tmp_path, monkeypatch):
+    import numpy as np
+    from perceptrader.config.settings import settings
+
+    monkeypatch.setattr(settings, "MODEL_DIR", tmp_path)
+    rng = np.random.default_rng(0)
+    index = pd.date_range("2021-01-01", periods=600, freq="min")
+    X = pd.DataFrame(rng.normal(size=(600, 3)), index=index, columns=list("abc"))
+    y = pd.Series(np.sign(X["a"] + rng.normal(0, 0.3, 600)).astype(int), index=index)
+
+    model = MLModel({"n_estimators": 10, "random_state": 0})
+    model.train(X.iloc[:400], y.iloc[:400])
+    first_trees = list(model.model.estimators_)
+    model = MLModel.load(model.save("EURUSD_M1"))
+    assert model.trained_until == index[399]
+
+    new = model.new_rows(X)
+    assert new.index[0] == index[400]
+    model.update(new, y.loc[new.index], n_trees=5, max_trees=12)
+    assert len(model.model.estimators_) == 12
+    # the oldest three trees retired
+    assert [t.random_state for t in model.model.estimators_[:7]] == [
+        t.random_state for t in first_trees[3:]
+    ]
+    assert model.trained_until == index[-1]
+    np.testing.assert_array_equal(model.predict(X.iloc[:5]), model.model.predict(X.iloc[:5]))
+
+    # a batch missing a class still yields trees with every class column
+    ones = y[y == 1].index[:50]
+    model.update(X.loc[ones], y.loc[ones], n_trees=2, max_trees=0)
+    assert len(model.model.estimators_) == 14
+    assert model.model.predict_proba(X).shape == (600, len(model.model.classes_))
+    # retired trees do not make warm start reuse the seeds of surviving ones
+    seeds = [t.random_state for t in model.model.estimators_]
+    assert len(set(seeds)) == len(seeds)
+    assert model.trees_grown == 17
+    assert MLModel.load(model.save("EURUSD_M1")).trees_grown == 17
+
+    # changed labels or features need a retrain rather than more trees
+    with pytest.raises(ValueError, match="Labels"):
+        model.update(X.iloc[:50], y.iloc[:50] * 5)
+    with pytest.raises(ValueError, match="Features"):
+        model.update(X.iloc[:50].rename(columns={"c": "d"}), y.iloc[:50])
+
+
+def test_train_concurrently_splits_cores(monkeypatch):
+    from perceptrader.models import ml
+
+    monkeypatch.setattr(ml.os, "cpu_count", lambda: 8)
+    seen = []
+
+    def task(n_jobs):
+        seen.append(n_jobs)
+        return n_jobs
+
+    def failing(n_jobs):
+        raise RuntimeError("no data")
+
+    results = ml.train_concurrently({"a": task, "b": task, "c": failing}, workers=2)
+    assert seen == [4, 4]
+    assert results["a"] == 4 and isinstance(results["c"], RuntimeError)
+
+
+@pytest.mark.parametrize("policy_kwargs", [{}, {"net_arch": [32], "activation_fn": "relu"}])
+def test_numpy_policy_matches_ppo_actions(tmp_path, monkeypatch, policy_kwargs):
+    import numpy as np
+    import torch
+    from perceptrader.config.settings import settings
+    from perceptrader.models.factory import load_model
+    from perceptrader.models.numpy_policy import NumpyPolicy
+    from perceptrader.vec_env import VecTradingEnv
+
+    monkeypatch.setattr(settings, "MODEL_DIR", tmp_path)
+    if policy_kwargs.get("activation_fn") == "relu":
+        policy_kwargs = {**policy_kwargs, "activation_fn": torch.nn.ReLU}
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        "close": 100 + np.cumsum(rng.normal(0, 1, 300)),
+        "volume": rng.uniform(1, 10, 300),
+    })
+    agent = RLAgent(n_steps=32, batch_size=32, n_epochs=2, seed=0, policy_kwargs=policy_kwargs)
+    agent.train(VecTradingEnv(df, num_envs=2, window=10, seed=0), total_timesteps=128)
+
+    path = NumpyPolicy.from_agent(agent).save("EURUSD_M1")
+    policy = load_model(path)
+    assert isinstance(policy, NumpyPolicy) and policy.observation_size == 20
+    obs = rng.normal(0, 3, (2000, 20)).astype(np.float32)
+    np.testing.assert_array_equal(policy.predict(obs), agent.predict(obs))
+    assert policy.predict(obs[0]) == agent.predict(obs[:1])[0]
+
+
+def test_numpy_policy_loads_without_torch():
+    import subprocess
+    import sys
+
+    code = (
+        "import sys; import perceptrader.strategy.deeprl, perceptrader.models.numpy_policy; "
+        "sys.exit(int('torch' in sys.modules or 'stable_baselines3' in sys.modules))"
+    )
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)}
+    assert subprocess.run([sys.executable, "-c", code], env=env).returncode == 0
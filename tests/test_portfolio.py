@@ -0,0 +1,88 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from perceptrader.backtest import run_backtest
+from perceptrader.portfolio import PortfolioBacktester, aligned_rows
+from perceptrader.risk.management import RiskManagement
+
+
+def bars(n, seed, drop=()):
+    rng = np.random.default_rng(seed)
+    index = pd.date_range("2021-01-01", periods=n, freq="min", name="time")
+    df = pd.DataFrame({
+        "close": 100 * np.exp(np.cumsum(rng.normal(0, 1e-3, n))),
+        "signal": rng.choice([-1, 0, 0, 0, 1], n),
+    }, index=index)
+    return df.drop(index[list(drop)])
+
+
+def test_aligned_rows_forward_fill_in_chunks():
+    a = np.array([0, 1, 2, 5, 6], dtype=np.int64)
+    b = np.array([2, 3, 4, 6], dtype=np.int64)
+    chunks = list(aligned_rows([a, b], chunk_size=2))
+    times = np.concatenate([t for t, _ in chunks])
+    rows = np.concatenate([r for _, r in chunks])
+    np.testing.assert_array_equal(times, [0, 1, 2, 3, 4, 5, 6])
+    np.testing.assert_array_equal(rows[:, 0], [0, 1, 2, 2, 2, 3, 4])
+    np.testing.assert_array_equal(rows[:, 1], [-1, -1, 0, 1, 2, 2, 3])
+    assert all(len(t) <= 2 for t, _ in chunks)
+
+
+def test_single_symbol_matches_run_backtest():
+    df = bars(500, 0)
+    expected = run_backtest(df["close"], df["signal"], spread=0.01, commission=1e-4)
+    result = PortfolioBacktester(spread=0.01, commission=1e-4, chunk_size=37).run({"EURUSD": df})
+    np.testing.assert_allclose(result.equity.to_numpy(), expected.equity, rtol=1e-10)
+    metrics = result.metrics()
+    assert metrics["sharpe"] == pytest.approx(expected.sharpe)
+    assert metrics["max_drawdown"] == pytest.approx(expected.max_drawdown)
+    assert metrics["n_trades"] == expected.n_trades
+
+    minute = PortfolioBacktester(spread=0.01, commission=1e-4, timeframe="M1").run({"EURUSD": df})
+    assert minute.metrics()["sharpe"] == pytest.approx(expected.sharpe * np.sqrt(1440))
+
+
+def test_misaligned_symbols_sum_forward_filled_returns():
+    data = {"EURUSD": bars(400, 1, drop=range(50, 60)), "USDJPY": bars(400, 2, drop=[7, 200, 201])}
+    union = data["EURUSD"].index.union(data["USDJPY"].index)
+    prices = pd.concat({s: df["close"] for s, df in data.items()}, axis=1, sort=True).reindex(union).ffill()
+    signals = pd.concat({s: df["signal"] for s, df in data.items()}, axis=1, sort=True).reindex(union).ffill()
+    expected = run_backtest(prices.to_numpy(), signals.to_numpy(), commission=1e-4)
+
+    result = PortfolioBacktester(commission=1e-4, chunk_size=64).run(data)
+    assert result.equity.index.equals(union)
+    np.testing.assert_allclose(
+        np.diff(result.equity.to_numpy(), prepend=10_000.0) / np.r_[10_000.0, result.equity.to_numpy()[:-1]],
+        expected.returns.sum(axis=1), atol=1e-12,
+    )
+    np.testing.assert_allclose(
+        result.per_symbol["return_contribution"], expected.returns.sum(axis=0), atol=1e-12
+    )
+    assert result.correlation.shape == (2, 2)
+
+
+def test_risk_sizing_is_chunk_invariant_and_capped(monkeypatch):
+    risk = RiskManagement()
+    risk.max_leverage = 1.5
+    data = {s: bars(600, i) for i, s in enumerate(["A", "B", "C"])}
+    small = PortfolioBacktester(risk, chunk_size=17).run(data)
+    large = PortfolioBacktester(risk, chunk_size=10_000).run(data)
+    np.testing.assert_allclose(small.equity, large.equity, rtol=1e-12)
+    assert small.metrics()["max_gross_leverage"] <= 1.5 + 1e-9
+    assert small.metrics()["n_trades"] == large.metrics()["n_trades"]
+
+
+def test_drawdown_limit_flattens_portfolio():
+    index = pd.date_range("2021-01-01", periods=300, freq="min", name="time")
+    signal = np.r_[np.zeros(20), np.ones(280)]  # enter once the ATR has warmed up
+    falling = pd.DataFrame({"close": np.linspace(100, 50, 300), "signal": signal}, index=index)
+    risk = RiskManagement()
+    risk.max_drawdown = 0.05
+    risk.max_leverage = 5.0
+    result = PortfolioBacktester(risk, stop_atr=0.5, chunk_size=50).run({"X": falling})
+    halted = result.metrics()["halted_at"]
+    assert halted is not None
+    after = result.equity[halted:]
+    assert (after.diff().dropna() == 0).all()
+    assert result.metrics()["max_drawdown"] < 0.1
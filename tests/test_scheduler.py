@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from perceptrader.config.settings import settings
+from perceptrader.optimization import Optimizer
+from perceptrader.scheduler import SuccessiveHalving
+
+
+def indicator_frame(n=2700, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "close": 100 + np.cumsum(rng.normal(0, 0.1, n)),
+        "rsi": rng.uniform(0, 100, n),
+        "macd": rng.normal(0, 1, n),
+        "macd_signal": rng.normal(0, 1, n),
+    }, index=pd.date_range("2021-01-01", periods=n, freq="min", name="time"))
+
+
+def test_budgets_grow_by_eta():
+    assert SuccessiveHalving(1, 27, eta=3).budgets() == [1, 3, 9, 27]
+    assert SuccessiveHalving(1 / 9, 1.0).budgets() == pytest.approx([1 / 9, 1 / 3, 1.0])
+    assert SuccessiveHalving(5, 12, eta=2).budgets() == [6, 12]
+    with pytest.raises(ValueError):
+        SuccessiveHalving(2, 1)
+
+
+def test_promotes_top_fraction():
+    calls = []
+
+    def evaluate(batch, budget):
+        calls.append((budget, sorted(batch)))
+        return [c * budget for c in batch]
+
+    scheduler = SuccessiveHalving(1, 9, eta=3)
+    ranking = scheduler.run(list(range(9)), evaluate)
+    assert calls == [(1, list(range(9))), (3, [6, 7, 8]), (9, [8])]
+    assert [c for _, _, c in ranking] == [8, 7, 6, 5, 4, 3, 2, 1, 0]
+    assert ranking[0] == (2, 72, 8)
+    assert scheduler.spent == 9 * 1 + 3 * 3 + 1 * 9
+
+
+def test_optimizer_halving_scores_fewer_bars(monkeypatch):
+    df = indicator_frame()
+    base = {"rsi_lower": 30, "rsi_upper": 70}
+    rows = []
+    original = Optimizer._score_batch
+
+    def counting(self, frame, tester, population):
+        rows.append(len(frame) * len(population))
+        return original(self, frame, tester, population)
+
+    monkeypatch.setattr(Optimizer, "_score_batch", counting)
+    monkeypatch.setattr(settings, "FITNESS_CACHE_SIZE", 0)  # count every candidate
+    full = Optimizer(base, seed=3, halving_min_fraction=0)
+    full.pop_size, full.generations = 9, 2
+    full.optimize(df)
+    full_rows, rows[:] = sum(rows), []
+
+    halving = Optimizer(base, seed=3, halving_min_fraction=1 / 9)
+    halving.pop_size, halving.generations = 9, 2
+    best = halving.optimize(df)
+    assert sum(rows) * 3 == full_rows
+    # the winner of each generation was scored on the full data
+    assert halving._score(df, best) > float("-inf")
+    assert max(rows) == len(df)
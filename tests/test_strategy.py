@@ -1,6 +1,8 @@
+import numpy as np
 import pandas as pd
 import pytest
 
+from perceptrader.strategy.base import StrategyBase
 from perceptrader.strategy.factory import create_strategy
 from perceptrader.strategy.rsimacd import RsiMacdStrategy
 from perceptrader.strategy.deeprl import DeepRLStrategy
@@ -30,3 +32,65 @@ def test_strategy_factory_unknown():
 def test_factory_returns_correct_class(indicator_df):
     strat = create_strategy("rsimacd", {"rsi_lower": 10, "rsi_upper": 90})
     assert isinstance(strat, RsiMacdStrategy)
+
+
+def test_rsimacd_signal_matrix_matches_per_set_signals():
+    rng = np.random.default_rng(0)
+    n = 500
+    df = pd.DataFrame({
+        "rsi": rng.uniform(0, 100, n),
+        "macd": rng.normal(0, 1, n),
+        "macd_signal": rng.normal(0, 1, n),
+    })
+    df.loc[:9, "rsi"] = np.nan  # indicator warm-up
+    lower = np.array([10, 25, 30, 45])
+    upper = np.array([55, 70, 70, 90])
+    strat = RsiMacdStrategy({})
+
+    matrix = strat.generate_signal_matrix(df, rsi_lower=lower, rsi_upper=upper)
+    assert matrix.shape == (4, n) and matrix.dtype == np.int8
+    for i, (lo, up) in enumerate(zip(lower, upper)):
+        single = RsiMacdStrategy({"rsi_lower": lo, "rsi_upper": up}).generate_signals(df)
+        assert np.array_equal(matrix[i], single.to_numpy())
+    # the generic per-set fallback agrees with the broadcast version
+    fallback = StrategyBase.generate_signal_matrix(strat, df, rsi_lower=lower, rsi_upper=upper)
+    assert np.array_equal(fallback, matrix)
+    # parameters the strategy does not use are ignored, as by the per-set path
+    extra = strat.generate_signal_matrix(df, rsi_lower=lower, rsi_upper=upper, window=np.arange(4))
+    assert np.array_equal(extra, matrix)
+    assert strat.generate_signal_matrix(df, window=np.arange(4)).shape == (4, n)
+
+
+def test_deeprl_signals_match_env_observations(tmp_path, monkeypatch):
+    from perceptrader.config.settings import settings
+    from perceptrader.environment import TradingEnv
+    from perceptrader.models.rl import RLAgent
+    from perceptrader.vec_env import VecTradingEnv
+
+    monkeypatch.setattr(settings, "MODEL_DIR", tmp_path)
+    rng = np.random.default_rng(0)
+    n, window = 200, 5
+    df = pd.DataFrame({
+        "close": 100 + np.cumsum(rng.normal(0, 1, n)),
+        "volume": rng.integers(1, 1000, n).astype(float),
+    })
+    agent = RLAgent(n_steps=32, batch_size=32, n_epochs=1, seed=0)
+    agent.train(VecTradingEnv(df, num_envs=2, window=window, seed=0), total_timesteps=64)
+    path = agent.save("TEST_M1")
+
+    strat = DeepRLStrategy({"model_path": str(path), "batch_size": 37})
+    assert strat.window == window
+    signals = strat.generate_signals(df)
+
+    env = TradingEnv(df, window=window)
+    expected = np.zeros(n, dtype=int)
+    for t in range(window - 1, n):
+        env.idx = t + 1  # the observation covers the bars up to and including t
+        expected[t] = [-1, 0, 1][int(agent.predict(env._get_obs()[None])[0])]
+    assert signals.index.equals(df.index)
+    assert np.array_equal(signals.to_numpy(), expected)
+
+    # the NumPy export of the policy gives the same signals
+    from perceptrader.models.numpy_policy import NumpyPolicy
+    exported = NumpyPolicy.from_agent(agent).save("TEST_M1")
+    assert DeepRLStrategy({"model_path": str(exported)}).generate_signals(df).equals(signals)
@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from perceptrader.config.settings import settings
+from perceptrader.utils.fetch import add_indicators
+from perceptrader.walkforward import ANCHORED, WalkForward, walk_forward_folds
+
+
+@pytest.fixture
+def bars():
+    rng = np.random.default_rng(0)
+    n = 3000
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 1e-3, n)))
+    return pd.DataFrame(
+        {"close": close}, index=pd.date_range("2021-01-01", periods=n, freq="min", name="time")
+    )
+
+
+@pytest.fixture
+def small_ga(monkeypatch):
+    monkeypatch.setitem(settings.OPTIMIZATION_PARAMS, "population_size", 6)
+    monkeypatch.setitem(settings.OPTIMIZATION_PARAMS, "generations", 2)
+
+
+def test_rolling_and_anchored_folds():
+    rolling = walk_forward_folds(100, train_size=40, test_size=20)
+    assert rolling == [(slice(0, 40), slice(40, 60)), (slice(20, 60), slice(60, 80)),
+                       (slice(40, 80), slice(80, 100))]
+    anchored = walk_forward_folds(100, train_size=40, test_size=20, step=30, mode=ANCHORED)
+    assert anchored == [(slice(0, 40), slice(40, 60)), (slice(0, 70), slice(70, 90))]
+    with pytest.raises(ValueError):
+        walk_forward_folds(100, 40, 20, mode="expanding")
+
+
+def test_walk_forward_report(bars, small_ga):
+    df = add_indicators(bars)
+    wf = WalkForward({"rsi_lower": 30, "rsi_upper": 70}, train_size=1000, test_size=500,
+                     ml_params={"n_estimators": 5, "random_state": 0}, seed=1)
+    report = wf.run(df, "EURUSD", "M1")
+
+    assert len(report.folds) == 3
+    assert len(report.oos_returns) == 1500
+    assert (report.folds["test_start"] > report.folds["train_start"]).all()
+    summary = report.summary()
+    assert summary["folds"] == 3 and summary["symbol"] == "EURUSD"
+    assert np.isfinite(summary["oos_sharpe"]) and 0 <= summary["ml_accuracy"] <= 1
+    rets = report.oos_returns
+    assert np.isclose(summary["oos_sharpe"], rets.mean() / rets.std() * np.sqrt(252 * 1440))  # M1 bars
+
+    # raw bars get their indicators computed once up front
+    assert len(wf.run(bars).folds) == 3
+
+
+def test_parallel_folds_match_serial(bars, small_ga):
+    df = add_indicators(bars)
+    kwargs = dict(train_size=1000, test_size=500, seed=3)
+    serial = WalkForward({"rsi_lower": 30, "rsi_upper": 70}, workers=1, **kwargs).run(df)
+    parallel = WalkForward({"rsi_lower": 30, "rsi_upper": 70}, workers=2, **kwargs).run(df)
+    pd.testing.assert_frame_equal(serial.folds, parallel.folds)
+    assert np.array_equal(serial.oos_returns, parallel.oos_returns)
+
+
+def test_too_little_data(bars):
+    with pytest.raises(ValueError):
+        WalkForward({}, train_size=5000, test_size=1000).run(add_indicators(bars))